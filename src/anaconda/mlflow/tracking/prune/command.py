@@ -1,10 +1,26 @@
 """ Command For Pruning Process """
+import os
+from time import time
+from typing import Optional
+
 from ae5_tools import demand_env_var
 
 from anaconda.enterprise.server.contracts import BaseModel
 
+from .dto.artifact_reclaim import ArtifactReclaim
+from .dto.prune_result import PruneResult
 from .dto.pruneable import Pruneable
+from .dto.purge_result import PurgeResult
+from .service.artifacts import ArtifactCollector
+from .service.budget import prioritize
 from .service.client import PruneClient
+from .service.collapse import ModelCollapser
+from .service.journal import PruneJournal
+from .service.linkage import LinkageIndex
+from .service.pipeline import PipelinedEngine
+from .service.plan import PrunePlan
+from .service.rest import AsyncRestEngine
+from .service.streaming import StreamingEngine
 
 
 # pylint: disable=too-few-public-methods
@@ -17,21 +33,277 @@ class PruneCommand(BaseModel):
     ----------
     pruner: PruneClient
         MLFlow Tracking Server Pruning Client
+    streaming_engine: Optional[StreamingEngine]
+        When set, stale runs are discovered, filtered and pruned page by page.
+    pipelined_engine: Optional[PipelinedEngine]
+        When set, discovery, filtering and deletion are run as concurrent pipeline stages.
+    model_collapser: Optional[ModelCollapser]
+        When set, registered models whose versions are all pruneable are deleted with a single registered model
+        deletion each.
+    journal: Optional[PruneJournal]
+        Checkpoint journal used to resume an interrupted prune without re-analysis.
+    artifact_collector: Optional[ArtifactCollector]
+        Artifact store garbage collector run over the pruned runs.
+    purge_grace_period: Optional[int]
+        When set, runs deleted longer ago than this period (measured in milliseconds) are permanently purged
+        from the backend store.  Requires the pruner to have a `sql_engine`.
+    metrics_textfile: Optional[str]
+        Path of the Prometheus textfile the pruner metrics are written to on completion.
+    metrics_summary: Optional[str]
+        Path of the JSON summary the pruner metrics are written to on completion.
+    rest_engine: Optional[AsyncRestEngine]
+        When set, discovery and deletion are performed concurrently against the MLFlow REST API.
+    plan_output: Optional[str]
+        Path of the binary plan file the computed plan is written to (for review with `Report`).
+    plan_input: Optional[str]
+        Path of a previously written plan file to execute instead of re-analysing the server.
+    plan_max_age: Optional[int]
+        Age (measured in milliseconds) after which a plan file is rejected as stale.
+    priority: Optional[str]
+        The order deletions are planned in (`oldest` or `largest` first), so the most valuable work is done
+        within the pruner's `budget`.
+    linkage_index_path: Optional[str]
+        Path the run to model version linkage index is persisted to after analysis, and loaded from when the
+        analysis is skipped (resuming a journal or executing a plan file), so deletions are still checked.
     """
 
     pruner: PruneClient
+    streaming_engine: Optional[StreamingEngine] = None
+    pipelined_engine: Optional[PipelinedEngine] = None
+    model_collapser: Optional[ModelCollapser] = None
+    journal: Optional[PruneJournal] = None
+    artifact_collector: Optional[ArtifactCollector] = None
+    purge_grace_period: Optional[int] = None
+    metrics_textfile: Optional[str] = None
+    metrics_summary: Optional[str] = None
+    rest_engine: Optional[AsyncRestEngine] = None
+    plan_output: Optional[str] = None
+    plan_input: Optional[str] = None
+    plan_max_age: Optional[int] = None
+    priority: Optional[str] = None
+    linkage_index_path: Optional[str] = None
+
+    def plan(self, ttl: int) -> Pruneable:
+        """
+        Returns the resources to prune, resuming the journaled plan when one is resumable.
+
+        Parameters
+        ----------
+        ttl: int
+            The entity TTL (measured in days).
+
+        Returns
+        -------
+        pruneable: Pruneable
+            A `Pruneable` defining the resources to process.
+        """
+
+        if self.plan_input is not None:
+            # Execute the reviewed plan, streaming its entities from the plan file
+            plan: PrunePlan = PrunePlan(path=self.plan_input)
+            plan.validate(
+                cutoff=self.pruner.oldest_allowed_timestamp,
+                ttl=ttl,
+                tracking_uri=demand_env_var(name="MLFLOW_TRACKING_URI"),
+                max_age=self.plan_max_age,
+            )
+            print(f"[LOAD] Resource Pruning Plan ({len(plan.models)} models, {len(plan.runs)} runs)")
+            pruneables: Pruneable = plan
+            self.load_linkage_index()
+
+            if self.journal is not None:
+                # Journal the plan file's entities (with its own cut-off), so the deletions left pending when the
+                # budget runs out are resumed by the next run
+                self.journal.record_plan(pruneables=pruneables, cutoff=plan.footer["cutoff"], ttl=ttl)
+        elif self.journal is not None and self.journal.is_resumable(
+            cutoff=self.pruner.oldest_allowed_timestamp, ttl=ttl
+        ):
+            # Resume the previously computed plan, skipping the deletions which already completed
+            print(f"[RESUME] Resource Pruning Plan ({self.journal.pending_count()} pending)")
+            pruneables: Pruneable = self.journal.load_plan()
+            self.load_linkage_index()
+        else:
+            # Determine (by business logic) which runs and models we want to prune
+            print("[START] Resource Pruneablilty Analysis")
+            pruneables: Pruneable = self.pruner.get_pruneables()
+            print("[COMPLETE] Resource Pruneablilty Analysis")
+
+            if self.linkage_index_path is not None and self.pruner.linkage_index is not None:
+                self.pruner.linkage_index.save(path=self.linkage_index_path)
+
+            if self.model_collapser is not None:
+                pruneables.registered_models = self.model_collapser.get_collapsible_models(
+                    pruner=self.pruner, versions=pruneables.models
+                )
+
+            if self.priority is not None:
+                pruneables = prioritize(
+                    pruneables=pruneables, priority=self.priority, collector=self.artifact_collector
+                )
+
+            if self.journal is not None:
+                self.journal.record_plan(pruneables=pruneables, cutoff=self.pruner.oldest_allowed_timestamp, ttl=ttl)
+
+        if self.plan_output is not None:
+            PrunePlan.write(
+                path=self.plan_output,
+                pruneables=pruneables,
+                cutoff=self.pruner.oldest_allowed_timestamp,
+                ttl=ttl,
+                tracking_uri=demand_env_var(name="MLFLOW_TRACKING_URI"),
+            )
+            print(f"[COMPLETE] Resource Pruning Plan Written: {self.plan_output}")
+
+        if self.journal is not None:
+            # Checkpoint each completed deletion
+            self.pruner.journal = self.journal
+
+        return pruneables
+
+    def load_linkage_index(self) -> None:
+        """Loads the persisted linkage index (if any) for the deletion stage, in place of model version discovery."""
+
+        if self.linkage_index_path is not None and os.path.exists(self.linkage_index_path):
+            self.pruner.linkage_index = LinkageIndex.load(path=self.linkage_index_path)
+            print(f"[LOAD] Linkage Index ({len(self.pruner.linkage_index)} linked runs)")
+
+    @staticmethod
+    def failed_experiment_ids(pruneables: Pruneable, failed_run_ids: set[str]) -> set[str]:
+        """Returns the ids of the experiments of the planned runs not deleted (failed, skipped or pending)."""
+
+        if not failed_run_ids:
+            return set()
+        return {run.info.experiment_id for run in pruneables.runs if run.info.run_id in failed_run_ids}
+
+    def collect_artifacts(self, pruneables: Pruneable, result: PruneResult, dry_run: bool) -> None:
+        """Reclaims the artifact store space of the runs which were deleted (or reported by a dry run)."""
+
+        deleted_run_ids: set[str] = set(result.deleted_run_ids)
+        print("[START] Artifact Collection")
+        reclaim: ArtifactReclaim = self.artifact_collector.collect(
+            runs=(run for run in pruneables.runs if run.info.run_id in deleted_run_ids), dry_run=dry_run
+        )
+        print(f"[COMPLETE] Artifact Collection: {reclaim}")
 
-    def execute(self, dry_run: bool) -> None:
-        """Default entry point for command. Executes the pruning process."""
+    def purge(self, dry_run: bool) -> None:
+        """Permanently removes the runs which have been soft deleted for longer than the grace period."""
 
-        print(f"Pruning threshold set to: {int(demand_env_var(name='MLFLOW_TRACKING_ENTITY_TTL'))}")
+        print("[START] Deleted Run Purging")
+        purge: PurgeResult = self.pruner.sql_engine.purge_deleted_runs(
+            older_than=time() * 1000 - self.purge_grace_period, dry_run=dry_run
+        )
+        print(f"[COMPLETE] Deleted Run Purging: {purge}")
 
-        # Determine (by business logic) which runs and models we want to prune
-        print("[START] Resource Pruneablilty Analysis")
-        pruneables: Pruneable = self.pruner.get_pruneables()
-        print("[COMPLETE] Resource Pruneablilty Analysis")
+    def close(self) -> None:
+        """Closes the files and connections held by the command (the journal, and the pruner's state and logs)."""
+
+        if self.journal is not None:
+            self.journal.close()
+        if self.pruner.scan_state is not None:
+            self.pruner.scan_state.close()
+        if self.pruner.experiment_digests is not None:
+            self.pruner.experiment_digests.close()
+        if self.pruner.sql_engine is not None:
+            self.pruner.sql_engine.engine.dispose()
+        self.pruner.decision_log.close()
+
+    def execute(self, dry_run: bool) -> PruneResult:
+        """Default entry point for command. Executes the pruning process, returning its deletion accounting."""
+
+        if self.pruner.controller is None:
+            return self.run(dry_run=dry_run)
+
+        # The controller retries the client calls itself, so MLFlow's own retries are disabled for the prune
+        with self.pruner.controller.client_retries_disabled():
+            return self.run(dry_run=dry_run)
+
+    def commit_incremental_state(self, pruneables: Pruneable, result: PruneResult) -> None:
+        """
+        Persists the incremental state (`--state` and `--digests`) now the deletions have been applied, holding
+        back the failed and skipped runs (and those left pending when the budget ran out).
+        """
+
+        failed_run_ids: list[str] = [
+            entity["id"] for entity in result.failures + result.skips if entity["kind"] == "run"
+        ]
+        if self.journal is not None:
+            failed_run_ids += [payload["run_id"] for payload in self.journal.iter_pending(kind="run")]
+        if self.pruner.scan_state is not None:
+            self.pruner.scan_state.commit(failed_run_ids=failed_run_ids)
+        if self.pruner.experiment_digests is not None:
+            self.pruner.experiment_digests.commit(
+                failed_experiment_ids=self.failed_experiment_ids(
+                    pruneables=pruneables, failed_run_ids=set(failed_run_ids)
+                )
+            )
+
+    def prune_planned(self, ttl: int, dry_run: bool) -> PruneResult:
+        """Plans (or loads) the pruneable resources and prunes them, returning the deletion accounting."""
+
+        pruneables: Pruneable = self.plan(ttl=ttl)
+        if self.artifact_collector is not None:
+            # Only the artifacts of the runs actually deleted are collected
+            self.pruner.track_deleted_runs = True
 
         # Call the MLFlow Tracking Server API to soft `delete` the artifacts.
         print("[START] Resource Pruning")
-        self.pruner.prune(pruneables=pruneables, dry_run=dry_run)
-        print("[COMPLETE] Resource Pruning")
+        if self.model_collapser is not None:
+            result: PruneResult = self.model_collapser.prune(pruner=self.pruner, pruneables=pruneables, dry_run=dry_run)
+        else:
+            result: PruneResult = self.pruner.prune(pruneables=pruneables, dry_run=dry_run)
+        print(f"[COMPLETE] Resource Pruning: {result}")
+
+        if self.pruner.budget is not None:
+            pending: str = f", {self.journal.pending_count()} pending" if self.journal is not None else ""
+            print(f"[BUDGET] {self.pruner.budget.to_dict()}{pending}")
+
+        if self.artifact_collector is not None:
+            self.collect_artifacts(pruneables=pruneables, result=result, dry_run=dry_run)
+
+        if not dry_run and (self.pruner.scan_state is not None or self.pruner.experiment_digests is not None):
+            self.commit_incremental_state(pruneables=pruneables, result=result)
+
+        if isinstance(pruneables, PrunePlan):
+            pruneables.close()
+        return result
+
+    def run(self, dry_run: bool) -> PruneResult:
+        """Executes the pruning process, returning its deletion accounting."""
+
+        ttl: int = int(demand_env_var(name="MLFLOW_TRACKING_ENTITY_TTL"))
+        print(f"Pruning threshold set to: {ttl}")
+
+        if self.rest_engine is not None:
+            # Discovery pagination and deletions are overlapped on an event loop
+            print("[START] Asynchronous Resource Pruning")
+            try:
+                result: PruneResult = self.rest_engine.prune(pruner=self.pruner, dry_run=dry_run)
+            finally:
+                self.rest_engine.close()
+            print(f"[COMPLETE] Asynchronous Resource Pruning: {result}")
+        elif self.streaming_engine is not None:
+            # Analysis and pruning are interleaved, one page of runs at a time
+            print("[START] Streaming Resource Pruning")
+            result: PruneResult = self.streaming_engine.prune(pruner=self.pruner, dry_run=dry_run)
+            print(f"[COMPLETE] Streaming Resource Pruning: {result}")
+        elif self.pipelined_engine is not None:
+            # Run discovery overlaps model version discovery and deletion, bounded by the pipeline depth
+            print("[START] Pipelined Resource Pruning")
+            result: PruneResult = self.pipelined_engine.prune(pruner=self.pruner, dry_run=dry_run)
+            print(f"[COMPLETE] Pipelined Resource Pruning: {result}")
+        else:
+            result: PruneResult = self.prune_planned(ttl=ttl, dry_run=dry_run)
+
+        if self.purge_grace_period is not None:
+            self.purge(dry_run=dry_run)
+
+        if self.pruner.controller is not None:
+            print(f"[THROTTLE] {self.pruner.controller.to_dict()}")
+
+        if self.metrics_textfile or self.metrics_summary:
+            self.pruner.metrics.write(textfile_path=self.metrics_textfile, summary_path=self.metrics_summary)
+            print(f"[METRICS] {self.pruner.metrics.to_dict()}")
+
+        # Flush the buffered structured log (and audit trail)
+        self.pruner.decision_log.close()
+        return result
@@ -0,0 +1,360 @@
+""" Long Running Service Mode For Pruning Process """
+
+import hmac
+import io
+import json
+import sys
+from argparse import Namespace
+from collections import deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Condition, Event, Thread, get_ident
+from time import monotonic
+from typing import Any, Callable, Iterator, Optional
+from urllib.parse import urlparse
+
+from .dto.prune_result import PruneResult
+
+# Number of finished runs (and their progress) kept for the control API
+RUN_HISTORY: int = 20
+
+# Environment variables (in order of precedence) holding the bearer token required to trigger runs
+TOKEN_VARIABLES: tuple[str, ...] = ("MLFLOW_PRUNE_DAEMON_TOKEN", "MLFLOW_TRACKING_TOKEN")
+
+
+class ProgressWriter(io.TextIOBase):
+    """
+    Progress Writer
+    Tees the output of a run to the original stream and the progress lines of the run.
+    """
+
+    def __init__(self, stream: Any, on_line: Callable[[str], None]):
+        self.stream = stream
+        self.on_line = on_line
+        self.buffer: str = ""
+
+    def write(self, text: str) -> int:
+        """Writes the text to the stream, passing every completed line on to `on_line`."""
+
+        self.stream.write(text)
+        self.buffer += text
+        *lines, self.buffer = self.buffer.split("\n")
+        for line in lines:
+            self.on_line(line)
+        return len(text)
+
+    def flush(self) -> None:
+        """Flushes the stream."""
+
+        self.stream.flush()
+
+
+class OutputRouter(io.TextIOBase):
+    """
+    Output Router
+    Stands in for `sys.stdout` while a run is in progress, sending the output of the run's thread to its progress
+    writer, and the output of every other thread (the HTTP handlers, the log listeners) only to the original stream.
+    """
+
+    def __init__(self, stream: Any, thread_id: int, writer: ProgressWriter):
+        self.stream = stream
+        self.thread_id = thread_id
+        self.writer = writer
+
+    def write(self, text: str) -> int:
+        """Writes the text to the progress writer from the run's thread, and to the stream otherwise."""
+
+        if get_ident() == self.thread_id:
+            return self.writer.write(text)
+        return self.stream.write(text)
+
+    def flush(self) -> None:
+        """Flushes the stream."""
+
+        self.stream.flush()
+
+
+# The daemon's configuration, schedule and run history are held together under its lock
+# pylint: disable=too-many-instance-attributes
+class PruneDaemon:
+    """
+    Prune Daemon
+    Long running service mode of the pruning process.  Prunes are run on an internal schedule (replacing the
+    external cron job) and on demand through an HTTP control API.  A single MLFlow client is kept for the life
+    of the process, so the interpreter and MLFlow imports and the pooled (keep-alive) connections are warm for
+    every run.  Runs never overlap, and the state files (`--journal`, `--state`, `--digests`) are opened for
+    each run and closed when it finishes.
+
+    Endpoints (under the `--anaconda-project-url-prefix`):
+
+    - `GET /status`: the current run, the next scheduled run and the run history.
+    - `POST /runs/dry-run` and `POST /runs/prune`: trigger a run (`409` while one is in progress).  Requires an
+      `Authorization: Bearer <token>` header carrying the daemon's `token` (`401` otherwise).
+    - `GET /runs/<id>/progress`: stream the progress of a run (`latest` for the most recent run).
+    - `GET /metrics`: the metrics of the last completed run, in the Prometheus text exposition format.
+
+    Attributes
+    ----------
+    cli_args: Namespace
+        The parsed command line arguments each run's command is built from.
+    interval: Optional[float]
+        The interval (measured in seconds) between scheduled runs, `None` to only run on demand.
+    build_command: Callable[..., Any]
+        Builds the command of a run from the command line arguments and the shared MLFlow client.
+    client: Any
+        The MLFlow client shared by every run.
+    token: Optional[str]
+        The bearer token required to trigger runs through the control API.  When `None` runs can not be
+        triggered through the API (and are only run on the schedule).
+    """
+
+    cli_args: Namespace
+    interval: Optional[float]
+    build_command: Callable[..., Any]
+    client: Any
+    token: Optional[str]
+
+    def __init__(
+        self,
+        cli_args: Namespace,
+        interval: Optional[float],
+        build_command: Callable[..., Any],
+        client: Any,
+        token: Optional[str] = None,
+    ):
+        self.cli_args = cli_args
+        self.interval = interval
+        self.build_command = build_command
+        self.client = client
+        self.token = token
+        self.condition: Condition = Condition()
+        self.runs: deque = deque(maxlen=RUN_HISTORY)
+        self.current: Optional[dict] = None
+        self.metrics: Optional[str] = None
+        self.next_run: Optional[float] = None
+        self.stopped: Event = Event()
+
+    def is_authorized(self, authorization: Optional[str]) -> bool:
+        """Returns `True` when the `Authorization` header of a control request carries the daemon's bearer token."""
+
+        if not self.token or not authorization:
+            return False
+        scheme, _, credentials = authorization.partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(
+            credentials.strip().encode("utf-8"), self.token.encode("utf-8")
+        )
+
+    def trigger(self, dry_run: bool, trigger: str) -> Optional[dict]:
+        """
+        Starts a run in the background.
+
+        Parameters
+        ----------
+        dry_run: bool
+            When `True` resources are only reported.
+        trigger: str
+            What started the run (`schedule` or `api`).
+
+        Returns
+        -------
+        run: Optional[dict]
+            The started run, `None` if a run is already in progress.
+        """
+
+        with self.condition:
+            if self.current is not None:
+                return None
+            run: dict = {
+                "id": self.runs[-1]["id"] + 1 if self.runs else 1,
+                "dry_run": dry_run,
+                "trigger": trigger,
+                "status": "running",
+                "started": datetime.now(timezone.utc).isoformat(),
+                "progress": [],
+            }
+            self.current = run
+            self.runs.append(run)
+        Thread(target=self.execute, args=(run,), name=f"prune-run-{run['id']}", daemon=True).start()
+        return run
+
+    def execute(self, run: dict) -> None:
+        """
+        Executes a run, recording its progress, outcome and metrics.  The files and connections opened by the
+        run's command (the journal, state, digests and audit log) are closed when the run finishes.
+        """
+
+        def on_line(line: str) -> None:
+            with self.condition:
+                run["progress"].append(line)
+                self.condition.notify_all()
+
+        stream: Any = sys.stdout
+        router: OutputRouter = OutputRouter(
+            stream=stream, thread_id=get_ident(), writer=ProgressWriter(stream=stream, on_line=on_line)
+        )
+        outcome: dict = {}
+        command: Any = None
+        sys.stdout = router
+        try:
+            command = self.build_command(cli_args=self.cli_args, mlflow_client=self.client)
+            result: PruneResult = command.execute(dry_run=run["dry_run"])
+            outcome = {"status": "completed", "succeeded": result.succeeded, "failed": result.failed}
+            self.metrics = command.pruner.metrics.to_prometheus()
+        except Exception as error:  # pylint: disable=broad-except
+            outcome = {"status": "failed", "error": f"{type(error).__name__}: {error}"}
+        finally:
+            if command is not None:
+                command.close()
+            if sys.stdout is router:
+                sys.stdout = stream
+        with self.condition:
+            run.update(outcome, finished=datetime.now(timezone.utc).isoformat())
+            self.current = None
+            self.condition.notify_all()
+
+    def schedule(self) -> None:
+        """Triggers a run (honouring `--dry-run`) every `interval` seconds, until stopped."""
+
+        while not self.stopped.is_set():
+            self.next_run = monotonic() + self.interval
+            if self.stopped.wait(timeout=self.interval):
+                return
+            if self.trigger(dry_run=self.cli_args.dry_run, trigger="schedule") is None:
+                print("[SCHEDULE] Skipped, a run is in progress")
+
+    def find_run(self, run_id: str) -> Optional[dict]:
+        """Returns the run with the id (`latest` for the most recent run), `None` if it is not in the history."""
+
+        with self.condition:
+            if run_id == "latest":
+                return self.runs[-1] if self.runs else None
+            return next((run for run in self.runs if str(run["id"]) == run_id), None)
+
+    def follow(self, run: dict) -> Iterator[str]:
+        """Yields the progress lines of a run as they are written, until the run finishes."""
+
+        position: int = 0
+        while True:
+            with self.condition:
+                while position >= len(run["progress"]) and run["status"] == "running":
+                    self.condition.wait(timeout=1.0)
+                lines: list[str] = run["progress"][position:]
+                finished: bool = run["status"] != "running"
+            position += len(lines)
+            yield from lines
+            if finished and position >= len(run["progress"]):
+                return
+
+    def status(self) -> dict:
+        """Returns the state of the daemon for the control API."""
+
+        with self.condition:
+            return {
+                "current": self.current["id"] if self.current is not None else None,
+                "next_run_seconds": max(self.next_run - monotonic(), 0.0) if self.next_run is not None else None,
+                "runs": [{key: value for key, value in run.items() if key != "progress"} for run in self.runs],
+            }
+
+    # The request handler is defined inline to close over the daemon and the URL prefix
+    # pylint: disable=too-many-statements
+    def serve(self, address: str, port: int, url_prefix: str = "") -> None:
+        """
+        Serves the control API (and runs the schedule) until interrupted.
+
+        Parameters
+        ----------
+        address: str
+            The IP address to listen on.
+        port: int
+            The port to listen on.
+        url_prefix: str
+            The prefix in front of the control API paths.
+        """
+
+        daemon: PruneDaemon = self
+        prefix: str = url_prefix.rstrip("/")
+
+        class ControlHandler(BaseHTTPRequestHandler):
+            """Control API request handler."""
+
+            def route(self) -> str:
+                """Returns the request path, stripped of the URL prefix and any trailing slash."""
+
+                path: str = urlparse(self.path).path
+                if prefix and path.startswith(prefix):
+                    path = path[len(prefix) :]
+                return path.rstrip("/") or "/"
+
+            def respond(self, status: int, body: Any, content_type: str = "application/json") -> None:
+                """Sends a complete response, serializing the body as JSON unless it is already text."""
+
+                payload: bytes = (body if isinstance(body, str) else json.dumps(body)).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                """Serves the status, metrics and run progress endpoints."""
+
+                path: str = self.route()
+                parts: list[str] = path.strip("/").split("/")
+                if path in ("/", "/status"):
+                    self.respond(200, daemon.status())
+                elif path == "/metrics":
+                    if daemon.metrics is None:
+                        self.respond(404, {"error": "No run has completed"})
+                    else:
+                        self.respond(200, daemon.metrics, content_type="text/plain; version=0.0.4")
+                elif len(parts) == 3 and parts[0] == "runs" and parts[2] == "progress":
+                    run: Optional[dict] = daemon.find_run(run_id=parts[1])
+                    if run is None:
+                        self.respond(404, {"error": f"Run {parts[1]} not found"})
+                        return
+                    # Streamed until the run finishes (the connection is closed to end the response)
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; charset=utf-8")
+                    self.end_headers()
+                    for line in daemon.follow(run=run):
+                        self.wfile.write(f"{line}\n".encode("utf-8"))
+                        self.wfile.flush()
+                else:
+                    self.respond(404, {"error": f"Unknown path {path}"})
+
+            def do_POST(self) -> None:  # pylint: disable=invalid-name
+                """Triggers a dry run or a pruning run."""
+
+                path: str = self.route()
+                if path not in ("/runs/dry-run", "/runs/prune"):
+                    self.respond(404, {"error": f"Unknown path {path}"})
+                    return
+                if not daemon.is_authorized(authorization=self.headers.get("Authorization")):
+                    self.respond(401, {"error": "A valid bearer token is required to trigger a run"})
+                    return
+                dry_run: bool = path == "/runs/dry-run"
+                if not dry_run and daemon.cli_args.dry_run:
+                    self.respond(403, {"error": "The daemon was started with --dry-run"})
+                    return
+                run: Optional[dict] = daemon.trigger(dry_run=dry_run, trigger="api")
+                if run is None:
+                    self.respond(409, {"error": "A run is in progress", "current": daemon.status()["current"]})
+                else:
+                    self.respond(202, {"id": run["id"], "dry_run": dry_run})
+
+            def log_message(self, format: str, *args) -> None:  # pylint: disable=redefined-builtin
+                sys.stderr.write(f"[HTTP] {self.address_string()} {format % args}\n")
+
+        if self.interval:
+            Thread(target=self.schedule, name="prune-schedule", daemon=True).start()
+
+        server: ThreadingHTTPServer = ThreadingHTTPServer((address, port), ControlHandler)
+        print(f"[START] Resource Pruning Service on {address}:{port}{prefix}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stopped.set()
+            server.server_close()
+            print("[COMPLETE] Resource Pruning Service")
@@ -0,0 +1,29 @@
+""" Artifact Reclaim Definition """
+
+from anaconda.enterprise.server.contracts import BaseModel
+
+
+# pylint: disable=too-few-public-methods
+class ArtifactReclaim(BaseModel):
+    """
+    Artifact Reclaim DTO
+
+    Attributes
+    ----------
+    runs: int
+        The number of runs whose artifacts were collected.
+    files: int
+        The number of files reclaimed.
+    bytes: int
+        The number of bytes reclaimed.
+    skipped: int
+        The number of runs whose artifacts could not be resolved to a local directory.
+    failed: int
+        The number of runs whose artifacts failed to be removed.
+    """
+
+    runs: int = 0
+    files: int = 0
+    bytes: int = 0
+    skipped: int = 0
+    failed: int = 0
@@ -0,0 +1,67 @@
+""" Prune Result Definition """
+
+from anaconda.enterprise.server.contracts import BaseModel
+
+
+# pylint: disable=too-few-public-methods
+class PruneResult(BaseModel):
+    """
+    Prune Result DTO
+
+    Attributes
+    ----------
+    succeeded: dict[str, int]
+        The number of successfully deleted entities, by entity kind.
+    failed: dict[str, int]
+        The number of entities which failed to delete, by entity kind.
+    failures: list[dict]
+        The details (kind, id and error) of each failed deletion.
+    skipped: dict[str, int]
+        The number of planned entities which were not deleted (e.g. runs linked to a model version since they
+        were planned), by entity kind.
+    skips: list[dict]
+        The details (kind, id and reason) of each skipped deletion.
+    deleted_run_ids: list[str]
+        The ids of the runs deleted (or reported by a dry run), when tracked by the pruner.
+    """
+
+    succeeded: dict[str, int] = {}
+    failed: dict[str, int] = {}
+    failures: list[dict] = []
+    skipped: dict[str, int] = {}
+    skips: list[dict] = []
+    deleted_run_ids: list[str] = []
+
+    def __str__(self) -> str:
+        # The deleted run ids are left out of the printed accounting, as they may number in the millions
+        return " ".join(f"{name}={value!r}" for name, value in self.__repr_args__() if name != "deleted_run_ids")
+
+    def record_success(self, kind: str) -> None:
+        """Records a successful deletion of an entity of the given kind."""
+
+        self.succeeded[kind] = self.succeeded.get(kind, 0) + 1
+
+    def record_failure(self, kind: str, entity_id: str, error: str) -> None:
+        """Records a failed deletion of an entity of the given kind."""
+
+        self.failed[kind] = self.failed.get(kind, 0) + 1
+        self.failures.append({"kind": kind, "id": entity_id, "error": error})
+
+    def record_skip(self, kind: str, entity_id: str, reason: str) -> None:
+        """Records a planned deletion of an entity of the given kind which was skipped."""
+
+        self.skipped[kind] = self.skipped.get(kind, 0) + 1
+        self.skips.append({"kind": kind, "id": entity_id, "reason": reason})
+
+    def merge(self, other: "PruneResult") -> None:
+        """Accumulates the accounting of another result into this one."""
+
+        for kind, count in other.succeeded.items():
+            self.succeeded[kind] = self.succeeded.get(kind, 0) + count
+        for kind, count in other.failed.items():
+            self.failed[kind] = self.failed.get(kind, 0) + count
+        self.failures += other.failures
+        for kind, count in other.skipped.items():
+            self.skipped[kind] = self.skipped.get(kind, 0) + count
+        self.skips += other.skips
+        self.deleted_run_ids += other.deleted_run_ids
@@ -1,10 +1,14 @@
 """ Pruneable Definition """
 
+from typing import Union
+
 from mlflow.entities import Run
 from mlflow.entities.model_registry import ModelVersion
 
 from anaconda.enterprise.server.contracts import BaseModel
 
+from .records import ModelVersionRecord, RunRecord, RunTable
+
 
 # pylint: disable=too-few-public-methods
 class Pruneable(BaseModel):
@@ -13,11 +17,15 @@ class Pruneable(BaseModel):
 
     Attributes
     ----------
-    runs: list[Run]
-        A list of pruneable runs
-    models: list[ModelVersion]
+    runs: Union[RunTable, list[Union[RunRecord, Run]]]
+        A list of pruneable runs, held as a compact `RunTable` when discovered with compact records.
+    models: list[Union[ModelVersionRecord, ModelVersion]]
         A list of pruneable models
+    registered_models: list[str]
+        The names of the registered models whose versions are all pruneable (and held in `models`), which are
+        deleted with a single registered model deletion each.
     """
 
-    runs: list[Run] = []
-    models: list[ModelVersion] = []
+    runs: Union[RunTable, list[Union[RunRecord, Run]]] = []
+    models: list[Union[ModelVersionRecord, ModelVersion]] = []
+    registered_models: list[str] = []
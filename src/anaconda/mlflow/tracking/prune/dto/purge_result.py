@@ -0,0 +1,32 @@
+""" Purge Result Definition """
+
+from anaconda.enterprise.server.contracts import BaseModel
+
+
+# pylint: disable=too-few-public-methods
+class PurgeResult(BaseModel):
+    """
+    Purge Result DTO
+
+    Attributes
+    ----------
+    runs: int
+        The number of runs permanently removed (or eligible, for a dry run).
+    rows: int
+        The number of rows removed, including the child rows of the runs.
+    batches: int
+        The number of committed batches.
+    elapsed: float
+        The wall time (measured in seconds) of the purge.
+    """
+
+    runs: int = 0
+    rows: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def runs_per_second(self) -> float:
+        """The purge throughput, in runs per second."""
+
+        return self.runs / self.elapsed if self.elapsed else 0.0
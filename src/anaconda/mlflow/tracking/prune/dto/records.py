@@ -0,0 +1,278 @@
+""" Compact Pruning Candidate Record Definitions """
+
+from array import array
+from typing import Any, Iterable, Iterator, Optional, Union
+
+from mlflow.entities import Run
+from mlflow.entities.model_registry import ModelVersion
+
+# End time stored for runs without one
+MISSING_END_TIME: int = -1
+
+
+class RunRecord:
+    """
+    Run Record
+    A slotted run holding only the fields read by the pruning process.  The fields are also reachable
+    through `info` so records can be used wherever a `Run` is (e.g. `run.info.run_id`).
+    """
+
+    __slots__ = ("run_id", "experiment_id", "end_time", "status", "artifact_uri", "lifecycle_stage")
+
+    # A record is built from each of the run fields it holds
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        run_id: str,
+        experiment_id: str,
+        end_time: Optional[int],
+        status: str,
+        artifact_uri: Optional[str],
+        lifecycle_stage: str = "active",
+    ):
+        self.run_id = run_id
+        self.experiment_id = experiment_id
+        self.end_time = end_time
+        self.status = status
+        self.artifact_uri = artifact_uri
+        self.lifecycle_stage = lifecycle_stage
+
+    @property
+    def info(self) -> "RunRecord":
+        """The record itself, standing in for `Run.info`."""
+
+        return self
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, RunRecord) and all(
+            getattr(self, name) == getattr(other, name) for name in RunRecord.__slots__
+        )
+
+    def __repr__(self) -> str:
+        return f"RunRecord(run_id={self.run_id!r}, experiment_id={self.experiment_id!r}, end_time={self.end_time!r})"
+
+    @staticmethod
+    def from_run(run: Union[Run, "RunRecord"]) -> "RunRecord":
+        """Builds a record from a `Run`, dropping its data (params, metrics and tags)."""
+
+        if isinstance(run, RunRecord):
+            return run
+        return RunRecord(
+            run_id=run.info.run_id,
+            experiment_id=run.info.experiment_id,
+            end_time=run.info.end_time,
+            status=run.info.status,
+            artifact_uri=run.info.artifact_uri,
+            lifecycle_stage=run.info.lifecycle_stage,
+        )
+
+
+class ModelVersionRecord:
+    """
+    Model Version Record
+    A slotted model version holding only the fields read by the pruning process.
+    """
+
+    __slots__ = ("name", "version", "last_updated_timestamp", "current_stage", "run_id")
+
+    def __init__(
+        self,
+        name: str,
+        version: str,
+        last_updated_timestamp: Optional[int],
+        current_stage: str = "None",
+        run_id: Optional[str] = None,
+    ):
+        self.name = name
+        self.version = version
+        self.last_updated_timestamp = last_updated_timestamp
+        self.current_stage = current_stage
+        self.run_id = run_id
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, ModelVersionRecord) and all(
+            getattr(self, name) == getattr(other, name) for name in ModelVersionRecord.__slots__
+        )
+
+    def __repr__(self) -> str:
+        return f"ModelVersionRecord(name={self.name!r}, version={self.version!r})"
+
+    @staticmethod
+    def from_model_version(version: Union[ModelVersion, "ModelVersionRecord"]) -> "ModelVersionRecord":
+        """Builds a record from a `ModelVersion`."""
+
+        if isinstance(version, ModelVersionRecord):
+            return version
+        return ModelVersionRecord(
+            name=version.name,
+            # Versions are strings in the REST API, but integers when read from a database backed store
+            version=str(version.version),
+            last_updated_timestamp=version.last_updated_timestamp,
+            current_stage=version.current_stage,
+            run_id=version.run_id or None,
+        )
+
+
+# A column per run field, and the lookups and side tables the columns index into
+# pylint: disable=too-many-instance-attributes
+class RunTable:
+    """
+    Run Table
+    An append-only, array-backed (columnar) sequence of active runs, materializing `RunRecord` objects only
+    as they are read.  A run costs roughly 29 bytes:
+
+    1. Run ids (32 character hex uuids) are packed into 16 bytes; other ids are kept aside.
+    2. End times are held in a signed 64-bit array.
+    3. Experiment ids and statuses are held as indices into small lookup lists.
+    4. Artifact URIs following the default `<root>/<run id>/artifacts` layout are derived from a per-experiment
+       root; other URIs are kept aside.
+    """
+
+    __slots__ = (
+        "ids",
+        "end_times",
+        "experiments",
+        "statuses",
+        "experiment_ids",
+        "experiment_index",
+        "artifact_roots",
+        "status_values",
+        "status_index",
+        "id_overrides",
+        "artifact_overrides",
+    )
+
+    def __init__(self, runs: Iterable[Union[Run, RunRecord]] = ()):
+        self.ids: bytearray = bytearray()
+        self.end_times: array = array("q")
+        self.experiments: array = array("I")
+        self.statuses: bytearray = bytearray()
+        self.experiment_ids: list[str] = []
+        self.experiment_index: dict[str, int] = {}
+        self.artifact_roots: list[Optional[str]] = []
+        self.status_values: list[str] = []
+        self.status_index: dict[str, int] = {}
+        self.id_overrides: dict[int, str] = {}
+        self.artifact_overrides: dict[int, Optional[str]] = {}
+        self.extend(runs)
+
+    def append(self, run: Union[Run, RunRecord]) -> None:
+        """Appends a run (only the fields read by the pruning process are retained)."""
+
+        info: Any = run.info
+        position: int = len(self.end_times)
+        run_id: str = info.run_id
+
+        try:
+            packed: bytes = bytes.fromhex(run_id)
+        except ValueError:
+            packed = b""
+        if len(packed) == 16:
+            self.ids += packed
+        else:
+            self.ids += bytes(16)
+            self.id_overrides[position] = run_id
+
+        experiment: Optional[int] = self.experiment_index.get(info.experiment_id)
+        if experiment is None:
+            experiment = self.experiment_index[info.experiment_id] = len(self.experiment_ids)
+            self.experiment_ids.append(info.experiment_id)
+            self.artifact_roots.append(None)
+        self.experiments.append(experiment)
+
+        status: Optional[int] = self.status_index.get(info.status)
+        if status is None:
+            status = self.status_index[info.status] = len(self.status_values)
+            self.status_values.append(info.status)
+        self.statuses.append(status)
+
+        self.end_times.append(MISSING_END_TIME if info.end_time is None else int(info.end_time))
+
+        artifact_uri: Optional[str] = info.artifact_uri
+        suffix: str = f"/{run_id}/artifacts"
+        if artifact_uri and artifact_uri.endswith(suffix):
+            root: str = artifact_uri[: -len(suffix)]
+            if self.artifact_roots[experiment] is None:
+                self.artifact_roots[experiment] = root
+            if self.artifact_roots[experiment] == root:
+                return
+        self.artifact_overrides[position] = artifact_uri
+
+    def extend(self, runs: Iterable[Union[Run, RunRecord]]) -> None:
+        """Appends each of the runs."""
+
+        for run in runs:
+            self.append(run)
+
+    def run_id(self, index: int) -> str:
+        """Returns the id of the run at `index`."""
+
+        override: Optional[str] = self.id_overrides.get(index)
+        if override is not None:
+            return override
+        return self.ids[index * 16 : index * 16 + 16].hex()
+
+    def __len__(self) -> int:
+        return len(self.end_times)
+
+    def __getitem__(self, index: int) -> RunRecord:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("RunTable index out of range")
+
+        run_id: str = self.run_id(index)
+        experiment: int = self.experiments[index]
+        end_time: int = self.end_times[index]
+        if index in self.artifact_overrides:
+            artifact_uri: Optional[str] = self.artifact_overrides[index]
+        else:
+            artifact_uri = f"{self.artifact_roots[experiment]}/{run_id}/artifacts"
+        return RunRecord(
+            run_id=run_id,
+            experiment_id=self.experiment_ids[experiment],
+            end_time=None if end_time == MISSING_END_TIME else end_time,
+            status=self.status_values[self.statuses[index]],
+            artifact_uri=artifact_uri,
+        )
+
+    def __iter__(self) -> Iterator[RunRecord]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (RunTable, list)) or len(self) != len(other):
+            return False
+        return all(RunRecord.from_run(mine) == RunRecord.from_run(theirs) for mine, theirs in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"RunTable(runs={len(self)})"
+
+    def exclude(self, run_ids: set[str]) -> "RunTable":
+        """Returns a new table without the runs whose ids are in `run_ids`."""
+
+        table: RunTable = RunTable()
+        table.experiment_ids = list(self.experiment_ids)
+        table.experiment_index = dict(self.experiment_index)
+        table.artifact_roots = list(self.artifact_roots)
+        table.status_values = list(self.status_values)
+        table.status_index = dict(self.status_index)
+        for index in range(len(self)):
+            if self.run_id(index) in run_ids:
+                continue
+            position: int = len(table)
+            table.ids += self.ids[index * 16 : index * 16 + 16]
+            table.end_times.append(self.end_times[index])
+            table.experiments.append(self.experiments[index])
+            table.statuses.append(self.statuses[index])
+            if index in self.id_overrides:
+                table.id_overrides[position] = self.id_overrides[index]
+            if index in self.artifact_overrides:
+                table.artifact_overrides[position] = self.artifact_overrides[index]
+        return table
+
+    @property
+    def nbytes(self) -> int:
+        """The size (in bytes) of the table's columns."""
+
+        return sum(memoryview(column).nbytes for column in (self.ids, self.end_times, self.experiments, self.statuses))
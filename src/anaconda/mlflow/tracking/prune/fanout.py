@@ -0,0 +1,218 @@
+""" Multi-Server Fan-Out For Pruning Process """
+
+import json
+import multiprocessing
+import os
+from argparse import Namespace
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import yaml
+
+from .command import PruneCommand
+from .dto.prune_result import PruneResult
+
+# Path arguments which are made distinct per server
+SERVER_PATH_ARGUMENTS: tuple[str, ...] = (
+    "journal",
+    "state",
+    "digests",
+    "linkage_index",
+    "audit_log",
+    "metrics_textfile",
+    "metrics_summary",
+    "plan_output",
+)
+
+# Server config keys and the environment variables they define
+SERVER_ENVIRONMENT: dict[str, str] = {
+    "tracking_uri": "MLFLOW_TRACKING_URI",
+    "registry_uri": "MLFLOW_REGISTRY_URI",
+    "token": "MLFLOW_TRACKING_TOKEN",
+    "ttl": "MLFLOW_TRACKING_ENTITY_TTL",
+}
+
+
+def load_servers(path: str) -> list[dict]:
+    """
+    Loads a servers config (YAML or JSON), of the form:
+
+    ```yaml
+    servers:
+      - name: team-a                          # Unique name, used in reports and per server file paths
+        tracking_uri: https://mlflow.team-a   # Required
+        registry_uri: https://registry.team-a # Optional, defaults to the tracking URI
+        token: ...                            # Optional, defaults to MLFLOW_TRACKING_TOKEN
+        ttl: 30                               # Optional, defaults to MLFLOW_TRACKING_ENTITY_TTL
+    ```
+
+    Parameters
+    ----------
+    path: str
+        The path of the servers config.
+
+    Returns
+    -------
+    servers: list[dict]
+        The server definitions.
+    """
+
+    with open(path, mode="r", encoding="utf-8") as file:
+        document: Any = yaml.safe_load(file) or {}
+    servers: Any = document.get("servers") if isinstance(document, dict) else None
+    if not isinstance(servers, list) or not servers:
+        raise ValueError(f"Servers config {path} must define a list of servers")
+
+    names: set[str] = set()
+    for server in servers:
+        if not isinstance(server, dict) or not server.get("name") or not server.get("tracking_uri"):
+            raise ValueError(f"Servers config {path} entries require a name and tracking_uri: {server}")
+        unknown: set[str] = set(server) - {"name", *SERVER_ENVIRONMENT}
+        if unknown:
+            raise ValueError(f"Server {server['name']} has unknown keys: {sorted(unknown)}")
+        if server["name"] in names:
+            raise ValueError(f"Server name {server['name']} is not unique")
+        names.add(server["name"])
+    return servers
+
+
+def server_path(path: Optional[str], name: str) -> Optional[str]:
+    """Returns the per server variant of a file path (prefixed with the server name), so servers do not share files."""
+
+    if not path:
+        return path
+    return str(Path(path).with_name(f"{name}-{Path(path).name}"))
+
+
+def prune_server(
+    server: dict,
+    cli_args: Namespace,
+    build_command: Callable[..., PruneCommand],
+    defaults: Optional[dict[str, Optional[str]]] = None,
+) -> dict:
+    """
+    Prunes a single server, within a worker process.  Any failure is reported rather than raised, so it does not
+    affect the other servers.
+
+    Worker processes are reused between servers, so every server variable is set (or removed) for each server,
+    falling back to the parent's `defaults` rather than to the values left by the previous server.
+
+    Parameters
+    ----------
+    server: dict
+        The server definition.
+    cli_args: Namespace
+        The parsed command line arguments.
+    build_command: Callable[..., PruneCommand]
+        Builds the prune command from the server's command line arguments (see `handler.build_command`).
+    defaults: Optional[dict[str, Optional[str]]]
+        The parent's values of the server environment variables, the current environment's by default.
+
+    Returns
+    -------
+    report: dict
+        The server's prune report.
+    """
+
+    if defaults is None:
+        defaults = {variable: os.environ.get(variable) for variable in SERVER_ENVIRONMENT.values()}
+
+    # Point the environment (read by the client and command) at the server
+    for key, variable in SERVER_ENVIRONMENT.items():
+        value: Any = server.get(key)
+        if value is None and key != "registry_uri":
+            # The registry defaults to the tracking URI, the other variables to those of the parent
+            value = defaults.get(variable)
+        if value is None:
+            os.environ.pop(variable, None)
+        else:
+            os.environ[variable] = str(value)
+
+    server_args: Namespace = Namespace(**vars(cli_args))
+    for argument in SERVER_PATH_ARGUMENTS:
+        setattr(server_args, argument, server_path(path=getattr(cli_args, argument), name=server["name"]))
+
+    report: dict = {"name": server["name"], "tracking_uri": server["tracking_uri"]}
+    try:
+        result: PruneResult = build_command(cli_args=server_args).execute(dry_run=cli_args.dry_run)
+    except Exception as error:  # pylint: disable=broad-except
+        return {**report, "status": "failed", "error": f"{type(error).__name__}: {error}"}
+    return {**report, "status": "completed", "succeeded": result.succeeded, "failed": result.failed}
+
+
+def aggregate(reports: list[dict]) -> dict:
+    """
+    Combines the per server reports.
+
+    Parameters
+    ----------
+    reports: list[dict]
+        The server prune reports.
+
+    Returns
+    -------
+    report: dict
+        The combined report, with the servers' reports and the totals across servers.
+    """
+
+    totals: dict = {"servers": len(reports), "failed_servers": 0, "succeeded": {}, "failed": {}}
+    for report in reports:
+        if report["status"] != "completed":
+            totals["failed_servers"] += 1
+            continue
+        for outcome in ("succeeded", "failed"):
+            for kind, count in report[outcome].items():
+                totals[outcome][kind] = totals[outcome].get(kind, 0) + count
+    return {"servers": reports, "totals": totals}
+
+
+def run_fanout(cli_args: Namespace, build_command: Callable[..., PruneCommand]) -> dict:
+    """
+    Prunes each of the servers of the `--servers` config with an independent pipeline, in a pool of
+    `--server-concurrency` processes, and reports the combined results.
+
+    Parameters
+    ----------
+    cli_args: Namespace
+        The parsed command line arguments.
+    build_command: Callable[..., PruneCommand]
+        Builds the prune command of each server (see `prune_server`).
+
+    Returns
+    -------
+    report: dict
+        The combined report (see `aggregate`).
+    """
+
+    servers: list[dict] = load_servers(path=cli_args.servers)
+    print(f"[START] Multi-Server Resource Pruning ({len(servers)} servers)")
+
+    reports: dict[str, dict] = {}
+    defaults: dict[str, Optional[str]] = {
+        variable: os.environ.get(variable) for variable in SERVER_ENVIRONMENT.values()
+    }
+    # Workers are spawned (not forked) so no client state or connection pools are shared with the parent
+    with ProcessPoolExecutor(
+        max_workers=cli_args.server_concurrency, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures: dict[Future, dict] = {
+            executor.submit(prune_server, server, cli_args, build_command, defaults): server for server in servers
+        }
+        for future in as_completed(futures):
+            server: dict = futures[future]
+            try:
+                report: dict = future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                # The worker process itself failed
+                report = {"name": server["name"], "tracking_uri": server["tracking_uri"], "status": "failed"}
+                report["error"] = f"{type(error).__name__}: {error}"
+            print(f"[SERVER] {report}")
+            reports[server["name"]] = report
+
+    combined: dict = aggregate(reports=[reports[server["name"]] for server in servers])
+    print(f"[COMPLETE] Multi-Server Resource Pruning: {combined['totals']}")
+    if cli_args.fanout_report:
+        with open(cli_args.fanout_report, mode="w", encoding="utf-8") as file:
+            json.dump(combined, file, indent=2)
+    return combined
@@ -1,17 +1,94 @@
 """ AE5 Project Handler """
+import os
 import sys
 from argparse import ArgumentParser, Namespace
+from typing import Any, Optional
 
-from ae5_tools import load_ae5_user_secrets
+from ae5_tools import demand_env_var, load_ae5_user_secrets
 
 from anaconda.mlflow.tracking.sdk import build_mlflow_client
 
 from .command import PruneCommand
+from .daemon import TOKEN_VARIABLES, PruneDaemon
+from .fanout import run_fanout
+from .service.artifacts import ArtifactCollector
+from .service.audit import DecisionLog
+from .service.budget import PRIORITIES, PruneBudget
 from .service.client import PruneClient
+from .service.collapse import ModelCollapser
+from .service.digest import ExperimentDigests
+from .service.journal import PruneJournal
+from .service.pipeline import PipelinedEngine
+from .service.policy import RetentionPolicy
+from .service.ranking import BestRunRetention
+from .service.rest import AsyncRestEngine
+from .service.shards import ShardedScanner
+from .service.sql import SqlPruneEngine
+from .service.state import ScanState
+from .service.streaming import StreamingEngine
+from .service.throttle import RequestController
 
-if __name__ == "__main__":
-    # This function is meant to provide a handler mechanism between the AE5 deployment arguments
-    # and those required by the called process (or service).
+# The options (by destination) each option cannot be combined with, as the engine or mode it selects would
+# silently ignore them
+INCOMPATIBLE_OPTIONS: dict[str, tuple[str, ...]] = {
+    "policy": ("state", "sql_engine", "async_engine"),
+    "digests": ("state", "sql_engine", "streaming", "async_engine"),
+    "keep_best": ("sql_engine", "async_engine"),
+    "max_duration": ("streaming", "pipelined", "async_engine"),
+    "max_deletes": ("streaming", "pipelined", "async_engine"),
+    "priority": ("streaming", "pipelined", "async_engine", "plan"),
+    "plan": ("streaming", "async_engine", "servers"),
+    "plan_output": ("streaming", "pipelined", "async_engine"),
+    "journal": ("streaming", "pipelined", "async_engine"),
+    "state": ("streaming", "async_engine"),
+    "sql_engine": ("streaming", "async_engine"),
+    "pipelined": ("streaming", "async_engine", "sql_engine", "plan", "state", "digests", "gc_artifacts"),
+    "gc_artifacts": ("streaming", "async_engine"),
+    "collapse_models": ("streaming", "pipelined", "async_engine", "sql_engine"),
+    "daemon": ("servers", "plan"),
+}
+
+
+def option_name(dest: str) -> str:
+    """Returns the command line option name of an argument destination."""
+
+    return f"--{dest.replace('_', '-')}"
+
+
+def validate_args(parser: ArgumentParser, cli_args: Namespace) -> None:
+    """
+    Rejects (with a parser error) invalid arguments, and options combined with options which would ignore them.
+
+    Parameters
+    ----------
+    parser: ArgumentParser
+        The parser the arguments were parsed with.
+    cli_args: Namespace
+        The parsed command line arguments.
+    """
+
+    for dest, incompatible in INCOMPATIBLE_OPTIONS.items():
+        if getattr(cli_args, dest):
+            conflicts: list[str] = [option_name(dest=other) for other in incompatible if getattr(cli_args, other)]
+            if conflicts:
+                parser.error(f"{option_name(dest=dest)} cannot be combined with {', '.join(conflicts)}")
+
+    if cli_args.purge_grace_days is not None and not cli_args.sql_engine:
+        parser.error("--purge-grace-days requires --sql-engine")
+    if cli_args.keep_best > 0 and not cli_args.keep_best_metric:
+        parser.error("--keep-best requires --keep-best-metric")
+    if (cli_args.max_duration is not None or cli_args.max_deletes is not None) and not cli_args.journal:
+        parser.error("--max-duration and --max-deletes require --journal")
+    if cli_args.linkage_index and not (cli_args.journal or cli_args.plan or cli_args.plan_output):
+        parser.error("--linkage-index requires --journal, --plan or --plan-output")
+    if cli_args.pipeline_depth < 1:
+        parser.error("--pipeline-depth must be at least 1")
+
+
+# One statement per option
+# pylint: disable=too-many-statements
+def build_parser() -> ArgumentParser:
+    """Returns the parser of the standard anaconda-project options and the pruning options."""
 
     # arg parser for the standard anaconda-project options
     parser = ArgumentParser(
@@ -43,16 +120,430 @@ if __name__ == "__main__":
         default=False,
         help="Flag for controlling actual application of the system level change",
     )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        default=False,
+        help="Discover, filter and prune stale runs page by page instead of materializing them all",
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        default=False,
+        help="Overlap run discovery with model version discovery and deletion through a bounded page queue",
+    )
+    parser.add_argument(
+        "--pipeline-depth",
+        action="store",
+        default=4,
+        type=int,
+        help="Number of stale run pages buffered between discovery and deletion with --pipelined",
+    )
+    parser.add_argument(
+        "--page-size", action="store", default=1000, type=int, help="Number of entities requested per search page"
+    )
+    parser.add_argument(
+        "--delete-concurrency",
+        action="store",
+        default=1,
+        type=int,
+        help="Maximum number of concurrent delete requests (1 deletes serially)",
+    )
+    parser.add_argument(
+        "--model-version-search",
+        action="store_true",
+        default=False,
+        help="Discover model versions with paginated searches rather than one request per registered model",
+    )
+    parser.add_argument(
+        "--collapse-models",
+        action="store_true",
+        default=False,
+        help="Delete registered models whose versions are all pruneable with one registered model deletion each",
+    )
+    parser.add_argument(
+        "--scan-shard-size",
+        action="store",
+        default=0,
+        type=int,
+        help="Number of experiments per concurrent stale run query (0 queries all experiments at once)",
+    )
+    parser.add_argument(
+        "--scan-concurrency", action="store", default=4, type=int, help="Maximum number of concurrent shard queries"
+    )
+    parser.add_argument(
+        "--journal",
+        action="store",
+        default=None,
+        help="Path of a checkpoint journal (SQLite) used to resume interrupted prunes without re-analysis",
+    )
+    parser.add_argument(
+        "--journal-max-age",
+        action="store",
+        default=24,
+        type=int,
+        help="Age (measured in hours) after which a journaled plan is considered stale and re-analysed",
+    )
+    parser.add_argument(
+        "--policy",
+        action="store",
+        default=None,
+        help="Path of a retention policy file (YAML or JSON) of per experiment, model and status TTLs",
+    )
+    parser.add_argument(
+        "--keep-best", action="store", default=0, type=int, help="Number of best runs per experiment to never prune"
+    )
+    parser.add_argument("--keep-best-metric", action="store", default=None, help="Metric the best runs are ranked by")
+    parser.add_argument(
+        "--keep-best-minimize",
+        action="store_true",
+        help="Rank the lowest metric values as the best (e.g. loss), rather than the highest",
+    )
+    parser.add_argument(
+        "--keep-best-client-order",
+        action="store_true",
+        help="Rank the best runs over every run of the experiment, for servers which cannot order runs by metric",
+    )
+    parser.add_argument(
+        "--plan-output",
+        action="store",
+        default=None,
+        help="Path of the binary plan file to write the computed plan to (e.g. from a --dry-run report)",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store",
+        default=None,
+        help="Path of a previously written plan file to execute instead of re-analysing the server",
+    )
+    parser.add_argument(
+        "--plan-max-age",
+        action="store",
+        default=24,
+        type=int,
+        help="Age (measured in hours) after which a plan file is rejected as stale",
+    )
+    parser.add_argument(
+        "--max-duration",
+        action="store",
+        default=None,
+        type=float,
+        help="Minutes after which no further deletions are issued (the remainder is left pending in the --journal)",
+    )
+    parser.add_argument(
+        "--max-deletes",
+        action="store",
+        default=None,
+        type=int,
+        help="Number of deletions after which no further deletions are issued (the remainder is left pending)",
+    )
+    parser.add_argument(
+        "--priority",
+        action="store",
+        default=None,
+        choices=PRIORITIES,
+        help="Order of the planned deletions: the oldest first, or the largest (local) artifact footprint first",
+    )
+    parser.add_argument(
+        "--state",
+        action="store",
+        default=None,
+        help="Path of the incremental scan state (SQLite), limiting run searches to newly stale runs",
+    )
+    parser.add_argument(
+        "--digests",
+        action="store",
+        default=None,
+        help="Path of the experiment digests (SQLite), skipping run searches of dormant experiments",
+    )
+    parser.add_argument(
+        "--linkage-index",
+        action="store",
+        default=None,
+        help=(
+            "Path the run to model version linkage index is saved to, and loaded from when analysis is skipped "
+            "(resuming a --journal or executing a --plan); analysing runs, incremental or not, rebuild it"
+        ),
+    )
+    parser.add_argument(
+        "--sql-engine",
+        action="store_true",
+        default=False,
+        help="Analyse and soft delete runs directly in the backend store defined by MLFLOW_BACKEND_STORE_URI",
+    )
+    parser.add_argument(
+        "--sql-batch-size", action="store", default=1000, type=int, help="Number of rows per backend store batch"
+    )
+    parser.add_argument(
+        "--gc-artifacts",
+        action="store_true",
+        default=False,
+        help="Remove the local artifact trees of pruned runs (not available with --streaming or --async-engine)",
+    )
+    parser.add_argument(
+        "--gc-concurrency", action="store", default=4, type=int, help="Maximum number of concurrent artifact removals"
+    )
+    parser.add_argument(
+        "--artifacts-destination",
+        action="store",
+        default=None,
+        help="Local directory backing proxied (mlflow-artifacts:) artifact URIs",
+    )
+    parser.add_argument(
+        "--purge-grace-days",
+        action="store",
+        default=None,
+        type=int,
+        help="Permanently purge runs deleted more than this many days ago (requires --sql-engine)",
+    )
+    parser.add_argument(
+        "--metrics-textfile", action="store", default=None, help="Path of the Prometheus textfile to write metrics to"
+    )
+    parser.add_argument(
+        "--metrics-summary", action="store", default=None, help="Path of the JSON summary to write metrics to"
+    )
+    parser.add_argument(
+        "--compact-records",
+        action="store_true",
+        help="Hold compact records (rather than full MLFlow entities) for the pruning candidates",
+    )
+    parser.add_argument(
+        "--async-engine",
+        action="store_true",
+        help="Overlap discovery and deletion (--delete-concurrency requests) against the MLFlow REST API",
+    )
+    parser.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        help="Adapt the client call concurrency (up to --delete-concurrency) to the server load, retrying 429/5xx",
+    )
+    parser.add_argument(
+        "--max-rps", action="store", default=None, type=float, help="Ceiling on client requests per second"
+    )
+    parser.add_argument(
+        "--max-retries",
+        action="store",
+        default=5,
+        type=int,
+        help="Number of jittered backoff retries of throttled (429) or failed (5xx) calls, replacing MLFlow's own",
+    )
+    parser.add_argument(
+        "--latency-target",
+        action="store",
+        default=None,
+        type=float,
+        help="Client call latency (in seconds) above which concurrency is reduced (default: twice the baseline)",
+    )
+    parser.add_argument(
+        "--log-level",
+        action="store",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Level of the structured log (per-entity decisions are logged at DEBUG)",
+    )
+    parser.add_argument(
+        "--log-sample-rate",
+        action="store",
+        default=1.0,
+        type=float,
+        help="Fraction of the per-entity decisions and actions written to the log",
+    )
+    parser.add_argument(
+        "--audit-log",
+        action="store",
+        default=None,
+        help="Path of the gzip compressed per-entity audit trail (written instead of the per-entity log)",
+    )
+
+    parser.add_argument(
+        "--servers",
+        action="store",
+        default=None,
+        help="Path of a config (YAML or JSON) of many tracking servers to prune, in place of MLFLOW_TRACKING_URI",
+    )
+    parser.add_argument(
+        "--server-concurrency", action="store", default=4, type=int, help="Maximum number of servers pruned at once"
+    )
+    parser.add_argument(
+        "--fanout-report", action="store", default=None, help="Path of the JSON combined report of a --servers prune"
+    )
+
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        default=False,
+        help=(
+            "Run as a long running service, serving a control API on the anaconda-project address and port "
+            "(runs are triggered with the MLFLOW_PRUNE_DAEMON_TOKEN or MLFLOW_TRACKING_TOKEN bearer token)"
+        ),
+    )
+    parser.add_argument(
+        "--schedule-interval",
+        action="store",
+        default=24.0,
+        type=float,
+        help="Hours between the scheduled runs of the service (0 to only run on demand)",
+    )
+    return parser
+
+
+def build_command(cli_args: Namespace, mlflow_client: Optional[Any] = None) -> PruneCommand:
+    """
+    Builds the pruning command for the MLFlow Tracking Server defined by the environment.
+
+    Parameters
+    ----------
+    cli_args: Namespace
+        The parsed command line arguments.
+    mlflow_client: Optional[Any]
+        The MLFlow client to prune with (kept across the runs of the service), a new client by default.
+
+    Returns
+    -------
+    command: PruneCommand
+        The pruning command.
+    """
+
+    budgeted: bool = cli_args.max_duration is not None or cli_args.max_deletes is not None
+
+    # Create the structured log of the per-entity decisions (shared by the pruning client and artifact collector)
+    decision_log: DecisionLog = DecisionLog(
+        level=cli_args.log_level, sample_rate=cli_args.log_sample_rate, audit_path=cli_args.audit_log
+    )
+
+    # Create our pruning client
+    pruning_client: PruneClient = PruneClient(
+        client=mlflow_client if mlflow_client is not None else build_mlflow_client(),
+        page_size=cli_args.page_size,
+        delete_concurrency=cli_args.delete_concurrency,
+        model_version_search=cli_args.model_version_search,
+        sharded_scanner=(
+            ShardedScanner(shard_size=cli_args.scan_shard_size, concurrency=cli_args.scan_concurrency)
+            if cli_args.scan_shard_size > 0
+            else None
+        ),
+        scan_state=ScanState(path=cli_args.state) if cli_args.state else None,
+        experiment_digests=ExperimentDigests(path=cli_args.digests) if cli_args.digests else None,
+        compact_records=cli_args.compact_records,
+        policy=(
+            RetentionPolicy.from_file(path=cli_args.policy, ttl=int(demand_env_var(name="MLFLOW_TRACKING_ENTITY_TTL")))
+            if cli_args.policy
+            else None
+        ),
+        sql_engine=(
+            SqlPruneEngine(
+                database_uri=demand_env_var(name="MLFLOW_BACKEND_STORE_URI"), batch_size=cli_args.sql_batch_size
+            )
+            if cli_args.sql_engine
+            else None
+        ),
+        best_run_retention=(
+            BestRunRetention(
+                metric=cli_args.keep_best_metric,
+                keep=cli_args.keep_best,
+                maximize=not cli_args.keep_best_minimize,
+                server_order=not cli_args.keep_best_client_order,
+            )
+            if cli_args.keep_best > 0
+            else None
+        ),
+        budget=(
+            PruneBudget(
+                max_duration=cli_args.max_duration * 60 if cli_args.max_duration is not None else None,
+                max_deletes=cli_args.max_deletes,
+            )
+            if budgeted
+            else None
+        ),
+        controller=(
+            RequestController(
+                max_limit=cli_args.delete_concurrency,
+                max_rps=cli_args.max_rps,
+                max_retries=cli_args.max_retries,
+                latency_target=cli_args.latency_target,
+            )
+            if cli_args.adaptive_concurrency or cli_args.max_rps
+            else None
+        ),
+        decision_log=decision_log,
+    )
+
+    # Create the checkpoint journal (if requested)
+    journal: Optional[PruneJournal] = (
+        PruneJournal(path=cli_args.journal, max_age=cli_args.journal_max_age * 60 * 60 * 1000)
+        if cli_args.journal
+        else None
+    )
+
+    # Create the artifact store garbage collector (if requested)
+    artifact_collector: Optional[ArtifactCollector] = (
+        ArtifactCollector(
+            max_workers=cli_args.gc_concurrency,
+            artifacts_destination=cli_args.artifacts_destination,
+            decision_log=decision_log,
+        )
+        if cli_args.gc_artifacts
+        else None
+    )
+
+    return PruneCommand(
+        pruner=pruning_client,
+        streaming_engine=StreamingEngine() if cli_args.streaming else None,
+        pipelined_engine=PipelinedEngine(queue_size=cli_args.pipeline_depth) if cli_args.pipelined else None,
+        model_collapser=ModelCollapser() if cli_args.collapse_models else None,
+        journal=journal,
+        artifact_collector=artifact_collector,
+        purge_grace_period=(
+            cli_args.purge_grace_days * 24 * 60 * 60 * 1000 if cli_args.purge_grace_days is not None else None
+        ),
+        metrics_textfile=cli_args.metrics_textfile,
+        metrics_summary=cli_args.metrics_summary,
+        rest_engine=(
+            AsyncRestEngine.from_environment(concurrency=cli_args.delete_concurrency) if cli_args.async_engine else None
+        ),
+        plan_output=cli_args.plan_output,
+        plan_input=cli_args.plan,
+        plan_max_age=cli_args.plan_max_age * 60 * 60 * 1000,
+        priority=cli_args.priority,
+        linkage_index_path=cli_args.linkage_index,
+    )
+
+
+def main() -> None:
+    """
+    Provides a handler mechanism between the AE5 deployment arguments and those required by the called process
+    (or service).
+    """
 
     # Load command line arguments
+    parser: ArgumentParser = build_parser()
     cli_args: Namespace = parser.parse_args(sys.argv[1:])
     print(cli_args)
+    validate_args(parser=parser, cli_args=cli_args)
 
     # load defined environmental variables
     load_ae5_user_secrets(silent=False)
 
-    # Create our pruning client
-    pruning_client: PruneClient = PruneClient(client=build_mlflow_client())
+    if cli_args.daemon:
+        # Serve the control API, running prunes on the internal schedule and on demand
+        PruneDaemon(
+            cli_args=cli_args,
+            interval=cli_args.schedule_interval * 60 * 60 if cli_args.schedule_interval > 0 else None,
+            build_command=build_command,
+            client=build_mlflow_client(),
+            token=next((os.environ[name] for name in TOKEN_VARIABLES if os.environ.get(name)), None),
+        ).serve(
+            address=cli_args.anaconda_project_address,
+            port=cli_args.anaconda_project_port,
+            url_prefix=cli_args.anaconda_project_url_prefix,
+        )
+    elif cli_args.servers:
+        # Prune each of the configured servers in its own process
+        if run_fanout(cli_args=cli_args, build_command=build_command)["totals"]["failed_servers"]:
+            sys.exit(1)
+    else:
+        build_command(cli_args=cli_args).execute(dry_run=cli_args.dry_run)
 
-    # Execute the pruning
-    PruneCommand(pruner=pruning_client).execute(dry_run=cli_args.dry_run)
+
+if __name__ == "__main__":
+    main()
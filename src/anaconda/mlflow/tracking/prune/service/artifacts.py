@@ -0,0 +1,216 @@
+""" Defines the Artifact Store Garbage Collector """
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import unquote, urlparse
+
+from mlflow.entities import Run
+
+from ..dto.artifact_reclaim import ArtifactReclaim
+from .audit import DecisionLog
+
+
+def remove_tree(path: str, dry_run: bool) -> tuple[int, int]:
+    """
+    Removes a directory tree, streaming each directory listing rather than materializing it.
+
+    Parameters
+    ----------
+    path: str
+        The directory to remove.
+    dry_run: bool
+        When `True` the tree is only measured.
+
+    Returns
+    -------
+    reclaimed: tuple[int, int]
+        The number of files and bytes reclaimed.
+    """
+
+    files: int = 0
+    size: int = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                entry_files, entry_size = remove_tree(path=entry.path, dry_run=dry_run)
+                files += entry_files
+                size += entry_size
+            else:
+                size += entry.stat(follow_symlinks=False).st_size
+                files += 1
+                if not dry_run:
+                    os.unlink(entry.path)
+    if not dry_run:
+        os.rmdir(path)
+    return files, size
+
+
+class ArtifactCollector:
+    """
+    Artifact Store Garbage Collector
+    Removes the artifact trees of pruned runs from a local file system artifact store on a bounded worker pool.
+
+    Attributes
+    ----------
+    max_workers: int
+        The maximum number of artifact trees removed concurrently.
+    artifacts_destination: Optional[str]
+        The local directory backing proxied (`mlflow-artifacts:`) artifact URIs, if any.
+    decision_log: DecisionLog
+        The log the per-run collection outcomes are recorded in.
+    """
+
+    max_workers: int
+    artifacts_destination: Optional[str]
+    decision_log: DecisionLog
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        artifacts_destination: Optional[str] = None,
+        decision_log: Optional[DecisionLog] = None,
+    ):
+        self.max_workers = max_workers
+        self.artifacts_destination = artifacts_destination
+        self.decision_log = decision_log if decision_log is not None else DecisionLog()
+
+    def resolve(self, artifact_uri: Optional[str]) -> Optional[str]:
+        """
+        Resolves a run artifact URI to a local directory.
+
+        Parameters
+        ----------
+        artifact_uri: Optional[str]
+            The run artifact URI.
+
+        Returns
+        -------
+        path: Optional[str]
+            The local directory, or `None` when the URI is not backed by the local file system.
+        """
+
+        if not artifact_uri:
+            return None
+        parsed = urlparse(artifact_uri)
+        if parsed.scheme in ("", "file"):
+            return unquote(parsed.path)
+        if parsed.scheme == "mlflow-artifacts" and self.artifacts_destination:
+            return str(Path(self.artifacts_destination) / unquote(parsed.path).lstrip("/"))
+        return None
+
+    def collect_run(self, run: Run, dry_run: bool) -> Optional[tuple[int, int]]:
+        """
+        Removes the artifact tree of a single run.
+
+        Parameters
+        ----------
+        run: Run
+            The pruned run.
+        dry_run: bool
+            When `True` the artifact tree is only measured.
+
+        Returns
+        -------
+        reclaimed: Optional[tuple[int, int]]
+            The number of files and bytes reclaimed, or `None` when the artifacts are not local.
+
+        Raises
+        ------
+        ValueError
+            When the resolved directory is not the run's own `<run_id>/artifacts` directory.
+        """
+
+        path: Optional[str] = self.resolve(artifact_uri=run.info.artifact_uri)
+        if path is None:
+            return None
+        # Never remove a tree that is not the run's own artifact directory (e.g. a shared or custom artifact location)
+        path = os.path.normpath(path)
+        if Path(path).parts[-2:] != (run.info.run_id, "artifacts"):
+            raise ValueError(f"{path} is not the artifact directory of run {run.info.run_id}")
+        if not os.path.isdir(path):
+            return 0, 0
+        return remove_tree(path=path, dry_run=dry_run)
+
+    def measure_run(self, run: Run) -> int:
+        """Returns the size (in bytes) of the artifact tree of a run, or -1 when it can not be measured."""
+
+        try:
+            reclaimed: Optional[tuple[int, int]] = self.collect_run(run=run, dry_run=True)
+        except (OSError, ValueError):
+            return -1
+        return -1 if reclaimed is None else reclaimed[1]
+
+    def measure(self, runs: Iterable[Run]) -> list[int]:
+        """
+        Measures the artifact trees of the provided runs (see `measure_run`), on the worker pool.
+
+        Parameters
+        ----------
+        runs: Iterable[Run]
+            The runs to measure.
+
+        Returns
+        -------
+        sizes: list[int]
+            The size (in bytes) of each run's artifact tree, in the order of the runs.
+        """
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self.measure_run, runs))
+
+    def collect(self, runs: Iterable[Run], dry_run: bool) -> ArtifactReclaim:
+        """
+        Removes the artifact trees of the provided (pruned) runs.
+
+        Parameters
+        ----------
+        runs: Iterable[Run]
+            The pruned runs.
+        dry_run: bool
+            When `True` the artifact trees are only measured.
+
+        Returns
+        -------
+        reclaim: ArtifactReclaim
+            The reclaimed totals.
+        """
+
+        reclaim: ArtifactReclaim = ArtifactReclaim()
+        reason: str = "artifacts_measured" if dry_run else "artifacts_reclaimed"
+
+        def account(run: Run, future: Future) -> None:
+            try:
+                reclaimed: Optional[tuple[int, int]] = future.result()
+            except (OSError, ValueError) as error:
+                self.decision_log.action("artifacts_failed", kind="run", id=run.info.run_id, error=str(error))
+                reclaim.failed += 1
+                return
+            if reclaimed is None:
+                # Not a local artifact store
+                self.decision_log.decision(
+                    "artifacts_not_local", kind="run", id=run.info.run_id, artifact_uri=run.info.artifact_uri
+                )
+                reclaim.skipped += 1
+                return
+            files, size = reclaimed
+            self.decision_log.action(reason, kind="run", id=run.info.run_id, files=files, bytes=size)
+            reclaim.runs += 1
+            reclaim.files += files
+            reclaim.bytes += size
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Bound the number of in-flight collections so large inputs are not queued all at once
+            in_flight: dict[Future, Run] = {}
+            for run in runs:
+                if len(in_flight) >= self.max_workers * 2:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        account(run=in_flight.pop(future), future=future)
+                in_flight[executor.submit(self.collect_run, run, dry_run)] = run
+            for future in as_completed(in_flight):
+                account(run=in_flight[future], future=future)
+
+        print(f"Reclaimed {reclaim.files} files ({reclaim.bytes} bytes) from {reclaim.runs} runs")
+        return reclaim
@@ -0,0 +1,146 @@
+""" Defines the Pruning Decision Log """
+
+import gzip
+import json
+import logging
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from threading import Lock
+from typing import Optional
+
+LOGGER_NAME: str = "anaconda.mlflow.tracking.prune"
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats log records as JSON lines, merging the record's structured `fields`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        document: dict = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        document.update(getattr(record, "fields", {}))
+        return json.dumps(document, default=str)
+
+
+# The log settings, the sampling state and the buffered audit trail
+# pylint: disable=too-many-instance-attributes
+class DecisionLog:
+    """
+    Pruning Decision Log
+    Structured (JSON lines) logging of the per-entity pruning decisions and actions, written through a
+    queue-backed background handler so the hot paths never block on console or file I/O.
+
+    Decisions are aggregated into per-reason counts.  When an audit path is provided the full per-entity
+    trail is written to that (gzip compressed) file instead of stdout, otherwise per-entity records are
+    written to stdout subject to the log level and sample rate.
+
+    Attributes
+    ----------
+    level: str
+        The stdout log level (per-entity decisions are logged at DEBUG, actions at INFO).
+    sample_rate: float
+        The fraction of per-entity records written to stdout.
+    audit_path: Optional[str]
+        The path of the compressed per-entity audit trail.
+    """
+
+    level: str
+    sample_rate: float
+    audit_path: Optional[str]
+
+    def __init__(self, level: str = "INFO", sample_rate: float = 1.0, audit_path: Optional[str] = None):
+        self.level = level
+        self.sample_rate = sample_rate
+        self.audit_path = audit_path
+        self.lock: Lock = Lock()
+        self.counts: dict[str, int] = {}
+        self.listener: Optional[QueueListener] = None
+        self.audit_listener: Optional[QueueListener] = None
+        self.logger: logging.Logger = logging.getLogger(LOGGER_NAME)
+        self.audit_logger: logging.Logger = logging.getLogger(f"{LOGGER_NAME}.audit")
+
+    def start(self) -> None:
+        """Starts the background handlers (this is performed on first use)."""
+
+        with self.lock:
+            if self.listener is not None:
+                return
+
+            log_queue: SimpleQueue = SimpleQueue()
+            stream_handler: logging.StreamHandler = logging.StreamHandler(sys.stdout)
+            stream_handler.setFormatter(JsonFormatter())
+            self.listener = QueueListener(log_queue, stream_handler)
+            self.logger.handlers = [QueueHandler(log_queue)]
+            self.logger.setLevel(self.level)
+            self.logger.propagate = False
+            self.listener.start()
+
+            if self.audit_path:
+                audit_queue: SimpleQueue = SimpleQueue()
+                # pylint: disable=consider-using-with
+                audit_handler: logging.StreamHandler = logging.StreamHandler(
+                    gzip.open(self.audit_path, mode="at", encoding="utf-8")
+                )
+                audit_handler.setFormatter(JsonFormatter())
+                self.audit_listener = QueueListener(audit_queue, audit_handler)
+                self.audit_logger.handlers = [QueueHandler(audit_queue)]
+                self.audit_logger.setLevel(logging.INFO)
+                self.audit_logger.propagate = False
+                self.audit_listener.start()
+
+    def count(self, reason: str, count: int = 1) -> None:
+        """Adds to the aggregated count of a decision reason."""
+
+        with self.lock:
+            self.counts[reason] = self.counts.get(reason, 0) + count
+
+    def record(self, level: int, reason: str, fields: dict) -> None:
+        """Counts and logs a single per-entity record."""
+
+        if self.listener is None:
+            self.start()
+        self.count(reason=reason)
+
+        fields = {"reason": reason, **fields}
+        if self.audit_listener is not None:
+            self.audit_logger.info(reason, extra={"fields": fields})
+        elif self.logger.isEnabledFor(level) and (self.sample_rate >= 1.0 or random.random() < self.sample_rate):
+            self.logger.log(level, reason, extra={"fields": fields})
+
+    def decision(self, reason: str, **fields) -> None:
+        """Records a pruneability decision (e.g. `stage_set`, `not_stale`, `pruneable`) for an entity."""
+
+        self.record(level=logging.DEBUG, reason=reason, fields=fields)
+
+    def action(self, reason: str, **fields) -> None:
+        """Records an action (e.g. `delete`, `dry_run`, `delete_failed`) taken on an entity."""
+
+        self.record(level=logging.INFO, reason=reason, fields=fields)
+
+    def summary(self) -> dict[str, int]:
+        """Logs, and returns, the aggregated per-reason counts."""
+
+        if self.listener is None:
+            self.start()
+        with self.lock:
+            counts: dict[str, int] = dict(self.counts)
+        self.logger.info("summary", extra={"fields": {"counts": counts}})
+        return counts
+
+    def close(self) -> None:
+        """Flushes and stops the background handlers."""
+
+        with self.lock:
+            for listener, logger in ((self.listener, self.logger), (self.audit_listener, self.audit_logger)):
+                if listener is not None:
+                    listener.stop()
+                    for handler in listener.handlers:
+                        handler.flush()
+                        handler.close()
+                    logger.handlers = []
+            self.listener = None
+            self.audit_listener = None
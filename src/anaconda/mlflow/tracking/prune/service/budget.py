@@ -0,0 +1,126 @@
+""" Defines the Prune Budget and Work Priorities """
+
+from time import monotonic
+from typing import Iterable, Iterator, Optional
+
+import numpy
+
+from ..dto.pruneable import Pruneable
+from ..dto.records import RunTable
+from .artifacts import ArtifactCollector
+from .policy import take_runs
+
+# Orders in which planned deletions can be prioritized
+PRIORITIES: tuple[str, ...] = ("oldest", "largest")
+
+
+class PruneBudget:
+    """
+    Prune Budget
+    Limits the deletions of a prune to a wall clock duration and/or a number of deletions.  Once the budget runs
+    out no further deletions are issued (those in flight complete), and the remaining deletions are left pending
+    in the journal, to be picked up first by the next run.
+
+    Attributes
+    ----------
+    max_duration: Optional[float]
+        The duration (measured in seconds, from the creation of the budget) after which no deletions are issued.
+    max_deletes: Optional[int]
+        The number of deletions after which no deletions are issued.
+    issued: dict[str, int]
+        The number of deletions issued by entity kind.
+    exhausted: Optional[str]
+        The limit which ran out (`max_duration` or `max_deletes`), `None` while the budget remains.
+    """
+
+    max_duration: Optional[float]
+    max_deletes: Optional[int]
+    issued: dict[str, int]
+    exhausted: Optional[str]
+
+    def __init__(self, max_duration: Optional[float] = None, max_deletes: Optional[int] = None):
+        self.max_duration = max_duration
+        self.max_deletes = max_deletes
+        self.deadline: Optional[float] = None if max_duration is None else monotonic() + max_duration
+        self.issued = {}
+        self.exhausted = None
+
+    def is_exhausted(self) -> bool:
+        """Returns `True` once either of the limits has run out."""
+
+        if self.exhausted is None:
+            if self.max_deletes is not None and sum(self.issued.values()) >= self.max_deletes:
+                self.exhausted = "max_deletes"
+            elif self.deadline is not None and monotonic() >= self.deadline:
+                self.exhausted = "max_duration"
+        return self.exhausted is not None
+
+    def limit(self, kind: str, deletions: Iterable[tuple]) -> Iterator[tuple]:
+        """
+        Passes deletions through while the budget remains, counting each one issued.
+
+        Parameters
+        ----------
+        kind: str
+            The kind of entity being deleted.
+        deletions: Iterable[tuple]
+            The deletions to issue.
+
+        Returns
+        -------
+        deletions: Iterator[tuple]
+            The deletions which fit in the budget.
+        """
+
+        for deletion in deletions:
+            if self.is_exhausted():
+                return
+            self.issued[kind] = self.issued.get(kind, 0) + 1
+            yield deletion
+
+    def to_dict(self) -> dict:
+        """Returns the spent budget as a dictionary."""
+
+        return {"issued": dict(self.issued), "exhausted": self.exhausted}
+
+
+def prioritize(pruneables: Pruneable, priority: str, collector: Optional[ArtifactCollector] = None) -> Pruneable:
+    """
+    Orders the planned deletions, so the most valuable work is done within a budget.
+
+    Parameters
+    ----------
+    pruneables: Pruneable
+        The computed plan.
+    priority: str
+        `oldest` to delete the oldest entities first, or `largest` to delete the runs with the largest
+        artifact footprint first (as measured by the `collector`; runs in non-local artifact stores are last).
+    collector: Optional[ArtifactCollector]
+        The collector measuring artifact footprints.
+
+    Returns
+    -------
+    pruneable: Pruneable
+        The reordered plan.
+    """
+
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority {priority}, expected one of {PRIORITIES}")
+
+    models: list = sorted(pruneables.models, key=lambda model: model.last_updated_timestamp)
+    runs = pruneables.runs
+    if priority == "oldest":
+        if isinstance(runs, RunTable):
+            keys: numpy.ndarray = numpy.frombuffer(runs.end_times, dtype=numpy.int64)
+        else:
+            keys: numpy.ndarray = numpy.array([run.info.end_time or 0 for run in runs], dtype=numpy.int64)
+    else:
+        collector = collector or ArtifactCollector()
+        keys: numpy.ndarray = -numpy.array(collector.measure(runs=runs), dtype=numpy.int64)
+
+    order: numpy.ndarray = numpy.argsort(keys, kind="stable")
+    if isinstance(runs, RunTable):
+        runs = take_runs(table=runs, positions=order)
+    else:
+        runs = [runs[index] for index in order]
+    return Pruneable(runs=runs, models=models, registered_models=pruneables.registered_models)
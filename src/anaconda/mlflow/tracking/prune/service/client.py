@@ -1,30 +1,89 @@
 """ Defines MLFlow Tracking Server Pruning Client """
 
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import partial
+from typing import Callable, Container, Iterable, Iterator, Optional
 
+import numpy
 from ae5_tools import demand_env_var
 from mlflow.entities import Experiment, Run, ViewType
 from mlflow.entities.model_registry import ModelVersion, RegisteredModel
+from mlflow.exceptions import MlflowException
 
 from anaconda.mlflow.tracking.sdk import AnacondaMlFlowClient
 
+from ..dto.prune_result import PruneResult
 from ..dto.pruneable import Pruneable
-
-
+from ..dto.records import ModelVersionRecord, RunRecord, RunTable
+from .audit import DecisionLog
+from .budget import PruneBudget
+from .digest import DIGEST_LOOKAHEAD, ExperimentDigests
+from .http import configure_connection_pool
+from .journal import PruneJournal
+from .linkage import LinkageIndex
+from .metrics import InstrumentedClient, PruneMetrics
+from .policy import DAY, RetentionPolicy, take_runs
+from .ranking import BestRunRetention
+from .shards import ShardedScanner
+from .sql import SqlPruneEngine
+from .state import ScanState
+from .throttle import RequestController
+
+# Statuses of runs which are considered for pruning
+STALE_RUN_STATUSES: tuple[str, ...] = ("FINISHED", "FAILED")
+
+
+# The analysis and deletion core of the pruning process, kept as separate (individually overridable and tested)
+# methods
+# pylint: disable=too-many-public-methods,too-many-lines
 class PruneClient(AnacondaMlFlowClient):
     """MLFlow Tracking Server Pruning Client"""
 
     oldest_allowed_timestamp: Optional[float]
+    page_size: int = 1000
+    delete_concurrency: int = 1
+    model_version_search: bool = False
+    sharded_scanner: Optional[ShardedScanner] = None
+    journal: Optional[PruneJournal] = None
+    scan_state: Optional[ScanState] = None
+    sql_engine: Optional[SqlPruneEngine] = None
+    metrics: Optional[PruneMetrics] = None
+    decision_log: Optional[DecisionLog] = None
+    controller: Optional[RequestController] = None
+    compact_records: bool = False
+    policy: Optional[RetentionPolicy] = None
+    reference_timestamp: Optional[float] = None
+    best_run_retention: Optional[BestRunRetention] = None
+    budget: Optional[PruneBudget] = None
+    experiment_digests: Optional[ExperimentDigests] = None
+    linkage_index: Optional[LinkageIndex] = None
+    model_version_counts: Optional[dict[str, int]] = None
+    track_deleted_runs: bool = False
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.oldest_allowed_timestamp = round(
-            (datetime.utcnow() - timedelta(days=int(demand_env_var(name="MLFLOW_TRACKING_ENTITY_TTL")))).timestamp()
-            * 1000
-        )
+        if self.policy is not None and self.scan_state is not None:
+            # Incremental scans advance past the runs a policy retains, which would then never be re-evaluated
+            raise ValueError("A retention policy cannot be combined with an incremental scan state")
+        ttl: int = int(demand_env_var(name="MLFLOW_TRACKING_ENTITY_TTL"))
+        self.oldest_allowed_timestamp = round((datetime.utcnow() - timedelta(days=ttl)).timestamp() * 1000)
+        self.reference_timestamp = self.oldest_allowed_timestamp + ttl * DAY
+        if self.policy is not None:
+            # Stale runs are queried with the policy's most recent cut-off, and narrowed by the policy rules
+            self.oldest_allowed_timestamp = self.policy.run_cutoff(now=self.reference_timestamp)
         print(f"Stale cut-off: {self.oldest_allowed_timestamp}")
 
+        # Record the count and latency of every MLFlow client call (made through the controller, if set)
+        if self.metrics is None:
+            self.metrics = PruneMetrics()
+        self.client = InstrumentedClient(client=self.client, metrics=self.metrics, controller=self.controller)
+
+        # Per-entity decisions are logged in the background rather than printed in the hot paths
+        if self.decision_log is None:
+            self.decision_log = DecisionLog()
+
     def is_model_version_pruneable(self, version: ModelVersion) -> bool:
         """
         For a specified `ModelVersion`, returns `True` if the version is pruneable, `False` otherwise.
@@ -44,16 +103,22 @@ class PruneClient(AnacondaMlFlowClient):
         # Do not prune models which have had a stage set (Staging, Production, Archived)
         # If not assigned a stage the default is the literal string "None", it is NOT `None`.
 
-        message_header: str = f"{version.last_updated_timestamp}:{version.version}:{version.current_stage}"
-
+        reason: str = "stage_set"
         if version.current_stage == "None":
             if version.last_updated_timestamp < self.oldest_allowed_timestamp:
                 pruneable_flag = True
-                print(f"{message_header} can be pruned")
+                reason = "pruneable"
             else:
-                print(f"{message_header} not stale, can not be pruned")
-        else:
-            print(f"{message_header} stage is not None, can not be pruned")
+                reason = "not_stale"
+
+        self.decision_log.decision(
+            reason,
+            kind="model_version",
+            name=version.name,
+            version=version.version,
+            stage=version.current_stage,
+            last_updated_timestamp=version.last_updated_timestamp,
+        )
         return pruneable_flag
 
     def get_pruneable_model_versions(self, versions: list[ModelVersion]) -> list[ModelVersion]:
@@ -71,22 +136,233 @@ class PruneClient(AnacondaMlFlowClient):
             A list of `ModelVersion` objects to pruneable.
         """
 
+        if self.policy is not None:
+            # Evaluate the policy rules over all of the versions at once
+            mask = self.policy.evaluate_model_versions(versions=versions, now=self.reference_timestamp)
+            pruneable_count: int = int(mask.sum())
+            self.decision_log.count(reason="pruneable", count=pruneable_count)
+            self.decision_log.count(reason="retained_by_policy", count=len(versions) - pruneable_count)
+            return [version for version, pruneable in zip(versions, mask) if pruneable]
+
         prunable_versions: list[ModelVersion] = []
         for version in versions:
             if self.is_model_version_pruneable(version=version):
                 prunable_versions.append(version)
         return prunable_versions
 
-    def get_stale_runs(self, experiment_ids: list[str]) -> list[Run]:
+    def stale_run_filter(self, status: str, since: Optional[int] = None, until: Optional[int] = None) -> str:
+        """
+        Returns the run search filter for stale runs of a status.
+
+        Parameters
+        ----------
+        status: str
+            The run status to query.
+        since: Optional[int]
+            When provided, only runs with end times at or after this timestamp are queried.
+        until: Optional[int]
+            When provided, runs with end times before this timestamp (rather than the cut-off) are queried.
+
+        Returns
+        -------
+        filter_string: str
+            The run search filter.
+        """
+
+        end_time: float = until if until is not None else self.oldest_allowed_timestamp
+        query: str = f"attributes.end_time < {end_time} AND attributes.status = '{status}'"
+        if since is not None:
+            query = f"attributes.end_time >= {since} AND {query}"
+        return query
+
+    def stale_run_statuses(self) -> tuple[str, ...]:
+        """Returns the statuses of runs which are considered for pruning."""
+
+        return self.policy.statuses if self.policy is not None else STALE_RUN_STATUSES
+
+    def apply_policy(self, runs: list[Run]) -> list[Run]:
+        """
+        Returns the stale runs which are pruneable under the `policy` (or all of them when no policy is set).
+
+        Parameters
+        ----------
+        runs: list[Run]
+            The stale runs, queried with the policy's most recent cut-off.
+
+        Returns
+        -------
+        runs: list[Run]
+            The runs which are pruneable under the policy.
+        """
+
+        if self.policy is None:
+            return runs
+
+        pruneable_runs: list[Run] = self.policy.pruneable_runs(runs=runs, now=self.reference_timestamp)
+        self.decision_log.count(reason="retained_by_policy", count=len(runs) - len(pruneable_runs))
+        return pruneable_runs
+
+    def exclude_best_runs(self, runs: list[Run]) -> list[Run]:
+        """
+        Returns the runs which are not among the best runs of their experiment (when `best_run_retention` is set).
+
+        Parameters
+        ----------
+        runs: list[Run]
+            The pruneable runs.
+
+        Returns
+        -------
+        runs: list[Run]
+            The pruneable runs, without the best runs of each experiment.
+        """
+
+        if self.best_run_retention is None:
+            return runs
+
+        # Only the experiments with pruneable runs are ranked
+        if isinstance(runs, RunTable):
+            experiment_ids: set[str] = {runs.experiment_ids[code] for code in set(runs.experiments)}
+        else:
+            experiment_ids: set[str] = {run.info.experiment_id for run in runs}
+        with self.metrics.phase("best_runs"):
+            best_run_ids: set[str] = self.best_run_retention.best_run_ids(
+                client=self.client, experiment_ids=sorted(experiment_ids), page_size=self.page_size
+            )
+        kept_runs: list[Run] = PruneClient.filter_runs(runs=runs, model_versions=[], linked_run_ids=best_run_ids)
+        self.decision_log.count(reason="best_run", count=len(runs) - len(kept_runs))
+        return kept_runs
+
+    def iter_stale_runs(
+        self,
+        experiment_ids: list[str],
+        run_view_type: int = ViewType.ACTIVE_ONLY,
+        statuses: Optional[tuple[str, ...]] = None,
+        since: Optional[int] = None,
+        upcoming: Optional[dict[str, int]] = None,
+    ) -> Iterator[list[Run]]:
+        """
+        Streams stale runs from the MLFlow Tracking Server one page at a time.
+        Runs are queried for:
+        1. End times older than the allowed (defined) max age.
+        2. Statuses of either FINISHED or FAILED (or those of the `policy`).
+
+        Runs exempted by the tags of the `policy` are dropped.  Only a single page (of at most `page_size` runs)
+        is held at any time.
+
+        Parameters
+        ----------
+        experiment_ids: list[str]
+            A list of experiment ids to review.
+        run_view_type: int
+            The `ViewType` to query with.  When runs are deleted while the stream is being consumed,
+            `ViewType.ALL` must be used so the server side offsets are not shifted by the deletions.
+            Runs which are not active are dropped from the yielded pages.
+        statuses: Optional[tuple[str, ...]]
+            The run statuses to query, those of `stale_run_statuses` by default.
+        since: Optional[int]
+            When provided, only runs with end times at or after this timestamp are queried.
+        upcoming: Optional[dict[str, int]]
+            When provided, the searches are extended by `DIGEST_LOOKAHEAD` past the cut-off, and the earliest end
+            time of each experiment's runs which are not yet stale is recorded in it (those runs are not yielded).
+
+        Returns
+        -------
+        pages: Iterator[list[Run]]
+            An iterator of stale run pages.
+        """
+
+        until: Optional[int] = self.oldest_allowed_timestamp + DIGEST_LOOKAHEAD if upcoming is not None else None
+
+        # The query language does not support `IN` clauses with status. We have to perform this as two queries.
+        for status in statuses or self.stale_run_statuses():
+            query: str = self.stale_run_filter(status=status, since=since, until=until)
+            page_token: Optional[str] = None
+            while True:
+                with self.metrics.phase("stale_run_search"):
+                    page = self.client.search_runs(
+                        experiment_ids=experiment_ids,
+                        filter_string=query,
+                        run_view_type=run_view_type,
+                        max_results=self.page_size,
+                        page_token=page_token,
+                    )
+                runs: list[Run] = list(page)
+                if run_view_type != ViewType.ACTIVE_ONLY:
+                    runs = [run for run in runs if run.info.lifecycle_stage == "active"]
+                if upcoming is not None:
+                    runs = ExperimentDigests.split_upcoming_runs(
+                        runs=runs, cutoff=self.oldest_allowed_timestamp, upcoming=upcoming
+                    )
+                if self.policy is not None:
+                    exempt_count: int = len(runs)
+                    runs = self.policy.drop_exempt_runs(runs)
+                    self.decision_log.count(reason="exempt_tag", count=exempt_count - len(runs))
+                if self.compact_records:
+                    # Drop the run data (params, metrics and tags) as soon as the page arrives
+                    runs = [RunRecord.from_run(run) for run in runs]
+                if runs:
+                    yield runs
+
+                page_token = getattr(page, "token", None)
+                if not page_token:
+                    break
+
+    def iter_runs_by_id(self, run_ids: list[str], experiment_ids: list[str]) -> Iterator[list[Run]]:
+        """
+        Streams the active runs with the provided ids, searching for (at most) `page_size` ids per query rather
+        than getting each run.
+
+        Parameters
+        ----------
+        run_ids: list[str]
+            The ids of the runs to get.
+        experiment_ids: list[str]
+            The experiment ids to search the runs in.
+
+        Returns
+        -------
+        pages: Iterator[list[Run]]
+            An iterator of run pages.
+        """
+
+        if not experiment_ids:
+            return
+        for start in range(0, len(run_ids), self.page_size):
+            ids: str = ", ".join(f"'{run_id}'" for run_id in run_ids[start : start + self.page_size])
+            page_token: Optional[str] = None
+            while True:
+                with self.metrics.phase("held_run_search"):
+                    page = self.client.search_runs(
+                        experiment_ids=experiment_ids,
+                        filter_string=f"attributes.run_id IN ({ids})",
+                        run_view_type=ViewType.ACTIVE_ONLY,
+                        max_results=self.page_size,
+                        page_token=page_token,
+                    )
+                runs: list[Run] = list(page)
+                if runs:
+                    yield runs
+
+                page_token = getattr(page, "token", None)
+                if not page_token:
+                    break
+
+    def get_stale_runs(self, experiment_ids: list[str], upcoming: Optional[dict[str, int]] = None) -> list[Run]:
         """
         Queries MLFlow Tracking Server for runs:
         1. With end times older than the allowed (defined) max age.
         2. With statuses of either FINISHED or FAILED.
 
+        The experiments are searched in concurrent shards when a `sharded_scanner` is set.
+
         Parameters
         ----------
         experiment_ids: list[str]
             A list of experiment ids to review.
+        upcoming: Optional[dict[str, int]]
+            When provided, the earliest end time of each experiment's runs which are not yet stale (within the
+            `DIGEST_LOOKAHEAD`) is recorded in it (see `iter_stale_runs`).
 
         Returns
         -------
@@ -94,23 +370,36 @@ class PruneClient(AnacondaMlFlowClient):
             A list of runs which are stale.
         """
 
+        if self.sharded_scanner is not None:
+            return self.sharded_scanner.scan(
+                experiment_ids=experiment_ids,
+                statuses=self.stale_run_statuses(),
+                search=self.search_stale_runs,
+                runs=RunTable() if self.compact_records else [],
+                decision_log=self.decision_log,
+                upcoming=upcoming,
+            )
+
         # Get Stale Runs
-        runs: list[Run] = []
+        runs: list[Run] = RunTable() if self.compact_records else []
+        for page in self.iter_stale_runs(experiment_ids=experiment_ids, upcoming=upcoming):
+            runs.extend(page)
+        return runs
 
-        # The query language does not support `IN` clauses with status. We have to perform this as two queries.
-        status_types: list[str] = ["FINISHED", "FAILED"]
-        for status in status_types:
-            query: str = f"attributes.end_time < {self.oldest_allowed_timestamp} AND attributes.status = '{status}'"
-            query_runs: list[Run] = list(
-                self.client.search_runs(
-                    experiment_ids=experiment_ids, filter_string=query, run_view_type=ViewType.ACTIVE_ONLY
-                )
-            )
-            runs += query_runs
+    def search_stale_runs(
+        self, experiment_ids: list[str], status: str, upcoming: Optional[dict[str, int]] = None
+    ) -> list[Run]:
+        """Returns the stale runs of the experiments with a status (see `iter_stale_runs`)."""
+
+        runs: list[Run] = RunTable() if self.compact_records else []
+        for page in self.iter_stale_runs(experiment_ids=experiment_ids, statuses=(status,), upcoming=upcoming):
+            runs.extend(page)
         return runs
 
     @staticmethod
-    def filter_runs(runs: list[Run], model_versions: list[ModelVersion]) -> list[Run]:
+    def filter_runs(
+        runs: list[Run], model_versions: list[ModelVersion], linked_run_ids: Optional[set[str]] = None
+    ) -> list[Run]:
         """
         Creates a list of `Run` objects which to not have registered model versions.
 
@@ -120,6 +409,9 @@ class PruneClient(AnacondaMlFlowClient):
             The list of runs to filter
         model_versions: list[ModelVersion]
             The model versions to check for relationships.
+        linked_run_ids: Optional[set[str]]
+            The run ids referenced by model versions (a set or `LinkageIndex`), used in place of `model_versions`
+            when provided.
 
         Returns
         -------
@@ -127,20 +419,20 @@ class PruneClient(AnacondaMlFlowClient):
             A list of `Run` objects which to not have registered model versions.
         """
 
-        # Filter out runs which still have registered model versions
-        stale_run_ids: list[str] = [run.info.run_id for run in runs]
-        # Generate Run Exclusion List
-        run_exclusion_list: list[str] = []
-        for version in model_versions:
-            if version.run_id in stale_run_ids:
-                run_exclusion_list.append(version.run_id)
+        # Index the linked runs once, so each run is checked in constant time
+        if linked_run_ids is None:
+            linked_run_ids = LinkageIndex.from_model_versions(model_versions)
 
-        # Filter Runs
-        final_run_list: list[Run] = [run for run in runs if run.info.run_id not in run_exclusion_list]
+        if isinstance(runs, RunTable):
+            if isinstance(linked_run_ids, LinkageIndex):
+                return take_runs(table=runs, positions=numpy.flatnonzero(~linked_run_ids.linked_mask(table=runs)))
+            return runs.exclude(run_ids=linked_run_ids)
 
-        return final_run_list
+        return [run for run in runs if run.info.run_id not in linked_run_ids]
 
-    def get_pruneable_runs(self, model_versions: list[ModelVersion]) -> list[Run]:
+    def get_pruneable_runs(
+        self, model_versions: list[ModelVersion], linked_run_ids: Optional[set[str]] = None
+    ) -> list[Run]:
         """
         Generates a list of `Run` objects suitable for pruning.
 
@@ -148,6 +440,8 @@ class PruneClient(AnacondaMlFlowClient):
         ----------
         model_versions: list[ModelVersion]
             The list of model versions to cross-reference when determining prune-ability.
+        linked_run_ids: Optional[set[str]]
+            The run ids referenced by model versions, used in place of `model_versions` when provided.
 
         Returns
         -------
@@ -155,54 +449,532 @@ class PruneClient(AnacondaMlFlowClient):
             A list of `Run` objects suitable for pruning.
         """
 
+        if self.scan_state is not None:
+            return self.get_incremental_pruneable_runs(model_versions=model_versions, linked_run_ids=linked_run_ids)
+
         # Get Experiments
-        experiments: list[Experiment] = self.get_experiments()
+        with self.metrics.phase("experiments"):
+            experiments: list[Experiment] = self.get_experiments()
+        if self.experiment_digests is not None:
+            # Skip the dormant experiments, whose digest proves no run can have become stale since it was evaluated
+            changed_experiments: list[Experiment] = self.experiment_digests.get_changed_experiments(
+                experiments=experiments,
+                cutoff=self.oldest_allowed_timestamp,
+                config=ExperimentDigests.config_key(best_run_retention=self.best_run_retention),
+            )
+            print(f"Skipping {len(experiments) - len(changed_experiments)} of {len(experiments)} dormant experiments")
+            experiments = changed_experiments
         experiment_ids: list[str] = [experiment.experiment_id for experiment in experiments]
 
         print(f"Reviewing experiments {experiment_ids} for stale runs")
 
-        # Get Stale Runs
-        runs: list[Run] = self.get_stale_runs(experiment_ids=experiment_ids)
+        # Get Stale Runs (and the next time a run of each experiment can become stale, for its digest)
+        upcoming: Optional[dict[str, int]] = {} if self.experiment_digests is not None else None
+        runs: list[Run] = self.get_stale_runs(experiment_ids=experiment_ids, upcoming=upcoming)
+        stale_runs: list[Run] = runs
+        with self.metrics.phase("policy"):
+            runs = self.apply_policy(runs=runs)
         print(f"Found {len(runs)} stale runs")
 
         # Filter out runs which still have registered model versions
-        final_run_list: list[Run] = PruneClient.filter_runs(runs=runs, model_versions=model_versions)
+        with self.metrics.phase("filter"):
+            final_run_list: list[Run] = PruneClient.filter_runs(
+                runs=runs, model_versions=model_versions, linked_run_ids=linked_run_ids
+            )
+        self.decision_log.count(reason="linked_to_model_version", count=len(runs) - len(final_run_list))
+
+        if self.experiment_digests is not None:
+            self.experiment_digests.stage_evaluation(
+                experiments=experiments,
+                stale_runs=stale_runs,
+                unheld_runs=final_run_list,
+                upcoming=upcoming,
+                cutoff=self.oldest_allowed_timestamp,
+                evaluated_at=self.reference_timestamp,
+                config=ExperimentDigests.config_key(best_run_retention=self.best_run_retention),
+            )
+
+        # Keep the best runs of each experiment
+        final_run_list = self.exclude_best_runs(runs=final_run_list)
         print(f"{len(final_run_list)} of the stale runs are pruneable")
 
         # Return the final result
         return final_run_list
 
-    def get_pruneables(self) -> Pruneable:
+    def get_newly_stale_runs(self, experiment_ids: list[str]) -> list[Run]:
         """
-        Returns a `Pruneable` DTO for suitable for processing.
+        Returns the runs of the experiments which became stale since the cut-off each experiment was previously
+        scanned up to (in the `scan_state`).  New experiments are scanned in full.
+
+        Parameters
+        ----------
+        experiment_ids: list[str]
+            The experiments to scan.
 
         Returns
         -------
-        pruneable: Pruneable
-            A `Pruneable` object.
+        runs: list[Run]
+            The newly stale runs.
+        """
+
+        # Group the experiments by the cut-off they were previously scanned up to (new experiments have none)
+        watermarks: dict[str, int] = self.scan_state.get_watermarks(experiment_ids=experiment_ids)
+        groups: dict[Optional[int], list[str]] = {}
+        for experiment_id in experiment_ids:
+            groups.setdefault(watermarks.get(experiment_id), []).append(experiment_id)
+
+        runs: list[Run] = RunTable() if self.compact_records else []
+        for since, group in groups.items():
+            print(f"Reviewing experiments {group} for runs stale since {since}")
+            for page in self.iter_stale_runs(experiment_ids=group, since=since):
+                runs.extend(page)
+        return runs
+
+    def get_incremental_pruneable_runs(
+        self, model_versions: list[ModelVersion], linked_run_ids: Optional[set[str]] = None
+    ) -> list[Run]:
+        """
+        Generates a list of `Run` objects suitable for pruning, using the persisted `scan_state`.
+        Only runs which became stale since each experiment's previous cut-off are queried, and the runs
+        previously held back are re-checked by id (see `iter_runs_by_id`) once they are no longer linked to a
+        model version.
+
+        Parameters
+        ----------
+        model_versions: list[ModelVersion]
+            The list of model versions to cross-reference when determining prune-ability.
+        linked_run_ids: Optional[set[str]]
+            The run ids referenced by model versions, used in place of `model_versions` when provided.
+
+        Returns
+        -------
+        runs: list[Run]
+            A list of `Run` objects suitable for pruning.
+        """
+
+        if linked_run_ids is None:
+            linked_run_ids = LinkageIndex.from_model_versions(model_versions)
+
+        # Get Experiments
+        with self.metrics.phase("experiments"):
+            experiments: list[Experiment] = self.get_experiments()
+        experiment_ids: list[str] = [experiment.experiment_id for experiment in experiments]
+
+        # Get the runs which became stale since the previous scan
+        runs: list[Run] = self.get_newly_stale_runs(experiment_ids=experiment_ids)
+        print(f"Found {len(runs)} newly stale runs")
+
+        # Re-check previously held back runs which are no longer linked to a model version
+        held_run_ids: set[str] = self.scan_state.get_held_run_ids()
+        seen_run_ids: set[str] = {run.info.run_id for run in runs}
+        released_run_ids: list[str] = sorted(
+            run_id for run_id in held_run_ids - seen_run_ids if run_id not in linked_run_ids
+        )
+        statuses: tuple[str, ...] = self.stale_run_statuses()
+        for page in self.iter_runs_by_id(run_ids=released_run_ids, experiment_ids=experiment_ids):
+            # Runs which no longer exist (or are no longer active) are not returned
+            runs.extend([run for run in page if run.info.status in statuses])
+        print(f"Found {len(runs)} stale runs including released held back runs")
+
+        # Filter out runs which still have registered model versions
+        with self.metrics.phase("filter"):
+            final_run_list: list[Run] = PruneClient.filter_runs(
+                runs=runs, model_versions=[], linked_run_ids=linked_run_ids
+            )
+        self.decision_log.count(reason="linked_to_model_version", count=len(runs) - len(final_run_list))
+
+        # Keep the best runs of each experiment, holding them back so they are re-checked once outranked
+        best_run_ids: set[str] = set()
+        if self.best_run_retention is not None:
+            kept_runs: list[Run] = self.exclude_best_runs(runs=final_run_list)
+            best_run_ids = {run.info.run_id for run in final_run_list} - {run.info.run_id for run in kept_runs}
+            final_run_list = kept_runs
+        print(f"{len(final_run_list)} of the stale runs are pruneable")
+
+        # Stage the new high-water mark, holding back the linked (and best) stale runs for re-checking
+        self.scan_state.stage(
+            cutoff=self.oldest_allowed_timestamp,
+            experiment_ids=experiment_ids,
+            held_run_ids={run_id for run_id in held_run_ids | seen_run_ids if run_id in linked_run_ids} | best_run_ids,
+        )
+
+        return final_run_list
+
+    def get_pruneable_page(
+        self, runs: list[Run], model_versions: list[ModelVersion], linked_run_ids: Optional[set[str]] = None
+    ) -> list[Run]:
+        """
+        Returns the runs of a page of stale runs which are suitable for pruning (those pruneable under the
+        `policy`, not linked to a model version and not among the best runs of their experiment).
+
+        Parameters
+        ----------
+        runs: list[Run]
+            A page of stale runs.
+        model_versions: list[ModelVersion]
+            The list of model versions to cross-reference when determining prune-ability.
+        linked_run_ids: Optional[set[str]]
+            The run ids referenced by model versions, used in place of `model_versions` when provided.
+
+        Returns
+        -------
+        runs: list[Run]
+            The pruneable runs of the page.
+        """
+
+        with self.metrics.phase("policy"):
+            runs = self.apply_policy(runs=runs)
+        with self.metrics.phase("filter"):
+            pruneable_runs: list[Run] = PruneClient.filter_runs(
+                runs=runs, model_versions=model_versions, linked_run_ids=linked_run_ids
+            )
+        self.decision_log.count(reason="linked_to_model_version", count=len(runs) - len(pruneable_runs))
+        return self.exclude_best_runs(runs=pruneable_runs)
+
+    def get_pruneable_models(self) -> tuple[list[ModelVersion], list[ModelVersion]]:
+        """
+        Returns every registered model version along with the subset found to be pruneable.  The index of the
+        runs linked to the versions is built along the way (as the `linkage_index`).
+
+        Returns
+        -------
+        versions: tuple[list[ModelVersion], list[ModelVersion]]
+            All registered model versions, and the pruneable model versions.
         """
 
         # Get registered models
-        models: list[RegisteredModel] = self.get_registered_models()
+        with self.metrics.phase("models"):
+            models: list[RegisteredModel] = self.get_registered_models()
         registered_model_names: list[str] = [model.name for model in models]
 
-        # Get registered model versions
+        # Get registered model versions, and those to prune (evaluated before compaction, so tags can be read)
         model_versions: list[ModelVersion] = []
+        prunable_model_versions: list[ModelVersion] = []
+        self.linkage_index = LinkageIndex()
+        self.model_version_counts = {}
         for model_name in registered_model_names:
-            model_versions += list(self.get_model_versions(model_name=model_name))
+            with self.metrics.phase("versions"):
+                versions: list[ModelVersion] = list(self.get_model_versions(model_name=model_name))
+            self.linkage_index.add(versions)
+            self.model_version_counts[model_name] = len(versions)
+            pruneable_versions: list[ModelVersion] = self.get_pruneable_model_versions(versions=versions)
+            if self.compact_records:
+                versions = [ModelVersionRecord.from_model_version(version) for version in versions]
+                pruneable_versions = [ModelVersionRecord.from_model_version(version) for version in pruneable_versions]
+            model_versions += versions
+            prunable_model_versions += pruneable_versions
             print(f"Registered model name: {model_name}, Total number of model versions: {len(model_versions)}")
 
-        # Get model versions to prune
-        prunable_model_versions: list[ModelVersion] = self.get_pruneable_model_versions(versions=model_versions)
         print(f"Number of pruneable model versions: {len(prunable_model_versions)}")
 
-        # Get experiment runs to prune
-        pruneable_runs: list[Run] = self.get_pruneable_runs(model_versions=model_versions)
+        return model_versions, prunable_model_versions
+
+    def iter_model_versions(self) -> Iterator[list[ModelVersion]]:
+        """
+        Streams every registered model version from the Model Registry one page at a time, using
+        `search_model_versions` rather than one `get_model_versions` call per registered model.
+
+        Returns
+        -------
+        pages: Iterator[list[ModelVersion]]
+            An iterator of model version pages.
+        """
+
+        # The model version search grammar only accepts `name`, `run_id`, `source_path` and tag predicates,
+        # so the stage and age checks can not be pushed to the server and are applied to each page.
+        page_token: Optional[str] = None
+        while True:
+            with self.metrics.phase("versions"):
+                page = self.client.search_model_versions(
+                    filter_string="", max_results=self.page_size, page_token=page_token
+                )
+            yield list(page)
+
+            page_token = getattr(page, "token", None)
+            if not page_token:
+                break
+
+    def search_pruneable_models(self) -> tuple[LinkageIndex, list[ModelVersion]]:
+        """
+        Returns the index of runs linked to registered model versions along with the pruneable model versions.
+        Only the run id linkage is retained for versions which are not pruneable.
+
+        Returns
+        -------
+        versions: tuple[LinkageIndex, list[ModelVersion]]
+            The runs referenced by model versions, and the pruneable model versions.
+        """
+
+        linked_run_ids: LinkageIndex = LinkageIndex()
+        prunable_model_versions: list[ModelVersion] = []
+        version_count: int = 0
+        self.model_version_counts = Counter()
+        for page in self.iter_model_versions():
+            version_count += len(page)
+            linked_run_ids.add(page)
+            self.model_version_counts.update(version.name for version in page)
+            pruneable_versions: list[ModelVersion] = self.get_pruneable_model_versions(versions=page)
+            if self.compact_records:
+                pruneable_versions = [ModelVersionRecord.from_model_version(version) for version in pruneable_versions]
+            prunable_model_versions += pruneable_versions
+        print(f"Total number of model versions: {version_count}, linked runs: {len(linked_run_ids)}")
+        print(f"Number of pruneable model versions: {len(prunable_model_versions)}")
+
+        return linked_run_ids, prunable_model_versions
+
+    def discover_pruneable_models(self) -> list[ModelVersion]:
+        """
+        Returns the pruneable model versions, indexing the runs linked to every model version along the way (as
+        the `linkage_index`), with `search_pruneable_models` when `model_version_search` is set.
+
+        Returns
+        -------
+        versions: list[ModelVersion]
+            The pruneable model versions.
+        """
+
+        if self.model_version_search:
+            self.linkage_index, prunable_model_versions = self.search_pruneable_models()
+        else:
+            _, prunable_model_versions = self.get_pruneable_models()
+        return prunable_model_versions
+
+    def get_pruneables(self) -> Pruneable:
+        """
+        Returns a `Pruneable` DTO for suitable for processing.
+
+        Returns
+        -------
+        pruneable: Pruneable
+            A `Pruneable` object.
+        """
+
+        if self.sql_engine is not None:
+            # Perform the analysis as set based queries against the backend store
+            return self.sql_engine.get_pruneables(cutoff=self.oldest_allowed_timestamp)
+
+        if self.model_version_search:
+            # Get the run linkage of all model versions, and those to prune
+            self.linkage_index, prunable_model_versions = self.search_pruneable_models()
+
+            # Get experiment runs to prune
+            pruneable_runs: list[Run] = self.get_pruneable_runs(model_versions=[], linked_run_ids=self.linkage_index)
+        else:
+            # Get registered model versions (indexing their run linkage), and those to prune
+            model_versions, prunable_model_versions = self.get_pruneable_models()
+
+            # Get experiment runs to prune
+            pruneable_runs: list[Run] = self.get_pruneable_runs(
+                model_versions=model_versions, linked_run_ids=self.linkage_index
+            )
         print(f"Number of pruneable experiment runs: {len(pruneable_runs)}")
+        self.metrics.count_entities(kind="model_version", outcome="pruneable", count=len(prunable_model_versions))
+        self.metrics.count_entities(kind="run", outcome="pruneable", count=len(pruneable_runs))
 
         return Pruneable(runs=pruneable_runs, models=prunable_model_versions)
 
-    def prune(self, pruneables: Pruneable, dry_run: bool) -> None:
+    def record_deletion(self, result: PruneResult, kind: str, entity_id: str, error: Optional[Exception]) -> None:
+        """
+        Records the outcome of an entity deletion in the result, metrics, decision log and journal.
+
+        Parameters
+        ----------
+        result: PruneResult
+            The accounting to record the outcome in.
+        kind: str
+            The kind of entity deleted.
+        entity_id: str
+            The id of the entity deleted.
+        error: Optional[Exception]
+            The deletion error, `None` when the deletion succeeded.
+        """
+
+        if error is None:
+            result.record_success(kind=kind)
+            if kind == "run" and self.track_deleted_runs:
+                result.deleted_run_ids.append(entity_id)
+            self.metrics.count_entities(kind=kind, outcome="deleted")
+            if self.journal is not None:
+                self.journal.mark_done(kind=kind, entity_id=entity_id)
+        else:
+            self.decision_log.action("delete_failed", kind=kind, id=entity_id, error=str(error))
+            result.record_failure(kind=kind, entity_id=entity_id, error=str(error))
+            self.metrics.count_entities(kind=kind, outcome="failed")
+
+    def apply_deletions(
+        self,
+        kind: str,
+        deletions: Iterable[tuple[str, dict, Callable[[], None]]],
+        batched: bool = False,
+    ) -> PruneResult:
+        """
+        Applies deletions, on a bounded worker pool when `delete_concurrency` is greater than one.
+        A failed deletion is recorded and does not abort the remaining deletions.  Successful deletions are
+        checkpointed to the `journal` when one is set.  No deletions are issued once the `budget` (if set) has
+        run out.
+
+        Parameters
+        ----------
+        kind: str
+            The kind of entity being deleted (used for accounting).
+        deletions: Iterable[tuple[str, dict, Callable[[], None]]]
+            The entity id, report message and delete call for each entity.
+        batched: bool
+            When `True`, the (run) entities are instead soft deleted by id in the backend store by the
+            `sql_engine`, in batched transactions (see `SqlPruneEngine.delete_runs`).
+
+        Returns
+        -------
+        result: PruneResult
+            The per-entity success and failure accounting.
+        """
+
+        result: PruneResult = PruneResult()
+        account: Callable[..., None] = partial(self.record_deletion, result, kind)
+        if self.budget is not None:
+            deletions = self.budget.limit(kind=kind, deletions=deletions)
+
+        def delete(action: Callable[[], None]) -> Optional[Exception]:
+            try:
+                action()
+            except MlflowException as error:
+                return error
+            return None
+
+        if batched:
+
+            def entity_ids() -> Iterator[str]:
+                for entity_id, message_dict, _ in deletions:
+                    self.decision_log.action("delete", kind=kind, **message_dict)
+                    yield entity_id
+
+            self.sql_engine.delete_runs(run_ids=entity_ids(), account=account)
+            return result
+
+        if self.delete_concurrency <= 1:
+            for entity_id, message_dict, action in deletions:
+                self.decision_log.action("delete", kind=kind, **message_dict)
+                account(entity_id=entity_id, error=delete(action))
+            return result
+
+        configure_connection_pool(pool_size=self.delete_concurrency)
+        with ThreadPoolExecutor(max_workers=self.delete_concurrency) as executor:
+            # Bound the number of in-flight deletions so large (or streamed) inputs are not queued all at once
+            in_flight: dict[Future, str] = {}
+            for entity_id, message_dict, action in deletions:
+                if len(in_flight) >= self.delete_concurrency * 2:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        account(entity_id=in_flight.pop(future), error=future.result())
+                self.decision_log.action("delete", kind=kind, **message_dict)
+                in_flight[executor.submit(delete, action)] = entity_id
+            for future in as_completed(in_flight):
+                account(entity_id=in_flight[future], error=future.result())
+        return result
+
+    def prune_models(
+        self, models: Iterable[ModelVersion], dry_run: bool, collapsed: Container[str] = ()
+    ) -> PruneResult:
+        """
+        Prunes (or reports) the provided model versions.
+
+        Parameters
+        ----------
+        models: Iterable[ModelVersion]
+            The model versions to process.
+        dry_run: bool
+            When `True` the model versions are only reported.
+        collapsed: Container[str]
+            The names of the registered models already deleted (or reported) as a whole, whose versions are
+            skipped (see `ModelCollapser`).
+
+        Returns
+        -------
+        result: PruneResult
+            The deletion accounting (empty for a dry run).
+        """
+
+        def deletions() -> Iterator[tuple[str, dict, Callable[[], None]]]:
+            for model in models:
+                if model.name in collapsed:
+                    continue
+                message_dict: dict = {
+                    "name": model.name,
+                    "version": model.version,
+                    "last_updated_timestamp": model.last_updated_timestamp,
+                }
+
+                if dry_run:
+                    # Report only
+                    self.decision_log.action("dry_run", kind="model_version", **message_dict)
+                else:
+                    # Queue the removal
+                    yield (
+                        f"{model.name}/{model.version}",
+                        message_dict,
+                        partial(self.client.delete_model_version, name=model.name, version=model.version),
+                    )
+
+        with self.metrics.phase("delete"):
+            return self.apply_deletions(kind="model_version", deletions=deletions())
+
+    def prune_runs(self, runs: Iterable[Run], dry_run: bool) -> PruneResult:
+        """
+        Prunes (or reports) the provided runs.  Runs linked to a model version since they were planned are
+        skipped, and recorded as such in the result.
+
+        Parameters
+        ----------
+        runs: Iterable[Run]
+            The runs to process.
+        dry_run: bool
+            When `True` the runs are only reported.
+
+        Returns
+        -------
+        result: PruneResult
+            The deletion accounting (only the skipped runs, and the reported runs when tracked, for a dry run).
+        """
+
+        skipped_run_ids: list[str] = []
+        reported_run_ids: list[str] = []
+
+        def deletions() -> Iterator[tuple[str, dict, Callable[[], None]]]:
+            for run in runs:
+                message_dict: dict = {
+                    "id": run.info.run_id,
+                    "end_time": run.info.end_time,
+                    "experiment_id": run.info.experiment_id,
+                }
+
+                if self.linkage_index is not None and run.info.run_id in self.linkage_index:
+                    # The run has been linked to a model version since it was planned
+                    self.decision_log.decision("linked_to_model_version", kind="run", **message_dict)
+                    skipped_run_ids.append(run.info.run_id)
+                    continue
+
+                if dry_run:
+                    # Report only
+                    self.decision_log.action("dry_run", kind="run", **message_dict)
+                    if self.track_deleted_runs:
+                        reported_run_ids.append(run.info.run_id)
+                else:
+                    # Queue the removal
+                    yield run.info.run_id, message_dict, partial(self.client.delete_run, run_id=run.info.run_id)
+
+        with self.metrics.phase("delete"):
+            if self.sql_engine is not None:
+                # Soft delete directly in the backend store, in batched transactions
+                result: PruneResult = self.apply_deletions(kind="run", deletions=deletions(), batched=True)
+            else:
+                result: PruneResult = self.apply_deletions(kind="run", deletions=deletions())
+
+        for run_id in skipped_run_ids:
+            result.record_skip(kind="run", entity_id=run_id, reason="linked_to_model_version")
+        result.deleted_run_ids += reported_run_ids
+        return result
+
+    def prune(self, pruneables: Pruneable, dry_run: bool, collapsed: Container[str] = ()) -> PruneResult:
         """
         Performs the MLFlow Tracking Server Pruning Process.
 
@@ -210,37 +982,23 @@ class PruneClient(AnacondaMlFlowClient):
         ----------
         pruneables: Pruneable
             A `Pruneable` defining the resources to process.
+        dry_run: bool
+            When `True` resources are only reported.
+        collapsed: Container[str]
+            The names of the registered models already deleted (or reported) as a whole, whose versions are
+            skipped (see `ModelCollapser`).
+
+        Returns
+        -------
+        result: PruneResult
+            The deletion accounting (empty for a dry run).
         """
 
         print("[START] Stale Model Pruning")
-        for model in pruneables.models:
-            message_dict: dict = {
-                "name": model.name,
-                "version": model.version,
-                "last_updated_timestamp": model.last_updated_timestamp,
-            }
-
-            if dry_run:
-                # Report only
-                print(f"[DRY RUN] {message_dict}")
-            else:
-                # Perform removal
-                print(f"[DELETE] {message_dict}")
-                self.client.delete_model_version(name=model.name, version=model.version)
+        result: PruneResult = self.prune_models(models=pruneables.models, dry_run=dry_run, collapsed=collapsed)
         print("[COMPLETE] Stale Model Pruning")
         print("[START] Stale Run Pruning")
-        for run in pruneables.runs:
-            message_dict: dict = {
-                "id": run.info.run_id,
-                "end_time": run.info.end_time,
-                "experiment_id": run.info.experiment_id,
-            }
-
-            if dry_run:
-                # Report only
-                print(f"[DRY RUN] {message_dict}")
-            else:
-                # Perform the removal
-                print(f"[DELETE] {message_dict}")
-                self.client.delete_run(run_id=run.info.run_id)
+        result.merge(self.prune_runs(runs=pruneables.runs, dry_run=dry_run))
         print("[COMPLETE] Stale Run Pruning")
+        self.decision_log.summary()
+        return result
@@ -0,0 +1,150 @@
+""" Defines the Registered Model Collapser """
+
+from collections import Counter
+from functools import partial
+from typing import Callable, Iterable, Iterator
+
+from mlflow.entities.model_registry import ModelVersion, RegisteredModel
+
+from ..dto.prune_result import PruneResult
+from ..dto.pruneable import Pruneable
+from .client import PruneClient
+
+
+class ModelCollapser:
+    """
+    Registered Model Collapser
+    Deletes the registered models whose versions are all pruneable (and so unstaged) with a single registered
+    model deletion each, rather than one deletion per version.  The collapsible models are chosen once the
+    analysis has counted the versions of each registered model, and are carried by the plan (and journal) as the
+    `registered_models` of the `Pruneable`.
+    """
+
+    @staticmethod
+    def get_collapsible_models(pruner: PruneClient, versions: Iterable[ModelVersion]) -> list[str]:
+        """
+        Returns the names of the registered models whose versions are all pruneable.
+
+        Parameters
+        ----------
+        pruner: PruneClient
+            The pruning client, holding the `model_version_counts` of the analysis.
+        versions: Iterable[ModelVersion]
+            The pruneable model versions.
+
+        Returns
+        -------
+        names: list[str]
+            The names of the registered models to delete as a whole.
+        """
+
+        pruneable_counts: Counter = Counter(version.name for version in versions)
+        names: list[str] = [
+            name for name, count in pruneable_counts.items() if count == pruner.model_version_counts.get(name)
+        ]
+        collapsed_count: int = sum(pruneable_counts[name] for name in names)
+        print(f"Number of fully stale registered models: {len(names)} ({collapsed_count} model versions)")
+        pruner.metrics.count_entities(kind="registered_model", outcome="pruneable", count=len(names))
+        return names
+
+    @staticmethod
+    def prune_registered_models(
+        pruner: PruneClient, versions: dict[str, list[ModelVersion]], dry_run: bool
+    ) -> tuple[PruneResult, set[str]]:
+        """
+        Prunes (or reports) registered models whose versions are all pruneable, with a single registered model
+        deletion each.  The versions planned by the analysis are reused rather than listed again: the registry
+        updates a registered model's `last_updated_timestamp` whenever a version is registered, transitioned or
+        deleted, so the model is only deleted when that timestamp is no later than those of its planned versions.
+
+        Parameters
+        ----------
+        pruner: PruneClient
+            The pruning client.
+        versions: dict[str, list[ModelVersion]]
+            The planned model versions of each registered model.
+        dry_run: bool
+            When `True` the registered models are only reported.
+
+        Returns
+        -------
+        result: tuple[PruneResult, set[str]]
+            The deletion accounting (of the registered models and their versions), and the names of the
+            registered models deleted (or reported).  The versions of the other models are left to be deleted
+            one by one.
+        """
+
+        deleted: set[str] = set()
+
+        def is_unchanged(name: str, planned: list[ModelVersion]) -> bool:
+            model: RegisteredModel = pruner.client.get_registered_model(name=name)
+            return model.last_updated_timestamp <= max(version.last_updated_timestamp for version in planned)
+
+        def delete(name: str) -> None:
+            pruner.client.delete_registered_model(name=name)
+            deleted.add(name)
+
+        def deletions() -> Iterator[tuple[str, dict, Callable[[], None]]]:
+            for name, planned in versions.items():
+                message_dict: dict = {"name": name, "versions": len(planned)}
+
+                if dry_run:
+                    # Report only
+                    pruner.decision_log.action("dry_run", kind="registered_model", **message_dict)
+                    deleted.add(name)
+                elif is_unchanged(name=name, planned=planned):
+                    # Queue the removal
+                    yield name, message_dict, partial(delete, name=name)
+                else:
+                    pruner.decision_log.decision("changed_since_planned", kind="registered_model", **message_dict)
+
+        with pruner.metrics.phase("delete"):
+            result: PruneResult = pruner.apply_deletions(kind="registered_model", deletions=deletions())
+
+        for name in deleted:
+            pruner.decision_log.count(reason="collapsed_into_registered_model", count=len(versions[name]))
+            if not dry_run:
+                # Net of the registered model deletion, and the look up verifying it.  The look ups of the models
+                # found changed since planned are not deducted, as no calls were saved on them.
+                pruner.metrics.count_saved_calls(method="delete_model_version", count=len(versions[name]) - 2)
+                # The versions are deleted with their model
+                for version in versions[name]:
+                    pruner.record_deletion(
+                        result=result, kind="model_version", entity_id=f"{name}/{version.version}", error=None
+                    )
+        print(f"Registered models deleted as a whole: {len(deleted)} of {len(versions)}")
+        return result, deleted
+
+    def prune(self, pruner: PruneClient, pruneables: Pruneable, dry_run: bool) -> PruneResult:
+        """
+        Performs the MLFlow Tracking Server Pruning Process, deleting the `registered_models` of the pruneables
+        as a whole before the remaining model versions and runs are pruned (see `PruneClient.prune`).
+
+        Parameters
+        ----------
+        pruner: PruneClient
+            The pruning client.
+        pruneables: Pruneable
+            A `Pruneable` defining the resources to process.
+        dry_run: bool
+            When `True` resources are only reported.
+
+        Returns
+        -------
+        result: PruneResult
+            The deletion accounting (empty for a dry run).
+        """
+
+        planned: dict[str, list[ModelVersion]] = {name: [] for name in pruneables.registered_models}
+        if planned:
+            for model in pruneables.models:
+                if model.name in planned:
+                    planned[model.name].append(model)
+
+        print("[START] Registered Model Pruning")
+        result, collapsed = self.prune_registered_models(
+            pruner=pruner, versions={name: versions for name, versions in planned.items() if versions}, dry_run=dry_run
+        )
+        print("[COMPLETE] Registered Model Pruning")
+        result.merge(pruner.prune(pruneables=pruneables, dry_run=dry_run, collapsed=collapsed))
+        return result
@@ -0,0 +1,310 @@
+""" Defines the Experiment Digests """
+
+import sqlite3
+from collections import Counter
+from typing import Any, Iterable, Optional
+
+from mlflow.entities import Experiment, Run
+
+from .policy import DAY
+from .ranking import BestRunRetention
+
+# Period (measured in milliseconds) past the cut-off the stale run searches are extended by when experiment digests
+# are kept, so the next time a run of each experiment can become stale is found by the same searches
+DIGEST_LOOKAHEAD: int = DAY
+
+
+# A digest holds each of the evaluated fields of its experiment
+# pylint: disable=too-many-instance-attributes
+class ExperimentDigest:
+    """
+    Experiment Digest
+    The outcome of an experiment's last evaluation.
+
+    Attributes
+    ----------
+    experiment_id: str
+        The experiment id.
+    last_update_time: Optional[int]
+        The experiment's last update time when it was evaluated.
+    cutoff: int
+        The stale cut-off the experiment was evaluated with.
+    evaluated_at: int
+        The time (measured in milliseconds) the experiment was evaluated at.
+    next_stale_time: Optional[int]
+        The earliest end time at or after the `cutoff` of any of the experiment's runs (or a lower bound of it),
+        `None` if there was none.
+    stale_runs: int
+        The number of stale runs found.
+    held_runs: int
+        The number of stale runs which were held back (retained by a policy or linked to a model version).
+    config: str
+        The key of the evaluation configuration (e.g. the best run ranking) the experiment was evaluated with.
+    """
+
+    __slots__ = (
+        "experiment_id",
+        "last_update_time",
+        "cutoff",
+        "evaluated_at",
+        "next_stale_time",
+        "stale_runs",
+        "held_runs",
+        "config",
+    )
+
+    # A digest is built from each of the evaluated fields it holds
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        experiment_id: str,
+        last_update_time: Optional[int],
+        cutoff: int,
+        evaluated_at: int,
+        next_stale_time: Optional[int],
+        stale_runs: int,
+        held_runs: int,
+        config: str = "",
+    ):
+        self.experiment_id = experiment_id
+        self.last_update_time = last_update_time
+        self.cutoff = cutoff
+        self.evaluated_at = evaluated_at
+        self.next_stale_time = next_stale_time
+        self.stale_runs = stale_runs
+        self.held_runs = held_runs
+        self.config = config
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, ExperimentDigest) and self.to_row() == other.to_row()
+
+    def __repr__(self) -> str:
+        return f"ExperimentDigest(experiment_id={self.experiment_id!r}, cutoff={self.cutoff!r})"
+
+    def to_row(self) -> tuple:
+        """Returns the digest as a row of the digests table."""
+
+        return tuple(getattr(self, name) for name in ExperimentDigest.__slots__)
+
+    def is_dormant(self, experiment: Experiment, cutoff: float, config: str = "") -> bool:
+        """
+        Returns `True` if the digest proves no run of the experiment can have become pruneable by the `cutoff`:
+
+        1. The experiment has not been updated since, and none of its stale runs were held back.
+        2. No run ended between the previous cut-off and the new one (the earliest later end time is not yet stale).
+        3. The cut-off has not passed the evaluation time, so runs which ended since can not be stale yet.
+        4. The experiment was evaluated with the same configuration (`config`).
+        """
+
+        return (
+            self.config == config
+            and experiment.last_update_time == self.last_update_time
+            and self.held_runs == 0
+            and cutoff <= self.evaluated_at
+            and (self.next_stale_time is None or cutoff <= self.next_stale_time)
+        )
+
+
+class ExperimentDigests:
+    """
+    Experiment Digests
+    A local SQLite file persisting a digest of each experiment's last evaluation.  Later scans skip the
+    (dormant) experiments whose digest proves that no run can have crossed the cut-off since, and only
+    search the changed ones.
+
+    Changes are staged during analysis and only persisted by `commit`, once the deletions have been applied.
+
+    Attributes
+    ----------
+    path: str
+        The path of the SQLite digests file.
+    """
+
+    path: str
+
+    def __init__(self, path: str):
+        self.path = path
+        self.staged: dict[str, ExperimentDigest] = {}
+        self.connection: sqlite3.Connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS digests ("
+            "experiment_id TEXT PRIMARY KEY, last_update_time INTEGER, cutoff INTEGER NOT NULL, "
+            "evaluated_at INTEGER NOT NULL, next_stale_time INTEGER, stale_runs INTEGER NOT NULL, "
+            "held_runs INTEGER NOT NULL, config TEXT NOT NULL DEFAULT '')"
+        )
+        columns: set[str] = {row[1] for row in self.connection.execute("PRAGMA table_info(digests)")}
+        if "config" not in columns:
+            # Digests written before they were keyed by the evaluation configuration
+            self.connection.execute("ALTER TABLE digests ADD COLUMN config TEXT NOT NULL DEFAULT ''")
+        self.connection.commit()
+
+    def get_digests(self, experiment_ids: list[str]) -> dict[str, ExperimentDigest]:
+        """
+        Returns the digests of the provided experiments.  Experiments which have never been evaluated are omitted.
+
+        Parameters
+        ----------
+        experiment_ids: list[str]
+            The experiment ids to look up.
+
+        Returns
+        -------
+        digests: dict[str, ExperimentDigest]
+            The digest by experiment id.
+        """
+
+        requested: set[str] = set(experiment_ids)
+        return {
+            row[0]: ExperimentDigest(*row)
+            for row in self.connection.execute("SELECT * FROM digests")
+            if row[0] in requested
+        }
+
+    def get_changed_experiments(
+        self, experiments: list[Experiment], cutoff: float, config: str = ""
+    ) -> list[Experiment]:
+        """
+        Returns the experiments which must be searched for stale runs at the `cutoff` (those without a digest
+        proving them dormant).
+
+        Parameters
+        ----------
+        experiments: list[Experiment]
+            The experiments to review.
+        cutoff: float
+            The stale cut-off.
+        config: str
+            The key of the evaluation configuration.
+
+        Returns
+        -------
+        experiments: list[Experiment]
+            The changed experiments.
+        """
+
+        digests: dict[str, ExperimentDigest] = self.get_digests(
+            experiment_ids=[experiment.experiment_id for experiment in experiments]
+        )
+        return [
+            experiment
+            for experiment in experiments
+            if experiment.experiment_id not in digests
+            or not digests[experiment.experiment_id].is_dormant(experiment=experiment, cutoff=cutoff, config=config)
+        ]
+
+    @staticmethod
+    def config_key(best_run_retention: Optional[BestRunRetention]) -> str:
+        """Returns the key of the evaluation configuration (the best run ranking) the digests hold for."""
+
+        return best_run_retention.config_key() if best_run_retention is not None else ""
+
+    @staticmethod
+    def split_upcoming_runs(runs: list[Run], cutoff: float, upcoming: dict[str, int]) -> list[Run]:
+        """
+        Returns the stale runs of a page searched past the `cutoff` (by `DIGEST_LOOKAHEAD`), recording the
+        earliest end time of each experiment's runs which are not yet stale in `upcoming`.
+        """
+
+        stale_runs: list[Run] = []
+        for run in runs:
+            if run.info.end_time < cutoff:
+                stale_runs.append(run)
+            else:
+                ExperimentDigests.merge_upcoming(upcoming=upcoming, other={run.info.experiment_id: run.info.end_time})
+        return stale_runs
+
+    @staticmethod
+    def merge_upcoming(upcoming: dict[str, int], other: dict[str, int]) -> None:
+        """Merges the earliest upcoming end time of each experiment of `other` into `upcoming`."""
+
+        for experiment_id, end_time in other.items():
+            upcoming[experiment_id] = min(upcoming.get(experiment_id, end_time), end_time)
+
+    def stage(self, digests: Iterable[ExperimentDigest]) -> None:
+        """Stages the digests of the evaluated experiments."""
+
+        self.staged = {digest.experiment_id: digest for digest in digests}
+
+    # The evaluation is staged from the results of a single scan
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def stage_evaluation(
+        self,
+        experiments: list[Experiment],
+        stale_runs: list[Run],
+        unheld_runs: list[Run],
+        upcoming: dict[str, int],
+        cutoff: float,
+        evaluated_at: float,
+        config: str = "",
+    ) -> None:
+        """
+        Stages the digests of the experiments evaluated at the `cutoff`.
+
+        Parameters
+        ----------
+        experiments: list[Experiment]
+            The evaluated experiments.
+        stale_runs: list[Run]
+            The stale runs found in the experiments.
+        unheld_runs: list[Run]
+            The stale runs which were neither retained by a policy nor linked to a model version.
+        upcoming: dict[str, int]
+            The earliest end time of each experiment's runs which are not yet stale, found by the stale run
+            searches within the `DIGEST_LOOKAHEAD`.  For the other experiments the end of the lookahead is used,
+            as no run of theirs can become stale before it.
+        cutoff: float
+            The stale cut-off.
+        evaluated_at: float
+            The time (measured in milliseconds) the experiments were evaluated at.
+        config: str
+            The key of the evaluation configuration (see `config_key`).
+        """
+
+        stale_counts: Counter = Counter(run.info.experiment_id for run in stale_runs)
+        unheld_counts: Counter = Counter(run.info.experiment_id for run in unheld_runs)
+        lookahead: int = int(cutoff + DIGEST_LOOKAHEAD)
+        self.stage(
+            digests=[
+                ExperimentDigest(
+                    experiment_id=experiment.experiment_id,
+                    last_update_time=experiment.last_update_time,
+                    cutoff=int(cutoff),
+                    evaluated_at=int(evaluated_at),
+                    next_stale_time=upcoming.get(experiment.experiment_id, lookahead),
+                    stale_runs=stale_counts[experiment.experiment_id],
+                    held_runs=stale_counts[experiment.experiment_id] - unheld_counts[experiment.experiment_id],
+                    config=config,
+                )
+                for experiment in experiments
+            ]
+        )
+
+    def commit(self, failed_experiment_ids: Iterable[str] = ()) -> None:
+        """
+        Persists the staged digests.  The digests of experiments with runs which failed to delete are dropped,
+        so those experiments are searched again.
+
+        Parameters
+        ----------
+        failed_experiment_ids: Iterable[str]
+            The ids of the experiments with runs which failed to delete.
+        """
+
+        if not self.staged:
+            return
+
+        failed: set[str] = set(failed_experiment_ids)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (digest.to_row() for experiment_id, digest in self.staged.items() if experiment_id not in failed),
+            )
+            self.connection.executemany(
+                "DELETE FROM digests WHERE experiment_id = ?", ((experiment_id,) for experiment_id in failed)
+            )
+        self.staged = {}
+
+    def close(self) -> None:
+        """Closes the digests file."""
+
+        self.connection.close()
@@ -0,0 +1,77 @@
+""" MLFlow REST Connection Pool Configuration """
+
+import warnings
+from threading import Lock
+from types import ModuleType
+from typing import Callable
+
+from mlflow.utils import rest_utils
+
+try:
+    # Later MLFlow versions create the REST session in `request_utils`
+    from mlflow.utils import request_utils
+except ImportError:
+    request_utils = None
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+
+# Private MLFlow session factory wrapped to size the connection pool (see the supported `mlflow` range of the
+# environment in `anaconda-project.yml`)
+SESSION_FACTORY: str = "_get_request_session"
+
+_lock: Lock = Lock()
+
+
+# pylint: disable=protected-access
+def configure_connection_pool(pool_size: int) -> None:
+    """
+    Sizes the connection pool of the HTTP session shared by all MLFlow REST calls.
+
+    MLFlow caches a single `requests.Session` per retry configuration, but its adapters keep the `requests`
+    default of 10 pooled connections.  With more concurrent workers than that, connections are discarded and
+    re-established (including the TLS handshake) on every call.  The session factory is wrapped so that the
+    cached session is mounted with an adapter holding `pool_size` keep-alive connections.  When the installed
+    MLFlow version does not define the (private) session factory, a warning is issued and the default pool
+    is kept.
+
+    Parameters
+    ----------
+    pool_size: int
+        The number of connections to keep alive per host.
+    """
+
+    def pooled(original: Callable[..., Session]) -> Callable[..., Session]:
+        def get_pooled_request_session(*args, **kwargs) -> Session:
+            session: Session = original(*args, **kwargs)
+            with _lock:
+                if getattr(session, "pool_size", None) != pool_size:
+                    max_retries = session.get_adapter("https://").max_retries
+                    adapter: HTTPAdapter = HTTPAdapter(
+                        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=max_retries
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.pool_size = pool_size
+            return session
+
+        get_pooled_request_session.unpooled = original
+        return get_pooled_request_session
+
+    with _lock:
+        modules: list[ModuleType] = [
+            module for module in (rest_utils, request_utils) if module is not None and hasattr(module, SESSION_FACTORY)
+        ]
+        if not modules:
+            warnings.warn(
+                f"mlflow.utils.rest_utils.{SESSION_FACTORY} is not defined by this MLFlow version, "
+                "the REST connection pool is left at its default size",
+                RuntimeWarning,
+            )
+            return
+
+        # Wrap the factory wherever it is looked up, so the pool is sized whichever module makes the calls
+        for module in modules:
+            get_request_session: Callable[..., Session] = getattr(module, SESSION_FACTORY)
+            original: Callable[..., Session] = getattr(get_request_session, "unpooled", get_request_session)
+            setattr(module, SESSION_FACTORY, pooled(original=original))
@@ -0,0 +1,206 @@
+""" Defines the Prune Checkpoint Journal """
+
+import json
+import sqlite3
+from typing import Iterable, Optional
+
+from ..dto.pruneable import Pruneable
+from ..dto.records import ModelVersionRecord, RunRecord, RunTable
+
+
+class PruneJournal:
+    """
+    Prune Checkpoint Journal
+    A local SQLite file recording a computed prune plan along with the completion of each of its deletions,
+    allowing an interrupted prune to resume without re-analysis or repeating completed deletions.
+
+    Deletions left pending by a previous plan (e.g. when a budget ran out) which are still in a newly recorded
+    plan are carried over, and queued ahead of the new plan's other deletions.
+
+    Attributes
+    ----------
+    path: str
+        The path of the SQLite journal file.
+    max_age: int
+        The maximum age (measured in milliseconds) of a plan's stale cut-off before it is re-analysed.
+    """
+
+    path: str
+    max_age: int
+
+    def __init__(self, path: str, max_age: int):
+        self.path = path
+        self.max_age = max_age
+        self.connection: sqlite3.Connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entities ("
+            "kind TEXT NOT NULL, entity_id TEXT NOT NULL, payload TEXT NOT NULL, done INTEGER NOT NULL DEFAULT 0, "
+            "carried INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (kind, entity_id))"
+        )
+        columns: set[str] = {row[1] for row in self.connection.execute("PRAGMA table_info(entities)")}
+        if "carried" not in columns:
+            # Journals written before pending deletions were carried over
+            self.connection.execute("ALTER TABLE entities ADD COLUMN carried INTEGER NOT NULL DEFAULT 0")
+        self.connection.commit()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Returns a recorded plan property, or `None` when no plan is recorded."""
+
+        row: Optional[tuple] = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def pending_count(self) -> int:
+        """Returns the number of planned deletions which have not completed."""
+
+        return self.connection.execute("SELECT COUNT(*) FROM entities WHERE done = 0").fetchone()[0]
+
+    def is_resumable(self, cutoff: float, ttl: int) -> bool:
+        """
+        Determines whether the recorded plan can be resumed.  A plan is stale (and must be re-analysed) when it
+        was computed with a different TTL, or when its cut-off is older than the allowed maximum age.
+
+        Parameters
+        ----------
+        cutoff: float
+            The stale cut-off of the current run.
+        ttl: int
+            The entity TTL (measured in days) of the current run.
+
+        Returns
+        -------
+        resumable: bool
+            `True` if the plan has pending deletions and is not stale, `False` otherwise.
+        """
+
+        plan_cutoff: Optional[str] = self.get_meta(key="cutoff")
+        plan_ttl: Optional[str] = self.get_meta(key="ttl")
+        if plan_cutoff is None or plan_ttl is None:
+            return False
+        if int(plan_ttl) != ttl:
+            print(f"Journal TTL {plan_ttl} does not match {ttl}, re-analysing")
+            return False
+        if cutoff - float(plan_cutoff) > self.max_age:
+            print(f"Journal cut-off {plan_cutoff} is older than the allowed maximum age, re-analysing")
+            return False
+        return self.pending_count() > 0
+
+    def record_plan(self, pruneables: Pruneable, cutoff: float, ttl: int) -> None:
+        """
+        Replaces the recorded plan with the provided `Pruneable`, carrying over the pending deletions of the
+        previous plan which are still planned.
+
+        Parameters
+        ----------
+        pruneables: Pruneable
+            The computed plan.
+        cutoff: float
+            The stale cut-off the plan was computed with.
+        ttl: int
+            The entity TTL (measured in days) the plan was computed with.
+        """
+
+        with self.connection:
+            self.connection.execute("DROP TABLE IF EXISTS temp.carried")
+            self.connection.execute("CREATE TEMP TABLE carried AS SELECT kind, entity_id FROM entities WHERE done = 0")
+            self.connection.execute("DELETE FROM entities")
+            self.connection.execute("DELETE FROM meta")
+            self.connection.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("cutoff", str(cutoff)),
+                    ("ttl", str(ttl)),
+                    ("registered_models", json.dumps(list(pruneables.registered_models))),
+                ],
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO entities (kind, entity_id, payload) VALUES ('model_version', ?, ?)",
+                (
+                    (
+                        f"{model.name}/{model.version}",
+                        json.dumps(
+                            {
+                                "name": model.name,
+                                "version": str(model.version),
+                                "last_updated_timestamp": model.last_updated_timestamp,
+                            }
+                        ),
+                    )
+                    for model in pruneables.models
+                ),
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO entities (kind, entity_id, payload) VALUES ('run', ?, ?)",
+                (
+                    (
+                        run.info.run_id,
+                        json.dumps(
+                            {
+                                "run_id": run.info.run_id,
+                                "experiment_id": run.info.experiment_id,
+                                "end_time": run.info.end_time,
+                                "status": run.info.status,
+                                "artifact_uri": run.info.artifact_uri,
+                            }
+                        ),
+                    )
+                    for run in pruneables.runs
+                ),
+            )
+            self.connection.execute(
+                "UPDATE entities SET carried = 1 WHERE (kind, entity_id) IN (SELECT kind, entity_id FROM temp.carried)"
+            )
+            self.connection.execute("DROP TABLE temp.carried")
+
+    def iter_pending(self, kind: str) -> Iterable[dict]:
+        """Streams the recorded payloads of the pending deletions of the given kind."""
+
+        cursor: sqlite3.Cursor = self.connection.execute(
+            "SELECT payload FROM entities WHERE kind = ? AND done = 0 ORDER BY carried DESC, rowid", (kind,)
+        )
+        for (payload,) in cursor:
+            yield json.loads(payload)
+
+    def load_plan(self) -> Pruneable:
+        """
+        Returns the pending deletions of the recorded plan.
+
+        Returns
+        -------
+        pruneable: Pruneable
+            A `Pruneable` holding the entities which have not yet been deleted.
+        """
+
+        models: list[ModelVersionRecord] = [
+            ModelVersionRecord(
+                name=payload["name"],
+                version=payload["version"],
+                last_updated_timestamp=payload["last_updated_timestamp"],
+            )
+            for payload in self.iter_pending(kind="model_version")
+        ]
+        runs: RunTable = RunTable(
+            RunRecord(
+                run_id=payload["run_id"],
+                experiment_id=payload["experiment_id"],
+                end_time=payload["end_time"],
+                status=payload["status"],
+                artifact_uri=payload["artifact_uri"],
+            )
+            for payload in self.iter_pending(kind="run")
+        )
+        registered_models: list[str] = json.loads(self.get_meta(key="registered_models") or "[]")
+        return Pruneable(runs=runs, models=models, registered_models=registered_models)
+
+    def mark_done(self, kind: str, entity_id: str) -> None:
+        """Records the completed deletion of a planned entity."""
+
+        with self.connection:
+            self.connection.execute("UPDATE entities SET done = 1 WHERE kind = ? AND entity_id = ?", (kind, entity_id))
+
+    def close(self) -> None:
+        """Closes the journal file."""
+
+        self.connection.close()
@@ -0,0 +1,194 @@
+""" Defines the Run To Model Version Linkage Index """
+
+import json
+import os
+from array import array
+from typing import Any, Iterable, Iterator, Optional
+
+import numpy
+from mlflow.entities.model_registry import ModelVersion
+
+from ..dto.records import RunTable
+
+
+def pack_run_id(run_id: str) -> Optional[bytes]:
+    """Returns the 16 byte key of a (32 character hex uuid) run id, `None` for other ids."""
+
+    try:
+        packed: bytes = bytes.fromhex(run_id)
+    except ValueError:
+        return None
+    return packed if len(packed) == 16 else None
+
+
+# The packed link columns and their lookups
+# pylint: disable=too-many-instance-attributes
+class LinkageIndex:
+    """
+    Linkage Index
+    The runs referenced by registered model versions, built once during model version discovery and queried by
+    the run filter and the deletion stage in O(1) per run.
+
+    Run ids (32 character hex uuids) are packed into 16 byte keys of a hashed set; other ids are kept aside.
+    The versions linked to each run are held as parallel (key, model, version) arrays, sorted by key on the
+    first lookup, so an index of several hundred thousand links costs a few tens of megabytes.
+    """
+
+    def __init__(self):
+        self.keys: set[bytes] = set()
+        self.link_keys: bytearray = bytearray()
+        self.link_models: array = array("I")
+        self.link_versions: array = array("q")
+        self.model_names: list[str] = []
+        self.model_index: dict[str, int] = {}
+        self.other_links: dict[str, list[tuple[str, str]]] = {}
+        self.order: Optional[numpy.ndarray] = None
+
+    @staticmethod
+    def from_model_versions(versions: Iterable[ModelVersion]) -> "LinkageIndex":
+        """Builds an index of the runs linked to the model versions."""
+
+        index: LinkageIndex = LinkageIndex()
+        index.add(versions)
+        return index
+
+    def add(self, versions: Iterable[ModelVersion]) -> None:
+        """Adds the links of the model versions (versions without a run are ignored)."""
+
+        for version in versions:
+            if not version.run_id:
+                continue
+            key: Optional[bytes] = pack_run_id(version.run_id)
+            if key is None:
+                self.other_links.setdefault(version.run_id, []).append((version.name, str(version.version)))
+                continue
+
+            model: Optional[int] = self.model_index.get(version.name)
+            if model is None:
+                model = self.model_index[version.name] = len(self.model_names)
+                self.model_names.append(version.name)
+            self.keys.add(key)
+            self.link_keys += key
+            self.link_models.append(model)
+            self.link_versions.append(int(version.version))
+            self.order = None
+
+    def __contains__(self, run_id: Any) -> bool:
+        key: Optional[bytes] = pack_run_id(run_id) if isinstance(run_id, str) else None
+        if key is None:
+            return run_id in self.other_links
+        return key in self.keys
+
+    def __len__(self) -> int:
+        return len(self.keys) + len(self.other_links)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.keys:
+            yield key.hex()
+        yield from self.other_links
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (LinkageIndex, set, frozenset)):
+            return False
+        return set(self) == set(other)
+
+    def __repr__(self) -> str:
+        return f"LinkageIndex(runs={len(self)}, links={len(self.link_models)})"
+
+    def versions_of(self, run_id: str) -> list[tuple[str, str]]:
+        """
+        Returns the model versions linked to a run.
+
+        Parameters
+        ----------
+        run_id: str
+            The run id to look up.
+
+        Returns
+        -------
+        versions: list[tuple[str, str]]
+            The (registered model name, version) of each linked model version.
+        """
+
+        key: Optional[bytes] = pack_run_id(run_id)
+        if key is None:
+            return list(self.other_links.get(run_id, []))
+        if key not in self.keys:
+            return []
+
+        keys: numpy.ndarray = numpy.frombuffer(self.link_keys, dtype="S16")
+        if self.order is None:
+            self.order = numpy.argsort(keys, kind="stable")
+        sorted_keys: numpy.ndarray = keys[self.order]
+        start: int = int(numpy.searchsorted(sorted_keys, key, side="left"))
+        end: int = int(numpy.searchsorted(sorted_keys, key, side="right"))
+        return [
+            (self.model_names[self.link_models[link]], str(self.link_versions[link]))
+            for link in self.order[start:end].tolist()
+        ]
+
+    def linked_mask(self, table: RunTable) -> numpy.ndarray:
+        """Returns a boolean mask of the runs of a run table which are linked, looked up by their packed ids."""
+
+        ids: bytes = bytes(table.ids)
+        mask: numpy.ndarray = numpy.fromiter(
+            (ids[offset : offset + 16] in self.keys for offset in range(0, len(ids), 16)), dtype=bool, count=len(table)
+        )
+        for index, run_id in table.id_overrides.items():
+            mask[index] = run_id in self
+        return mask
+
+    def save(self, path: str) -> None:
+        """
+        Persists the index (as a NumPy archive), so runs which skip model version discovery (resuming a journal
+        or executing a plan file) can still check linkage.  The persisted index only serves those runs: analysing
+        runs (including incremental ones) rebuild it, as the registry can neither be searched for the versions
+        updated since a point in time nor report the versions deleted since.
+
+        Parameters
+        ----------
+        path: str
+            The path of the index file.
+        """
+
+        temporary_path: str = f"{path}.tmp"
+        with open(temporary_path, mode="wb") as file:
+            numpy.savez(
+                file,
+                link_keys=numpy.frombuffer(self.link_keys, dtype=numpy.uint8),
+                link_models=numpy.frombuffer(self.link_models, dtype=numpy.uint32),
+                link_versions=numpy.frombuffer(self.link_versions, dtype=numpy.int64),
+                model_names=numpy.array(self.model_names, dtype=str),
+                other_links=numpy.array(json.dumps(self.other_links)),
+            )
+        os.replace(temporary_path, path)
+
+    @staticmethod
+    def load(path: str) -> "LinkageIndex":
+        """
+        Loads a persisted index.
+
+        Parameters
+        ----------
+        path: str
+            The path of the index file.
+
+        Returns
+        -------
+        index: LinkageIndex
+            The linkage index.
+        """
+
+        index: LinkageIndex = LinkageIndex()
+        with numpy.load(path, allow_pickle=False) as archive:
+            index.link_keys = bytearray(numpy.asarray(archive["link_keys"], dtype=numpy.uint8).tobytes())
+            index.link_models = array("I", numpy.asarray(archive["link_models"], dtype=numpy.uint32).tobytes())
+            index.link_versions = array("q", numpy.asarray(archive["link_versions"], dtype=numpy.int64).tobytes())
+            index.model_names = [str(name) for name in numpy.asarray(archive["model_names"]).tolist()]
+            index.other_links = {
+                run_id: [tuple(link) for link in links]
+                for run_id, links in json.loads(str(archive["other_links"])).items()
+            }
+        index.model_index = {name: model for model, name in enumerate(index.model_names)}
+        index.keys = {bytes(index.link_keys[offset : offset + 16]) for offset in range(0, len(index.link_keys), 16)}
+        return index
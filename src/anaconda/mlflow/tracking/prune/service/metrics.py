@@ -0,0 +1,274 @@
+""" Defines the Pruning Process Instrumentation """
+
+import json
+import os
+import sys
+from contextlib import contextmanager
+from functools import partial
+from threading import Lock
+from time import perf_counter
+from typing import Any, Iterator, Optional
+
+from .throttle import RequestController
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, where the peak resident set size is not reported
+    resource = None
+
+# Upper bounds (measured in seconds) of the client call latency histogram buckets
+LATENCY_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# A stats record, updated in place by `PruneMetrics`
+# pylint: disable=too-few-public-methods
+class CallStats:
+    """
+    Latency histogram and counts of a single client method.
+
+    Attributes
+    ----------
+    count: int
+        The number of calls.
+    errors: int
+        The number of calls which raised.
+    total: float
+        The summed latency (measured in seconds) of the calls.
+    buckets: list[int]
+        The number of calls per `LATENCY_BUCKETS` upper bound (non cumulative).
+    """
+
+    count: int
+    errors: int
+    total: float
+    buckets: list[int]
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def observe(self, elapsed: float, error: bool) -> None:
+        """Records a single call."""
+
+        self.count += 1
+        self.errors += int(error)
+        self.total += elapsed
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed <= bound:
+                self.buckets[index] += 1
+                break
+
+
+class PruneMetrics:
+    """
+    Pruning Process Metrics
+    Collects the wall time of each pruning phase, the count and latency histogram of each MLFlow client call,
+    and the number of processed entities.  Results are exported as a Prometheus textfile and a JSON summary.
+    """
+
+    def __init__(self):
+        self.lock: Lock = Lock()
+        self.started: float = perf_counter()
+        self.phases: dict[str, float] = {}
+        self.calls: dict[str, CallStats] = {}
+        self.entities: dict[tuple[str, str], int] = {}
+        self.calls_saved: dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Accumulates the wall time of the wrapped block against the named phase."""
+
+        start: float = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed: float = perf_counter() - start
+            with self.lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def observe_call(self, method: str, elapsed: float, error: bool) -> None:
+        """Records a single client call."""
+
+        with self.lock:
+            self.calls.setdefault(method, CallStats()).observe(elapsed=elapsed, error=error)
+
+    def count_entities(self, kind: str, outcome: str, count: int = 1) -> None:
+        """Counts processed entities of the given kind and outcome (e.g. `run`, `deleted`)."""
+
+        with self.lock:
+            self.entities[(kind, outcome)] = self.entities.get((kind, outcome), 0) + count
+
+    def count_saved_calls(self, method: str, count: int) -> None:
+        """Counts the client calls of the given method avoided (e.g. by collapsing per-entity deletions)."""
+
+        with self.lock:
+            self.calls_saved[method] = self.calls_saved.get(method, 0) + count
+
+    @staticmethod
+    def peak_rss() -> Optional[int]:
+        """Returns the peak resident set size (measured in bytes) of the process, `None` where unavailable."""
+
+        if resource is None:
+            return None
+        peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Reported in bytes on macOS and kilobytes elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
+
+    def entities_per_second(self) -> dict[str, float]:
+        """Returns the deletion throughput per entity kind, over the wall time of the delete phase."""
+
+        elapsed: float = self.phases.get("delete", 0.0)
+        if not elapsed:
+            return {}
+        return {kind: count / elapsed for (kind, outcome), count in self.entities.items() if outcome == "deleted"}
+
+    def to_dict(self) -> dict:
+        """Returns a JSON serializable summary of the metrics."""
+
+        with self.lock:
+            return {
+                "elapsed_seconds": perf_counter() - self.started,
+                "phase_seconds": dict(self.phases),
+                "calls": {
+                    method: {
+                        "count": stats.count,
+                        "errors": stats.errors,
+                        "seconds": stats.total,
+                        "mean_seconds": stats.total / stats.count if stats.count else 0.0,
+                    }
+                    for method, stats in self.calls.items()
+                },
+                "calls_saved": dict(self.calls_saved),
+                "entities": {f"{kind}.{outcome}": count for (kind, outcome), count in self.entities.items()},
+                "entities_per_second": self.entities_per_second(),
+                "peak_rss_bytes": PruneMetrics.peak_rss(),
+            }
+
+    def to_prometheus(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format."""
+
+        lines: list[str] = [
+            "# HELP mlflow_prune_phase_seconds Wall time of each pruning phase.",
+            "# TYPE mlflow_prune_phase_seconds gauge",
+        ]
+        with self.lock:
+            lines += [f'mlflow_prune_phase_seconds{{phase="{name}"}} {value}' for name, value in self.phases.items()]
+
+            lines += [
+                "# HELP mlflow_prune_client_call_seconds Latency of MLFlow client calls.",
+                "# TYPE mlflow_prune_client_call_seconds histogram",
+            ]
+            for method, stats in self.calls.items():
+                metric: str = "mlflow_prune_client_call_seconds"
+                cumulative: int = 0
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{method="{method}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{method="{method}",le="+Inf"}} {stats.count}')
+                lines.append(f'{metric}_sum{{method="{method}"}} {stats.total}')
+                lines.append(f'{metric}_count{{method="{method}"}} {stats.count}')
+
+            lines += [
+                "# HELP mlflow_prune_client_call_errors_total MLFlow client calls which raised.",
+                "# TYPE mlflow_prune_client_call_errors_total counter",
+            ]
+            lines += [
+                f'mlflow_prune_client_call_errors_total{{method="{method}"}} {stats.errors}'
+                for method, stats in self.calls.items()
+            ]
+
+            lines += [
+                "# HELP mlflow_prune_client_calls_saved_total MLFlow client calls avoided by the pruning process.",
+                "# TYPE mlflow_prune_client_calls_saved_total counter",
+            ]
+            lines += [
+                f'mlflow_prune_client_calls_saved_total{{method="{method}"}} {count}'
+                for method, count in self.calls_saved.items()
+            ]
+
+            lines += [
+                "# HELP mlflow_prune_entities_total Entities processed by the pruning process.",
+                "# TYPE mlflow_prune_entities_total counter",
+            ]
+            lines += [
+                f'mlflow_prune_entities_total{{kind="{kind}",outcome="{outcome}"}} {count}'
+                for (kind, outcome), count in self.entities.items()
+            ]
+
+            lines += [
+                "# HELP mlflow_prune_entities_per_second Deletion throughput of the pruning process.",
+                "# TYPE mlflow_prune_entities_per_second gauge",
+            ]
+            lines += [
+                f'mlflow_prune_entities_per_second{{kind="{kind}"}} {rate}'
+                for kind, rate in self.entities_per_second().items()
+            ]
+
+        peak_rss: Optional[int] = PruneMetrics.peak_rss()
+        if peak_rss is not None:
+            lines += [
+                "# HELP mlflow_prune_peak_rss_bytes Peak resident set size of the pruning process.",
+                "# TYPE mlflow_prune_peak_rss_bytes gauge",
+                f"mlflow_prune_peak_rss_bytes {peak_rss}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, textfile_path: Optional[str] = None, summary_path: Optional[str] = None) -> None:
+        """
+        Writes the Prometheus textfile and the JSON summary.  Files are replaced atomically so a textfile
+        collector never reads a partial file.
+
+        Parameters
+        ----------
+        textfile_path: Optional[str]
+            The path of the Prometheus textfile.
+        summary_path: Optional[str]
+            The path of the JSON summary.
+        """
+
+        for path, content in (
+            (textfile_path, self.to_prometheus),
+            (summary_path, lambda: json.dumps(self.to_dict(), indent=2)),
+        ):
+            if path:
+                with open(f"{path}.tmp", mode="w", encoding="utf-8") as file:
+                    file.write(content())
+                os.replace(f"{path}.tmp", path)
+
+
+# The wrapped client's methods are reached through `__getattr__`
+# pylint: disable=too-few-public-methods
+class InstrumentedClient:
+    """
+    MLFlow Client Proxy
+    Delegates to the wrapped client, recording the count and latency of each method call.  When a
+    `controller` is provided, calls are made through it (see `RequestController`) and each attempt is recorded.
+    """
+
+    def __init__(self, client: Any, metrics: PruneMetrics, controller: Optional[RequestController] = None):
+        self.client = client
+        self.metrics = metrics
+        self.controller = controller
+
+    def __getattr__(self, name: str) -> Any:
+        attribute: Any = getattr(self.client, name)
+        if not callable(attribute):
+            return attribute
+
+        def instrumented(*args, **kwargs) -> Any:
+            start: float = perf_counter()
+            error: bool = False
+            try:
+                return attribute(*args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                self.metrics.observe_call(method=name, elapsed=perf_counter() - start, error=error)
+
+        if self.controller is not None:
+            return lambda *args, **kwargs: self.controller.call(partial(instrumented, *args, **kwargs))
+        return instrumented
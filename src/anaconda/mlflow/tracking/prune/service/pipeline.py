@@ -0,0 +1,113 @@
+""" Defines the Pipelined Pruning Engine """
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Empty, Queue
+from threading import Event
+from typing import Iterator, Optional
+
+from mlflow.entities import Experiment, Run, ViewType
+from mlflow.entities.model_registry import ModelVersion
+
+from ..dto.prune_result import PruneResult
+from .client import PruneClient
+
+
+# pylint: disable=too-few-public-methods
+class PipelinedEngine:
+    """
+    Pipelined Pruning Engine
+    Runs the pruning process as a pipeline, overlapping discovery with deletion.  Model versions and stale runs
+    are discovered concurrently on background threads.  Stale run pages flow through a bounded queue (of
+    `queue_size` pages, blocking run discovery while deletion falls behind) into the pruneability checks and on
+    to the deletion workers.
+
+    Runs are only released for deletion once the model version linkage is complete, and model versions are only
+    deleted then too (so the model version search offsets are not shifted while paging).
+
+    Attributes
+    ----------
+    queue_size: int
+        The number of stale run pages buffered between discovery and deletion.
+    """
+
+    queue_size: int
+
+    def __init__(self, queue_size: int = 4):
+        self.queue_size = queue_size
+
+    def prune(self, pruner: PruneClient, dry_run: bool) -> PruneResult:
+        """
+        Performs the MLFlow Tracking Server Pruning Process as a pipeline.
+
+        Parameters
+        ----------
+        pruner: PruneClient
+            The pruning client.
+        dry_run: bool
+            When `True` resources are only reported.
+
+        Returns
+        -------
+        result: PruneResult
+            The deletion accounting (empty for a dry run).
+        """
+
+        # Deleting runs while paging through `ACTIVE_ONLY` results would shift the server side offsets
+        # and skip runs, so when deleting we page over all runs and drop the inactive ones client side.
+        run_view_type: int = ViewType.ACTIVE_ONLY if dry_run else ViewType.ALL
+        pages: Queue = Queue(maxsize=self.queue_size)
+        cancelled: Event = Event()
+
+        def discover_runs() -> None:
+            try:
+                with pruner.metrics.phase("experiments"):
+                    experiments: list[Experiment] = pruner.get_experiments()
+                experiment_ids: list[str] = [experiment.experiment_id for experiment in experiments]
+                print(f"Pipelining experiments {experiment_ids} for stale runs")
+                for page in pruner.iter_stale_runs(experiment_ids=experiment_ids, run_view_type=run_view_type):
+                    if cancelled.is_set():
+                        return
+                    pages.put(page)
+            finally:
+                pages.put(None)
+
+        def pruneable_runs() -> Iterator[Run]:
+            stale_count: int = 0
+            pruneable_count: int = 0
+            while True:
+                page: Optional[list[Run]] = pages.get()
+                if page is None:
+                    break
+                pruneable_page: list[Run] = pruner.get_pruneable_page(
+                    runs=page, model_versions=[], linked_run_ids=pruner.linkage_index
+                )
+                stale_count += len(page)
+                pruneable_count += len(pruneable_page)
+                yield from pruneable_page
+            print(f"{pruneable_count} of {stale_count} pipelined stale runs are pruneable")
+
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="prune-discovery") as executor:
+            runs_future: Future = executor.submit(discover_runs)
+            try:
+                # Wait for the model version linkage to be complete
+                prunable_model_versions: list[ModelVersion] = executor.submit(pruner.discover_pruneable_models).result()
+
+                print("[START] Stale Model Pruning")
+                result: PruneResult = pruner.prune_models(models=prunable_model_versions, dry_run=dry_run)
+                print("[COMPLETE] Stale Model Pruning")
+
+                print("[START] Stale Run Pruning")
+                result.merge(pruner.prune_runs(runs=pruneable_runs(), dry_run=dry_run))
+                print("[COMPLETE] Stale Run Pruning")
+            finally:
+                # Unblock (and stop) the run discovery if the pipeline did not drain it
+                cancelled.set()
+                while not runs_future.done():
+                    try:
+                        pages.get(timeout=0.1)
+                    except Empty:
+                        pass
+            runs_future.result()
+
+        pruner.decision_log.summary()
+        return result
@@ -0,0 +1,246 @@
+""" Defines the Portable Prune Plan File """
+
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from time import time
+from typing import Any, Iterable, Iterator, Optional, Union
+
+from ..dto.pruneable import Pruneable
+from ..dto.records import ModelVersionRecord, RunRecord, RunTable
+
+PLAN_MAGIC: bytes = b"MLFPLAN\x00"
+PLAN_VERSION: int = 1
+PLAN_BLOCK_SIZE: int = 65536
+
+# Preamble: magic, format version.  Trailer: footer length, magic.
+PREAMBLE: struct.Struct = struct.Struct("<8sH")
+TRAILER: struct.Struct = struct.Struct("<Q8s")
+
+
+class PlanSection:
+    """
+    Plan Section
+    A re-iterable view of one kind of entity in a plan file, decompressing a single block at a time.
+    """
+
+    def __init__(self, plan: "PrunePlan", kind: str):
+        self.plan = plan
+        self.kind = kind
+
+    def __len__(self) -> int:
+        return sum(block["count"] for block in self.plan.footer["blocks"] if block["kind"] == self.kind)
+
+    def __iter__(self) -> Iterator[Union[RunRecord, ModelVersionRecord]]:
+        for block in self.plan.footer["blocks"]:
+            if block["kind"] == self.kind:
+                yield from self.plan.read_block(block)
+
+
+class PrunePlan:
+    """
+    Portable Prune Plan
+    A versioned binary file holding a computed `Pruneable`, so the plan reviewed with `Report` is exactly the
+    plan executed by `Prune`, without a second scan.
+
+    The file is a preamble (magic and format version), followed by blocks of at most `PLAN_BLOCK_SIZE`
+    entities, followed by a JSON footer (the plan properties and block index) and a trailer.  Run blocks are
+    the zlib compressed columns of a `RunTable`; model version blocks are compressed JSON rows.  The file is
+    memory-mapped when read and entities are streamed one block at a time.
+
+    Attributes
+    ----------
+    path: str
+        The path of the plan file.
+    footer: dict
+        The plan properties (cutoff, ttl, tracking_uri, created, registered_models) and block index.
+    """
+
+    path: str
+    footer: dict
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, mode="rb") as file:
+            self.mapping: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version = PREAMBLE.unpack_from(self.mapping, 0)
+        if magic != PLAN_MAGIC:
+            raise ValueError(f"{path} is not a prune plan file")
+        if version != PLAN_VERSION:
+            raise ValueError(f"Prune plan format version {version} is not supported (expected {PLAN_VERSION})")
+        footer_length, trailer_magic = TRAILER.unpack_from(self.mapping, len(self.mapping) - TRAILER.size)
+        if trailer_magic != PLAN_MAGIC:
+            raise ValueError(f"Prune plan {path} is truncated")
+        footer_offset: int = len(self.mapping) - TRAILER.size - footer_length
+        self.footer = json.loads(self.mapping[footer_offset : footer_offset + footer_length])
+
+        self.runs: PlanSection = PlanSection(plan=self, kind="run")
+        self.models: PlanSection = PlanSection(plan=self, kind="model_version")
+        self.registered_models: list[str] = self.footer.get("registered_models", [])
+
+    @staticmethod
+    # A plan file records the cut-off, TTL and server it was computed against
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def write(
+        path: str,
+        pruneables: Pruneable,
+        cutoff: float,
+        ttl: int,
+        tracking_uri: str,
+        block_size: int = PLAN_BLOCK_SIZE,
+    ) -> None:
+        """
+        Writes a plan file (atomically replacing any existing file).
+
+        Parameters
+        ----------
+        path: str
+            The path of the plan file.
+        pruneables: Pruneable
+            The computed plan.
+        cutoff: float
+            The stale cut-off the plan was computed with.
+        ttl: int
+            The entity TTL (measured in days) the plan was computed with.
+        tracking_uri: str
+            The MLFlow Tracking Server URI the plan was computed against.
+        block_size: int
+            The maximum number of entities in a block.
+        """
+
+        blocks: list[dict] = []
+        with open(f"{path}.tmp", mode="wb") as file:
+            file.write(PREAMBLE.pack(PLAN_MAGIC, PLAN_VERSION))
+
+            def write_block(kind: str, count: int, columns: list[bytes]) -> None:
+                extents: list[list[int]] = []
+                for column in columns:
+                    compressed: bytes = zlib.compress(column)
+                    extents.append([file.tell(), len(compressed)])
+                    file.write(compressed)
+                blocks.append({"kind": kind, "count": count, "columns": extents})
+
+            for chunk in PrunePlan.chunk(pruneables.models, block_size):
+                rows: list[list] = [[model.name, str(model.version), model.last_updated_timestamp] for model in chunk]
+                write_block(kind="model_version", count=len(rows), columns=[json.dumps(rows).encode("utf-8")])
+
+            for chunk in PrunePlan.chunk(pruneables.runs, block_size):
+                table: RunTable = RunTable(chunk)
+                lookups: dict = {
+                    "experiment_ids": table.experiment_ids,
+                    "artifact_roots": table.artifact_roots,
+                    "status_values": table.status_values,
+                    "id_overrides": table.id_overrides,
+                    "artifact_overrides": table.artifact_overrides,
+                }
+                write_block(
+                    kind="run",
+                    count=len(table),
+                    columns=[
+                        bytes(table.ids),
+                        table.end_times.tobytes(),
+                        table.experiments.tobytes(),
+                        bytes(table.statuses),
+                        json.dumps(lookups).encode("utf-8"),
+                    ],
+                )
+
+            footer: bytes = json.dumps(
+                {
+                    "cutoff": cutoff,
+                    "ttl": ttl,
+                    "tracking_uri": tracking_uri,
+                    "created": round(time() * 1000),
+                    "byteorder": sys.byteorder,
+                    "registered_models": list(pruneables.registered_models),
+                    "blocks": blocks,
+                }
+            ).encode("utf-8")
+            file.write(footer)
+            file.write(TRAILER.pack(len(footer), PLAN_MAGIC))
+
+        # Publish the completed plan atomically
+        os.replace(f"{path}.tmp", path)
+
+    @staticmethod
+    def chunk(entities: Iterable[Any], size: int) -> Iterator[list[Any]]:
+        """Groups entities into lists of at most `size` entities."""
+
+        chunk: list[Any] = []
+        for entity in entities:
+            chunk.append(entity)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def column(self, extent: list[int]) -> bytes:
+        """Decompresses a column of a block, given its (offset, length) extent in the file."""
+
+        offset, length = extent
+        return zlib.decompress(self.mapping[offset : offset + length])
+
+    def read_block(self, block: dict) -> Iterator[Union[RunRecord, ModelVersionRecord]]:
+        """Decompresses and streams the entities of a block."""
+
+        if block["kind"] == "model_version":
+            for name, version, last_updated_timestamp in json.loads(self.column(block["columns"][0])):
+                yield ModelVersionRecord(name=name, version=version, last_updated_timestamp=last_updated_timestamp)
+            return
+
+        ids, end_times, experiments, statuses, lookups = (self.column(extent) for extent in block["columns"])
+        table: RunTable = RunTable()
+        table.ids = bytearray(ids)
+        table.end_times = array("q", end_times)
+        table.experiments = array("I", experiments)
+        if self.footer["byteorder"] != sys.byteorder:
+            table.end_times.byteswap()
+            table.experiments.byteswap()
+        table.statuses = bytearray(statuses)
+        lookups: dict = json.loads(lookups)
+        table.experiment_ids = lookups["experiment_ids"]
+        table.artifact_roots = lookups["artifact_roots"]
+        table.status_values = lookups["status_values"]
+        table.experiment_index = {experiment_id: index for index, experiment_id in enumerate(table.experiment_ids)}
+        table.status_index = {status: index for index, status in enumerate(table.status_values)}
+        table.id_overrides = {int(index): run_id for index, run_id in lookups["id_overrides"].items()}
+        table.artifact_overrides = {int(index): uri for index, uri in lookups["artifact_overrides"].items()}
+        yield from table
+
+    def validate(self, cutoff: float, ttl: int, tracking_uri: str, max_age: Optional[int] = None) -> None:
+        """
+        Rejects (raising `ValueError`) a plan which does not match the current run.  The plan must have been
+        computed against the same server with the same TTL, its cut-off must not be later than the current
+        cut-off, and (when `max_age` is provided) its cut-off must not be older than `max_age` milliseconds.
+
+        Parameters
+        ----------
+        cutoff: float
+            The stale cut-off of the current run.
+        ttl: int
+            The entity TTL (measured in days) of the current run.
+        tracking_uri: str
+            The MLFlow Tracking Server URI of the current run.
+        max_age: Optional[int]
+            The maximum age (measured in milliseconds) of the plan's cut-off.
+        """
+
+        if self.footer["tracking_uri"] != tracking_uri:
+            raise ValueError(f"Prune plan was computed against {self.footer['tracking_uri']}, not {tracking_uri}")
+        if self.footer["ttl"] != ttl:
+            raise ValueError(f"Prune plan TTL {self.footer['ttl']} does not match {ttl}")
+        if self.footer["cutoff"] > cutoff:
+            raise ValueError(f"Prune plan cut-off {self.footer['cutoff']} is later than {cutoff}")
+        if max_age is not None and cutoff - self.footer["cutoff"] > max_age:
+            raise ValueError(f"Prune plan cut-off {self.footer['cutoff']} is older than the allowed maximum age")
+
+    def close(self) -> None:
+        """Unmaps the plan file."""
+
+        self.mapping.close()
@@ -0,0 +1,287 @@
+""" Defines the Declarative Retention Policy """
+
+from array import array
+from typing import Any, Iterable, Optional
+
+import numpy
+import yaml
+from mlflow.entities import Run
+from mlflow.entities.model_registry import ModelVersion
+
+from ..dto.records import MISSING_END_TIME, RunTable
+
+# Milliseconds per day
+DAY: int = 24 * 60 * 60 * 1000
+
+# Statuses of runs which are considered for pruning when a policy does not list any
+DEFAULT_RUN_STATUSES: tuple[str, ...] = ("FINISHED", "FAILED")
+
+# Cut-off of the statuses without a status specific TTL (no end time is older)
+NO_CUTOFF: int = numpy.iinfo(numpy.int64).min
+
+
+class RetentionPolicy:
+    """
+    Retention Policy
+    Declarative retention rules, replacing the single global TTL.  A policy file (YAML or JSON) may define:
+
+    ```yaml
+    statuses: [FINISHED, FAILED]  # The run statuses considered for pruning
+    status_ttls:                  # TTLs (in days) of run statuses, e.g. KILLED runs (implies the status)
+      KILLED: 7
+    experiment_ttls:              # TTLs (in days) of the runs of an experiment, by experiment id
+      "12": 365
+    model_ttls:                   # TTLs (in days) of the versions of a registered model, by name
+      churn-classifier: 90
+    exempt_tags:                  # Runs and model versions with any of these tags are never pruned
+      retain: "true"
+    ```
+
+    Entities not covered by a rule use the default TTL (`MLFLOW_TRACKING_ENTITY_TTL`).  A run is stale once it
+    is older than the shorter of its experiment and status TTLs.
+
+    Candidates are evaluated as a whole (over the columns of a `RunTable`) with NumPy, rather than by per entity
+    branching.
+
+    Attributes
+    ----------
+    ttl: int
+        The default TTL (measured in days).
+    statuses: tuple[str, ...]
+        The run statuses considered for pruning.
+    status_ttls: dict[str, int]
+        The TTL (measured in days) by run status.
+    experiment_ttls: dict[str, int]
+        The run TTL (measured in days) by experiment id.
+    model_ttls: dict[str, int]
+        The model version TTL (measured in days) by registered model name.
+    exempt_tags: dict[str, str]
+        The tags exempting a run or model version from pruning.
+    """
+
+    ttl: int
+    statuses: tuple[str, ...]
+    status_ttls: dict[str, int]
+    experiment_ttls: dict[str, int]
+    model_ttls: dict[str, int]
+    exempt_tags: dict[str, str]
+
+    # A policy is built from each of its rules
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        ttl: int,
+        statuses: Iterable[str] = DEFAULT_RUN_STATUSES,
+        status_ttls: Optional[dict[str, int]] = None,
+        experiment_ttls: Optional[dict[str, int]] = None,
+        model_ttls: Optional[dict[str, int]] = None,
+        exempt_tags: Optional[dict[str, str]] = None,
+    ):
+        self.ttl = ttl
+        self.status_ttls = {str(status): int(days) for status, days in (status_ttls or {}).items()}
+        self.statuses = tuple(dict.fromkeys([*statuses, *self.status_ttls]))
+        self.experiment_ttls = {
+            str(experiment_id): int(days) for experiment_id, days in (experiment_ttls or {}).items()
+        }
+        self.model_ttls = {str(name): int(days) for name, days in (model_ttls or {}).items()}
+        # Unquoted YAML booleans are matched as the lower case tag values MLFlow records
+        self.exempt_tags = {
+            str(key): str(value).lower() if isinstance(value, bool) else str(value)
+            for key, value in (exempt_tags or {}).items()
+        }
+
+    @staticmethod
+    def from_file(path: str, ttl: int) -> "RetentionPolicy":
+        """
+        Loads a policy file.
+
+        Parameters
+        ----------
+        path: str
+            The path of the policy file (YAML or JSON).
+        ttl: int
+            The default TTL (measured in days).
+
+        Returns
+        -------
+        policy: RetentionPolicy
+            The retention policy.
+        """
+
+        with open(path, mode="r", encoding="utf-8") as file:
+            document: Any = yaml.safe_load(file) or {}
+        if not isinstance(document, dict):
+            raise ValueError(f"Retention policy {path} must be a mapping")
+        unknown: set[str] = set(document) - {"statuses", "status_ttls", "experiment_ttls", "model_ttls", "exempt_tags"}
+        if unknown:
+            raise ValueError(f"Retention policy {path} has unknown keys: {sorted(unknown)}")
+        return RetentionPolicy(ttl=ttl, **document)
+
+    def run_cutoff(self, now: float) -> float:
+        """
+        Returns the most recent cut-off of any run rule, which server side stale run queries are made with
+        (the candidates are then narrowed by `evaluate_runs`).
+        """
+
+        return now - min([self.ttl, *self.experiment_ttls.values(), *self.status_ttls.values()]) * DAY
+
+    def is_exempt(self, tags: Optional[dict[str, str]]) -> bool:
+        """Returns `True` if the tags exempt an entity from pruning."""
+
+        return bool(tags) and any(tags.get(key) == value for key, value in self.exempt_tags.items())
+
+    def drop_exempt_runs(self, runs: list[Run]) -> list[Run]:
+        """Returns the runs which are not exempted by their tags."""
+
+        if not self.exempt_tags:
+            return runs
+        return [run for run in runs if not self.is_exempt(run.data.tags if run.data is not None else None)]
+
+    def evaluate_runs(self, table: RunTable, now: float) -> numpy.ndarray:
+        """
+        Evaluates the run rules over the columns of a run table.
+
+        Parameters
+        ----------
+        table: RunTable
+            The candidate runs.
+        now: float
+            The time (measured in milliseconds) the TTLs are relative to.
+
+        Returns
+        -------
+        mask: numpy.ndarray
+            A boolean mask of the runs which are pruneable.
+        """
+
+        end_times: numpy.ndarray = numpy.frombuffer(table.end_times, dtype=numpy.int64)
+        experiments: numpy.ndarray = numpy.frombuffer(table.experiments, dtype=numpy.uint32)
+        statuses: numpy.ndarray = numpy.frombuffer(table.statuses, dtype=numpy.uint8)
+
+        # Per experiment and per status cut-offs, gathered by the code columns
+        experiment_cutoffs: numpy.ndarray = numpy.array(
+            [now - self.experiment_ttls.get(experiment_id, self.ttl) * DAY for experiment_id in table.experiment_ids],
+            dtype=numpy.int64,
+        ).reshape(-1)
+        status_cutoffs: numpy.ndarray = numpy.array(
+            [
+                now - self.status_ttls[status] * DAY if status in self.status_ttls else NO_CUTOFF
+                for status in table.status_values
+            ],
+            dtype=numpy.int64,
+        ).reshape(-1)
+        candidate_statuses: numpy.ndarray = numpy.array(
+            [status in self.statuses for status in table.status_values], dtype=bool
+        ).reshape(-1)
+
+        cutoffs: numpy.ndarray = numpy.maximum(experiment_cutoffs[experiments], status_cutoffs[statuses])
+        return candidate_statuses[statuses] & (end_times != MISSING_END_TIME) & (end_times < cutoffs)
+
+    def evaluate_model_versions(self, versions: list[ModelVersion], now: float) -> numpy.ndarray:
+        """
+        Evaluates the model version rules (the version has no stage set, is older than its model's TTL and is
+        not exempted by its tags).
+
+        Parameters
+        ----------
+        versions: list[ModelVersion]
+            The candidate model versions.
+        now: float
+            The time (measured in milliseconds) the TTLs are relative to.
+
+        Returns
+        -------
+        mask: numpy.ndarray
+            A boolean mask of the model versions which are pruneable.
+        """
+
+        count: int = len(versions)
+        names: dict[str, int] = {}
+        models: numpy.ndarray = numpy.fromiter(
+            (names.setdefault(version.name, len(names)) for version in versions), dtype=numpy.uint32, count=count
+        )
+        timestamps: numpy.ndarray = numpy.fromiter(
+            (version.last_updated_timestamp for version in versions), dtype=numpy.int64, count=count
+        )
+        unstaged: numpy.ndarray = numpy.fromiter(
+            (version.current_stage == "None" for version in versions), dtype=bool, count=count
+        )
+        model_cutoffs: numpy.ndarray = numpy.array(
+            [now - self.model_ttls.get(name, self.ttl) * DAY for name in names], dtype=numpy.int64
+        ).reshape(-1)
+
+        mask: numpy.ndarray = unstaged & (timestamps < model_cutoffs[models])
+        if self.exempt_tags:
+            mask &= numpy.fromiter(
+                (not self.is_exempt(getattr(version, "tags", None)) for version in versions), dtype=bool, count=count
+            )
+        return mask
+
+    @staticmethod
+    def select_runs(table: RunTable, mask: numpy.ndarray) -> RunTable:
+        """Returns a new table of the runs selected by the mask."""
+
+        return take_runs(table=table, positions=numpy.flatnonzero(mask))
+
+    def pruneable_runs(self, runs: list[Run], now: float) -> list[Run]:
+        """
+        Returns the runs which are pruneable under the policy, as a `RunTable` when given one.
+
+        Parameters
+        ----------
+        runs: list[Run]
+            The stale runs, queried with the policy's most recent cut-off.
+        now: float
+            The time (measured in milliseconds) the TTLs are relative to.
+
+        Returns
+        -------
+        runs: list[Run]
+            The runs which are pruneable.
+        """
+
+        table: RunTable = runs if isinstance(runs, RunTable) else RunTable(runs)
+        mask: numpy.ndarray = self.evaluate_runs(table=table, now=now)
+        if isinstance(runs, RunTable):
+            return RetentionPolicy.select_runs(table=runs, mask=mask)
+        return [run for run, pruneable in zip(runs, mask) if pruneable]
+
+
+def take_runs(table: RunTable, positions: numpy.ndarray) -> RunTable:
+    """
+    Returns a new table of the runs at the given positions, in the order given.
+
+    Parameters
+    ----------
+    table: RunTable
+        The runs to take from.
+    positions: numpy.ndarray
+        The positions of the runs to take.
+
+    Returns
+    -------
+    table: RunTable
+        The taken runs.
+    """
+
+    taken: RunTable = RunTable()
+    taken.experiment_ids = list(table.experiment_ids)
+    taken.experiment_index = dict(table.experiment_index)
+    taken.artifact_roots = list(table.artifact_roots)
+    taken.status_values = list(table.status_values)
+    taken.status_index = dict(table.status_index)
+    taken.ids = bytearray(numpy.frombuffer(table.ids, dtype=numpy.uint8).reshape(-1, 16)[positions].tobytes())
+    taken.end_times = array("q", numpy.frombuffer(table.end_times, dtype=numpy.int64)[positions].tobytes())
+    taken.experiments = array("I", numpy.frombuffer(table.experiments, dtype=numpy.uint32)[positions].tobytes())
+    taken.statuses = bytearray(numpy.frombuffer(table.statuses, dtype=numpy.uint8)[positions].tobytes())
+
+    # Re-index the (sparse) overrides to their new positions
+    if table.id_overrides or table.artifact_overrides:
+        position_of: dict[int, int] = {int(index): position for position, index in enumerate(positions)}
+        taken.id_overrides = {
+            position_of[index]: run_id for index, run_id in table.id_overrides.items() if index in position_of
+        }
+        taken.artifact_overrides = {
+            position_of[index]: uri for index, uri in table.artifact_overrides.items() if index in position_of
+        }
+    return taken
@@ -0,0 +1,123 @@
+""" Defines the Best Run Retention """
+
+import json
+import math
+from heapq import heappush, heapreplace
+from typing import Any, Iterable, Optional
+
+from mlflow.entities import ViewType
+
+
+class BestRunRetention:
+    """
+    Best Run Retention
+    Exempts the best `keep` runs of each experiment (ranked by a metric) from pruning, however old they are.
+
+    Each experiment's runs are streamed a page at a time through a bounded heap of at most `keep` entries, so only
+    the ranking is held (never every run's metrics).  When `server_order` is set the search is ordered by the metric
+    on the server (runs without the metric sort last), and only the first `keep` runs are read.
+
+    Attributes
+    ----------
+    metric: str
+        The metric runs are ranked by.
+    keep: int
+        The number of runs to keep per experiment.
+    maximize: bool
+        When `True` the highest metric values are the best, otherwise the lowest.
+    server_order: bool
+        When `True` the ranking is pushed to the server with `order_by`.
+    """
+
+    metric: str
+    keep: int
+    maximize: bool
+    server_order: bool
+
+    def __init__(self, metric: str, keep: int, maximize: bool = True, server_order: bool = True):
+        self.metric = metric
+        self.keep = keep
+        self.maximize = maximize
+        self.server_order = server_order
+        self.ranked: dict[str, set[str]] = {}
+
+    def config_key(self) -> str:
+        """Returns the key of the ranking configuration the experiment digests are evaluated with."""
+
+        return json.dumps({"metric": self.metric, "keep": self.keep, "maximize": self.maximize}, sort_keys=True)
+
+    def order_by(self) -> list[str]:
+        """Returns the server side ordering of runs, best first."""
+
+        return [f"metrics.`{self.metric}` {'DESC' if self.maximize else 'ASC'}"]
+
+    def rank(self, client: Any, experiment_id: str, page_size: int) -> set[str]:
+        """
+        Returns the ids of the best runs of an experiment, in a single pass over its runs.
+
+        Parameters
+        ----------
+        client: Any
+            The MLFlow client to search runs with.
+        experiment_id: str
+            The experiment to rank.
+        page_size: int
+            The number of runs per page when the ranking is not pushed to the server.
+
+        Returns
+        -------
+        run_ids: set[str]
+            The ids of (at most `keep`) best runs.
+        """
+
+        heap: list[tuple[float, str]] = []
+        page_token: Optional[str] = None
+        while True:
+            page = client.search_runs(
+                experiment_ids=[experiment_id],
+                filter_string="",
+                run_view_type=ViewType.ACTIVE_ONLY,
+                max_results=self.keep if self.server_order else page_size,
+                order_by=self.order_by() if self.server_order else None,
+                page_token=page_token,
+            )
+            for run in page:
+                value: Optional[float] = run.data.metrics.get(self.metric) if run.data is not None else None
+                if value is None or math.isnan(value):
+                    continue
+                entry: tuple[float, str] = (value if self.maximize else -value, run.info.run_id)
+                if len(heap) < self.keep:
+                    heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapreplace(heap, entry)
+
+            page_token = getattr(page, "token", None)
+            if self.server_order or not page_token:
+                break
+        return {run_id for _, run_id in heap}
+
+    def best_run_ids(self, client: Any, experiment_ids: Iterable[str], page_size: int) -> set[str]:
+        """
+        Returns the ids of the best runs of each of the experiments.  Experiments are ranked once per prune.
+
+        Parameters
+        ----------
+        client: Any
+            The MLFlow client to search runs with.
+        experiment_ids: Iterable[str]
+            The experiments to rank.
+        page_size: int
+            The number of runs per page when the ranking is not pushed to the server.
+
+        Returns
+        -------
+        run_ids: set[str]
+            The ids of the best runs.
+        """
+
+        run_ids: set[str] = set()
+        for experiment_id in experiment_ids:
+            if experiment_id not in self.ranked:
+                self.ranked[experiment_id] = self.rank(client=client, experiment_id=experiment_id, page_size=page_size)
+            run_ids |= self.ranked[experiment_id]
+        return run_ids
@@ -0,0 +1,318 @@
+""" Defines the Asynchronous MLFlow REST Engine """
+
+import asyncio
+import os
+from functools import partial
+from time import perf_counter
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+import httpx
+from ae5_tools import demand_env_var
+from mlflow.exceptions import MlflowException, RestException
+from mlflow.protos.databricks_pb2 import INTERNAL_ERROR, REQUEST_LIMIT_EXCEEDED, TEMPORARILY_UNAVAILABLE
+
+from ..dto.prune_result import PruneResult
+from ..dto.records import ModelVersionRecord, RunRecord
+from .client import PruneClient
+from .linkage import LinkageIndex
+
+API_PREFIX: str = "/api/2.0/mlflow"
+
+
+class AsyncRestEngine:
+    """
+    Asynchronous MLFlow REST Engine
+    Speaks the MLFlow REST API directly, overlapping discovery pagination and deletions on a single event loop.
+    Requests are made with an asynchronous HTTP client holding a pool of `concurrency` keep-alive connections,
+    so at most `concurrency` requests are in flight.  The event loop and connection pool are kept until the
+    engine is closed.
+
+    Attributes
+    ----------
+    tracking_uri: str
+        The MLFlow Tracking Server URI.
+    token: Optional[str]
+        The bearer token sent with each request.
+    concurrency: int
+        The number of concurrent requests (and pooled connections).
+    timeout: float
+        The per-request timeout (in seconds).
+    """
+
+    tracking_uri: str
+    token: Optional[str]
+    concurrency: int
+    timeout: float
+
+    def __init__(self, tracking_uri: str, token: Optional[str] = None, concurrency: int = 8, timeout: float = 120.0):
+        self.tracking_uri = tracking_uri.rstrip("/")
+        self.token = token
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self.http: httpx.AsyncClient = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {token}"} if token else None,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            timeout=timeout,
+        )
+
+    @staticmethod
+    def from_environment(concurrency: int = 8) -> "AsyncRestEngine":
+        """Builds an engine from the `MLFLOW_TRACKING_URI` and (optional) `MLFLOW_TRACKING_TOKEN` variables."""
+
+        return AsyncRestEngine(
+            tracking_uri=demand_env_var(name="MLFLOW_TRACKING_URI"),
+            token=os.environ.get("MLFLOW_TRACKING_TOKEN"),
+            concurrency=concurrency,
+        )
+
+    async def send(self, method: str, endpoint: str, payload: dict) -> dict:
+        """Sends a request to an MLFlow REST endpoint, raising `MlflowException` on failure."""
+
+        url: str = f"{self.tracking_uri}{API_PREFIX}/{endpoint}"
+        try:
+            if method == "GET":
+                response: httpx.Response = await self.http.get(url, params=payload)
+            else:
+                response: httpx.Response = await self.http.request(method, url, json=payload)
+        except httpx.HTTPError as error:
+            raise MlflowException(
+                f"API request to endpoint {endpoint} failed: {error}", error_code=TEMPORARILY_UNAVAILABLE
+            ) from error
+
+        if response.status_code == 200:
+            return response.json() if response.content else {}
+        try:
+            body: dict = response.json()
+        except ValueError:
+            body: dict = {}
+        if "error_code" in body:
+            raise RestException(body)
+        raise MlflowException(
+            f"API request to endpoint {endpoint} failed with error code {response.status_code} != 200",
+            error_code=REQUEST_LIMIT_EXCEEDED if response.status_code == 429 else INTERNAL_ERROR,
+        )
+
+    async def request(self, pruner: PruneClient, method: str, endpoint: str, payload: dict) -> dict:
+        """Sends a request (through the pruner's controller, if set), recording the latency of each attempt."""
+
+        call: Callable[[], Awaitable[dict]] = partial(self.send, method, endpoint, payload)
+
+        async def instrumented() -> dict:
+            start: float = perf_counter()
+            error: bool = False
+            try:
+                return await call()
+            except Exception:
+                error = True
+                raise
+            finally:
+                pruner.metrics.observe_call(method=endpoint, elapsed=perf_counter() - start, error=error)
+
+        if pruner.controller is not None:
+            return await pruner.controller.call_async(instrumented)
+        return await instrumented()
+
+    async def paginate(
+        self, pruner: PruneClient, method: str, endpoint: str, payload: dict, key: str
+    ) -> AsyncIterator[list[dict]]:
+        """Yields the pages of a paginated search endpoint."""
+
+        page_token: Optional[str] = None
+        while True:
+            response: dict = await self.request(
+                pruner=pruner,
+                method=method,
+                endpoint=endpoint,
+                payload={**payload, **({"page_token": page_token} if page_token else {})},
+            )
+            yield response.get(key, [])
+
+            page_token = response.get("next_page_token")
+            if not page_token:
+                break
+
+    @staticmethod
+    def parse_run(document: dict) -> RunRecord:
+        """Builds a `RunRecord` from its REST representation."""
+
+        info: dict = document["info"]
+        return RunRecord(
+            run_id=info["run_id"],
+            experiment_id=info["experiment_id"],
+            end_time=int(info["end_time"]) if info.get("end_time") is not None else None,
+            status=info["status"],
+            artifact_uri=info.get("artifact_uri"),
+            lifecycle_stage=info.get("lifecycle_stage", "active"),
+        )
+
+    @staticmethod
+    def parse_model_version(document: dict) -> ModelVersionRecord:
+        """Builds a `ModelVersionRecord` from its REST representation."""
+
+        return ModelVersionRecord(
+            name=document["name"],
+            version=str(document["version"]),
+            last_updated_timestamp=int(document["last_updated_timestamp"]),
+            current_stage=document.get("current_stage", "None"),
+            run_id=document.get("run_id") or None,
+        )
+
+    # The state of the concurrent discovery and deletion tasks is shared on the event loop
+    # pylint: disable-next=too-many-locals
+    async def run_prune(self, pruner: PruneClient, dry_run: bool) -> PruneResult:
+        """
+        Performs the pruning process on the event loop.
+        Model versions are discovered first, and no deletions are started until every version has been paged
+        (the model version search uses offset based page tokens, so deleting versions while paging would skip
+        versions, and with them run linkage).  Then the stale run searches of each status page concurrently
+        while a pool of deleters consumes the bounded work queue.
+
+        Parameters
+        ----------
+        pruner: PruneClient
+            The pruning client providing the cut-off, pruneability decisions and accounting.
+        dry_run: bool
+            When `True` resources are only reported.
+
+        Returns
+        -------
+        result: PruneResult
+            The deletion accounting (empty for a dry run).
+        """
+
+        result: PruneResult = PruneResult()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def deleter() -> None:
+            while True:
+                kind, entity_id, endpoint, method, payload = await queue.get()
+                try:
+                    await self.request(pruner=pruner, method=method, endpoint=endpoint, payload=payload)
+                except Exception as error:  # pylint: disable=broad-except
+                    pruner.record_deletion(result, kind, entity_id, error)
+                else:
+                    pruner.record_deletion(result, kind, entity_id, None)
+                finally:
+                    queue.task_done()
+
+        async def submit(kind: str, entity_id: str, message_dict: dict, request: tuple[str, str, dict]) -> None:
+            if dry_run:
+                pruner.decision_log.action("dry_run", kind=kind, **message_dict)
+                return
+            pruner.decision_log.action("delete", kind=kind, **message_dict)
+            await queue.put((kind, entity_id, *request))
+
+        # Model Versions (fully paged, building the run linkage, before anything is deleted)
+        linked_run_ids: LinkageIndex = LinkageIndex()
+        pruneable_versions: list[ModelVersionRecord] = []
+        async for page in self.paginate(
+            pruner=pruner,
+            method="GET",
+            endpoint="model-versions/search",
+            payload={"max_results": pruner.page_size},
+            key="model_versions",
+        ):
+            versions: list[ModelVersionRecord] = [AsyncRestEngine.parse_model_version(document) for document in page]
+            linked_run_ids.add(versions)
+            pruneable_versions += pruner.get_pruneable_model_versions(versions=versions)
+
+        deleters: list[asyncio.Task] = [asyncio.create_task(deleter()) for _ in range(self.concurrency)]
+        try:
+            for version in pruneable_versions:
+                await submit(
+                    kind="model_version",
+                    entity_id=f"{version.name}/{version.version}",
+                    message_dict={
+                        "name": version.name,
+                        "version": version.version,
+                        "last_updated_timestamp": version.last_updated_timestamp,
+                    },
+                    request=(
+                        "model-versions/delete",
+                        "DELETE",
+                        {"name": version.name, "version": version.version},
+                    ),
+                )
+
+            # Experiments
+            experiment_ids: list[str] = []
+            async for page in self.paginate(
+                pruner=pruner,
+                method="POST",
+                endpoint="experiments/search",
+                payload={"max_results": pruner.page_size},
+                key="experiments",
+            ):
+                experiment_ids += [experiment["experiment_id"] for experiment in page]
+
+            # Runs (all view types when deleting, so deletions do not shift the server side offsets)
+            async def scan(status: str) -> None:
+                async for page in self.paginate(
+                    pruner=pruner,
+                    method="POST",
+                    endpoint="runs/search",
+                    payload={
+                        "experiment_ids": experiment_ids,
+                        "filter": pruner.stale_run_filter(status=status),
+                        "run_view_type": "ACTIVE_ONLY" if dry_run else "ALL",
+                        "max_results": pruner.page_size,
+                    },
+                    key="runs",
+                ):
+                    runs: list[RunRecord] = [AsyncRestEngine.parse_run(document) for document in page]
+                    runs = [run for run in runs if run.lifecycle_stage == "active"]
+                    pruneable_runs: list[RunRecord] = PruneClient.filter_runs(
+                        runs=runs, model_versions=[], linked_run_ids=linked_run_ids
+                    )
+                    pruner.decision_log.count(reason="linked_to_model_version", count=len(runs) - len(pruneable_runs))
+                    for run in pruneable_runs:
+                        await submit(
+                            kind="run",
+                            entity_id=run.info.run_id,
+                            message_dict={
+                                "id": run.info.run_id,
+                                "end_time": run.info.end_time,
+                                "experiment_id": run.info.experiment_id,
+                            },
+                            request=("runs/delete", "POST", {"run_id": run.info.run_id}),
+                        )
+
+            if experiment_ids:
+                await asyncio.gather(*(scan(status) for status in pruner.stale_run_statuses()))
+            await queue.join()
+        finally:
+            for task in deleters:
+                task.cancel()
+            await asyncio.gather(*deleters, return_exceptions=True)
+
+        return result
+
+    def prune(self, pruner: PruneClient, dry_run: bool) -> PruneResult:
+        """
+        Performs the pruning process, see `run_prune`.
+
+        Parameters
+        ----------
+        pruner: PruneClient
+            The pruning client providing the cut-off, pruneability decisions and accounting.
+        dry_run: bool
+            When `True` resources are only reported.
+
+        Returns
+        -------
+        result: PruneResult
+            The deletion accounting (empty for a dry run).
+        """
+
+        with pruner.metrics.phase("async_prune"):
+            result: PruneResult = self.loop.run_until_complete(self.run_prune(pruner=pruner, dry_run=dry_run))
+        pruner.decision_log.summary()
+        return result
+
+    def close(self) -> None:
+        """Closes the pooled connections and the event loop."""
+
+        self.loop.run_until_complete(self.http.aclose())
+        self.loop.close()
@@ -0,0 +1,107 @@
+""" Defines the Sharded Stale Run Scanner """
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, Optional
+
+from mlflow.entities import Run
+
+from .audit import DecisionLog
+from .digest import ExperimentDigests
+
+
+# pylint: disable=too-few-public-methods
+class ShardedScanner:
+    """
+    Sharded Stale Run Scanner
+    Splits the experiments into shards of `shard_size` experiments which are searched for stale runs per status
+    concurrently on a thread pool.  The time spent on each shard is reported so pathological experiments can be
+    identified.
+
+    Attributes
+    ----------
+    shard_size: int
+        The number of experiments per concurrent stale run search.
+    concurrency: int
+        The maximum number of concurrent shard searches.
+    """
+
+    shard_size: int
+    concurrency: int
+
+    def __init__(self, shard_size: int, concurrency: int = 4):
+        self.shard_size = shard_size
+        self.concurrency = concurrency
+
+    # The scan state of every shard is merged back in a single pass
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments,too-many-locals
+    def scan(
+        self,
+        experiment_ids: list[str],
+        statuses: tuple[str, ...],
+        search: Callable[[list[str], str, Optional[dict[str, int]]], list[Run]],
+        runs: list[Run],
+        decision_log: DecisionLog,
+        upcoming: Optional[dict[str, int]] = None,
+    ) -> list[Run]:
+        """
+        Searches the experiments for stale runs, one shard and status at a time.
+
+        Parameters
+        ----------
+        experiment_ids: list[str]
+            A list of experiment ids to review.
+        statuses: tuple[str, ...]
+            The run statuses to query.
+        search: Callable[[list[str], str, Optional[dict[str, int]]], list[Run]]
+            Returns the stale runs of a shard's experiments with a status, recording the earliest end time of
+            each experiment's runs which are not yet stale in the (optional) dict provided.
+        runs: list[Run]
+            The (empty) list or `RunTable` the stale runs are merged into.
+        decision_log: DecisionLog
+            The log each scanned shard is recorded in.
+        upcoming: Optional[dict[str, int]]
+            When provided, the earliest end time of each experiment's runs which are not yet stale is merged
+            into it.
+
+        Returns
+        -------
+        stale_runs: list[Run]
+            The `runs`, holding the stale runs.  The shard results are merged in status then shard order whatever
+            the order the shards complete in, so the runs are ordered as by an unsharded scan.
+        """
+
+        shards: list[list[str]] = [
+            experiment_ids[index : index + self.shard_size] for index in range(0, len(experiment_ids), self.shard_size)
+        ]
+
+        def scan(shard: list[str], status: str) -> tuple[list[Run], Optional[dict[str, int]], float]:
+            start: float = perf_counter()
+            shard_upcoming: Optional[dict[str, int]] = {} if upcoming is not None else None
+            shard_runs: list[Run] = search(shard, status, shard_upcoming)
+            return shard_runs, shard_upcoming, perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures: dict[tuple[str, int], Future] = {
+                (status, index): executor.submit(scan, shard, status)
+                for status in statuses
+                for index, shard in enumerate(shards)
+            }
+
+            # Merge in status then shard order, matching the order of the unsharded scan
+            for (status, index), future in futures.items():
+                shard_runs, shard_upcoming, elapsed = future.result()
+                decision_log.action(
+                    "shard_scanned",
+                    kind="shard",
+                    shard=index + 1,
+                    shards=len(shards),
+                    status=status,
+                    experiment_ids=shards[index],
+                    runs=len(shard_runs),
+                    elapsed=round(elapsed, 3),
+                )
+                runs.extend(shard_runs)
+                if upcoming is not None:
+                    ExperimentDigests.merge_upcoming(upcoming=upcoming, other=shard_upcoming)
+        return runs
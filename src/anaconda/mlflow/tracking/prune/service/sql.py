@@ -0,0 +1,279 @@
+""" Defines the MLFlow Backend Store Pruning Engine """
+
+from time import perf_counter, time
+from typing import Callable, Iterable, Iterator, Optional
+
+from mlflow.exceptions import MlflowException
+from sqlalchemy import bindparam, create_engine, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..dto.pruneable import Pruneable
+from ..dto.purge_result import PurgeResult
+from ..dto.records import ModelVersionRecord, RunRecord, RunTable
+
+# Stale runs of active experiments which are not referenced by a (non deleted) model version.
+STALE_RUNS_QUERY = text(
+    """
+    SELECT runs.run_uuid, runs.experiment_id, runs.end_time, runs.status, runs.artifact_uri
+    FROM runs
+    JOIN experiments ON experiments.experiment_id = runs.experiment_id
+    WHERE experiments.lifecycle_stage = 'active'
+      AND runs.lifecycle_stage = 'active'
+      AND runs.status IN ('FINISHED', 'FAILED')
+      AND runs.end_time < :cutoff
+      AND NOT EXISTS (
+        SELECT 1 FROM model_versions
+        WHERE model_versions.run_id = runs.run_uuid
+          AND model_versions.current_stage != 'Deleted_Internal'
+      )
+    ORDER BY runs.end_time, runs.run_uuid
+    """
+)
+
+# Stale model versions which have not had a stage set.
+STALE_MODEL_VERSIONS_QUERY = text(
+    """
+    SELECT name, version, last_updated_time
+    FROM model_versions
+    WHERE current_stage = 'None'
+      AND last_updated_time < :cutoff
+    ORDER BY name, version
+    """
+)
+
+# Tables holding rows which belong to a run (those present in the backend store schema are purged).
+RUN_CHILD_TABLES: tuple[str, ...] = ("metrics", "latest_metrics", "params", "tags")
+
+
+class SqlPruneEngine:
+    """
+    MLFlow Backend Store Pruning Engine
+    Performs the pruning analysis as set based queries directly against the MLFlow SQLAlchemy backend store,
+    and soft deletes runs by updating their lifecycle stage in batched transactions.
+
+    Model versions are still deleted through the Model Registry API, since their deletion also redacts the
+    version and removes its tags and aliases.
+
+    Attributes
+    ----------
+    database_uri: str
+        The SQLAlchemy URI of the MLFlow backend store.
+    batch_size: int
+        The number of rows read, or updated, per batch.
+    """
+
+    database_uri: str
+    batch_size: int
+
+    def __init__(self, database_uri: str, batch_size: int = 1000):
+        self.database_uri = database_uri
+        self.batch_size = batch_size
+        self.engine: Engine = create_engine(database_uri)
+        inspector = inspect(self.engine)
+        run_columns: set[str] = {column["name"] for column in inspector.get_columns("runs")}
+        self.has_deleted_time: bool = "deleted_time" in run_columns
+        table_names: set[str] = set(inspector.get_table_names())
+        self.run_child_tables: list[str] = [table for table in RUN_CHILD_TABLES if table in table_names]
+
+    def iter_pruneable_runs(self, cutoff: float) -> Iterator[list[RunRecord]]:
+        """
+        Streams the pruneable runs, `batch_size` rows at a time.
+
+        Parameters
+        ----------
+        cutoff: float
+            The stale cut-off.
+
+        Returns
+        -------
+        pages: Iterator[list[RunRecord]]
+            An iterator of pruneable run pages.
+        """
+
+        with self.engine.connect() as connection:
+            result = connection.execution_options(stream_results=True).execute(
+                STALE_RUNS_QUERY, {"cutoff": int(cutoff)}
+            )
+            while rows := result.fetchmany(self.batch_size):
+                yield [
+                    RunRecord(
+                        run_id=run_uuid,
+                        experiment_id=str(experiment_id),
+                        end_time=end_time,
+                        status=status,
+                        artifact_uri=artifact_uri,
+                    )
+                    for run_uuid, experiment_id, end_time, status, artifact_uri in rows
+                ]
+
+    def get_pruneable_model_versions(self, cutoff: float) -> list[ModelVersionRecord]:
+        """
+        Returns the pruneable model versions.
+
+        Parameters
+        ----------
+        cutoff: float
+            The stale cut-off.
+
+        Returns
+        -------
+        model_versions: list[ModelVersionRecord]
+            The model versions which have no stage set and are stale.
+        """
+
+        with self.engine.connect() as connection:
+            return [
+                ModelVersionRecord(name=name, version=str(version), last_updated_timestamp=last_updated_time)
+                for name, version, last_updated_time in connection.execute(
+                    STALE_MODEL_VERSIONS_QUERY, {"cutoff": int(cutoff)}
+                )
+            ]
+
+    def get_pruneables(self, cutoff: float) -> Pruneable:
+        """
+        Returns a `Pruneable` DTO for suitable for processing.
+
+        Parameters
+        ----------
+        cutoff: float
+            The stale cut-off.
+
+        Returns
+        -------
+        pruneable: Pruneable
+            A `Pruneable` object.
+        """
+
+        models: list[ModelVersionRecord] = self.get_pruneable_model_versions(cutoff=cutoff)
+        print(f"Number of pruneable model versions: {len(models)}")
+
+        runs: RunTable = RunTable()
+        for page in self.iter_pruneable_runs(cutoff=cutoff):
+            runs.extend(page)
+        print(f"Number of pruneable experiment runs: {len(runs)}")
+
+        return Pruneable(runs=runs, models=models)
+
+    def soft_delete_runs(self, run_ids: list[str]) -> int:
+        """
+        Soft deletes a batch of runs in a single transaction.
+
+        Parameters
+        ----------
+        run_ids: list[str]
+            The ids of the runs to delete.
+
+        Returns
+        -------
+        count: int
+            The number of runs moved to the deleted lifecycle stage.
+        """
+
+        assignments: str = "lifecycle_stage = 'deleted'"
+        parameters: dict = {"run_ids": run_ids}
+        if self.has_deleted_time:
+            assignments += ", deleted_time = :deleted_time"
+            parameters["deleted_time"] = round(time() * 1000)
+
+        statement = text(
+            f"UPDATE runs SET {assignments} WHERE lifecycle_stage = 'active' AND run_uuid IN :run_ids"
+        ).bindparams(bindparam("run_ids", expanding=True))
+        try:
+            with self.engine.begin() as connection:
+                return connection.execute(statement, parameters).rowcount
+        except SQLAlchemyError as error:
+            raise MlflowException(f"Failed to soft delete runs: {error}") from error
+
+    def delete_runs(self, run_ids: Iterable[str], account: Callable[[str, Optional[Exception]], None]) -> None:
+        """
+        Soft deletes runs in batched transactions of `batch_size` runs (see `soft_delete_runs`), accounting for
+        the outcome of each run.  A failed batch is accounted as a failure of each of its runs.
+
+        Parameters
+        ----------
+        run_ids: Iterable[str]
+            The ids of the runs to delete.
+        account: Callable[[str, Optional[Exception]], None]
+            Called with each run id and its deletion error (`None` when the deletion succeeded).
+        """
+
+        batch: list[str] = []
+
+        def flush() -> None:
+            try:
+                self.soft_delete_runs(run_ids=batch)
+            except MlflowException as error:
+                for run_id in batch:
+                    account(run_id, error)
+            else:
+                for run_id in batch:
+                    account(run_id, None)
+            batch.clear()
+
+        for run_id in run_ids:
+            batch.append(run_id)
+            if len(batch) >= self.batch_size:
+                flush()
+        if batch:
+            flush()
+
+    def purge_deleted_runs(self, older_than: float, dry_run: bool) -> PurgeResult:
+        """
+        Permanently removes runs in the deleted lifecycle stage, along with their metrics, params and tags,
+        in batched transactions of at most `batch_size` runs.
+
+        Parameters
+        ----------
+        older_than: float
+            Only runs deleted before this timestamp are purged.  Backend stores without a `deleted_time`
+            column fall back to the run end time.
+        dry_run: bool
+            When `True` the eligible runs are only counted.
+
+        Returns
+        -------
+        result: PurgeResult
+            The purge accounting and throughput.
+        """
+
+        age_column: str = "deleted_time" if self.has_deleted_time else "end_time"
+        criteria: str = f"lifecycle_stage = 'deleted' AND {age_column} < :older_than"
+        parameters: dict = {"older_than": int(older_than)}
+        result: PurgeResult = PurgeResult()
+        start: float = perf_counter()
+
+        try:
+            if dry_run:
+                with self.engine.connect() as connection:
+                    result.runs = connection.execute(
+                        text(f"SELECT COUNT(*) FROM runs WHERE {criteria}"), parameters
+                    ).scalar()
+                print(f"[DRY RUN] {result.runs} deleted runs are eligible for purging")
+                return result
+
+            select_batch = text(f"SELECT run_uuid FROM runs WHERE {criteria} LIMIT :batch_size")
+            while True:
+                with self.engine.begin() as connection:
+                    run_ids: list[str] = list(
+                        connection.execute(select_batch, {**parameters, "batch_size": self.batch_size}).scalars()
+                    )
+                    if not run_ids:
+                        break
+                    for table in self.run_child_tables + ["runs"]:
+                        statement = text(f"DELETE FROM {table} WHERE run_uuid IN :run_ids").bindparams(
+                            bindparam("run_ids", expanding=True)
+                        )
+                        result.rows += connection.execute(statement, {"run_ids": run_ids}).rowcount
+                result.runs += len(run_ids)
+                result.batches += 1
+        except SQLAlchemyError as error:
+            raise MlflowException(f"Failed to purge deleted runs: {error}") from error
+        finally:
+            result.elapsed = perf_counter() - start
+
+        print(
+            f"[PURGE] {result.runs} runs ({result.rows} rows) in {result.batches} batches, "
+            f"{result.runs_per_second:.1f} runs/s"
+        )
+        return result
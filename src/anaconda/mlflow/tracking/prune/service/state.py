@@ -0,0 +1,111 @@
+""" Defines the Incremental Scan State """
+
+import sqlite3
+from typing import Iterable, Optional
+
+
+class ScanState:
+    """
+    Incremental Scan State
+    A local SQLite file persisting the stale cut-off each experiment has been scanned up to (its high-water
+    mark), along with the stale runs which were held back (linked to a model version, or failed to delete).
+    Later scans only query runs which became stale since the previous cut-off, and cheaply re-check the
+    held back runs.
+
+    Changes are staged during analysis and only persisted by `commit`, once the deletions have been applied.
+
+    Attributes
+    ----------
+    path: str
+        The path of the SQLite state file.
+    """
+
+    path: str
+
+    def __init__(self, path: str):
+        self.path = path
+        self.staged_cutoff: Optional[float] = None
+        self.staged_experiment_ids: list[str] = []
+        self.staged_held_run_ids: set[str] = set()
+        self.connection: sqlite3.Connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks (experiment_id TEXT PRIMARY KEY, cutoff INTEGER NOT NULL)"
+        )
+        self.connection.execute("CREATE TABLE IF NOT EXISTS held_runs (run_id TEXT PRIMARY KEY)")
+        self.connection.commit()
+
+    def get_watermarks(self, experiment_ids: list[str]) -> dict[str, int]:
+        """
+        Returns the cut-off each of the provided experiments has previously been scanned up to.
+        Experiments which have never been scanned are omitted.
+
+        Parameters
+        ----------
+        experiment_ids: list[str]
+            The experiment ids to look up.
+
+        Returns
+        -------
+        watermarks: dict[str, int]
+            The previous cut-off by experiment id.
+        """
+
+        requested: set[str] = set(experiment_ids)
+        return {
+            experiment_id: cutoff
+            for experiment_id, cutoff in self.connection.execute("SELECT experiment_id, cutoff FROM watermarks")
+            if experiment_id in requested
+        }
+
+    def get_held_run_ids(self) -> set[str]:
+        """Returns the ids of the stale runs previously held back from pruning."""
+
+        return {run_id for (run_id,) in self.connection.execute("SELECT run_id FROM held_runs")}
+
+    def stage(self, cutoff: float, experiment_ids: list[str], held_run_ids: Iterable[str]) -> None:
+        """
+        Stages the outcome of an incremental analysis.
+
+        Parameters
+        ----------
+        cutoff: float
+            The cut-off the experiments have now been scanned up to.
+        experiment_ids: list[str]
+            The scanned experiment ids.
+        held_run_ids: Iterable[str]
+            The ids of the stale runs held back by a model version link.
+        """
+
+        self.staged_cutoff = cutoff
+        self.staged_experiment_ids = list(experiment_ids)
+        self.staged_held_run_ids = set(held_run_ids)
+
+    def commit(self, failed_run_ids: Iterable[str] = ()) -> None:
+        """
+        Persists the staged analysis.  Runs which failed to delete are held back so they are re-checked.
+
+        Parameters
+        ----------
+        failed_run_ids: Iterable[str]
+            The ids of the runs which failed to delete.
+        """
+
+        if self.staged_cutoff is None:
+            return
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO watermarks (experiment_id, cutoff) VALUES (?, ?)",
+                ((experiment_id, int(self.staged_cutoff)) for experiment_id in self.staged_experiment_ids),
+            )
+            self.connection.execute("DELETE FROM held_runs")
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO held_runs (run_id) VALUES (?)",
+                ((run_id,) for run_id in self.staged_held_run_ids.union(failed_run_ids)),
+            )
+        self.staged_cutoff = None
+
+    def close(self) -> None:
+        """Closes the state file."""
+
+        self.connection.close()
@@ -0,0 +1,89 @@
+""" Defines the Streaming Pruning Engine """
+
+from typing import Iterator
+
+from mlflow.entities import Experiment, Run, ViewType
+from mlflow.entities.model_registry import ModelVersion
+
+from ..dto.prune_result import PruneResult
+from .client import PruneClient
+
+
+class StreamingEngine:
+    """
+    Streaming Pruning Engine
+    Interleaves analysis and pruning: stale runs are filtered and pruned page by page as they are returned by
+    the server, so memory is bounded by a single page rather than the full set of stale runs.
+    """
+
+    @staticmethod
+    def iter_pruneable_runs(pruner: PruneClient, run_view_type: int = ViewType.ACTIVE_ONLY) -> Iterator[list[Run]]:
+        """
+        Streams pages of `Run` objects suitable for pruning, checked against the pruner's `linkage_index`.
+
+        Parameters
+        ----------
+        pruner: PruneClient
+            The pruning client.
+        run_view_type: int
+            The `ViewType` to query stale runs with (see `PruneClient.iter_stale_runs`).
+
+        Returns
+        -------
+        pages: Iterator[list[Run]]
+            An iterator of pruneable run pages.
+        """
+
+        # Get Experiments
+        with pruner.metrics.phase("experiments"):
+            experiments: list[Experiment] = pruner.get_experiments()
+        experiment_ids: list[str] = [experiment.experiment_id for experiment in experiments]
+
+        print(f"Streaming experiments {experiment_ids} for stale runs")
+
+        stale_count: int = 0
+        pruneable_count: int = 0
+        for page in pruner.iter_stale_runs(experiment_ids=experiment_ids, run_view_type=run_view_type):
+            pruneable_page: list[Run] = pruner.get_pruneable_page(
+                runs=page, model_versions=[], linked_run_ids=pruner.linkage_index
+            )
+            stale_count += len(page)
+            pruneable_count += len(pruneable_page)
+            if pruneable_page:
+                yield pruneable_page
+
+        print(f"{pruneable_count} of {stale_count} streamed stale runs are pruneable")
+
+    def prune(self, pruner: PruneClient, dry_run: bool) -> PruneResult:
+        """
+        Performs the MLFlow Tracking Server Pruning Process with streaming run discovery.
+
+        Parameters
+        ----------
+        pruner: PruneClient
+            The pruning client.
+        dry_run: bool
+            When `True` resources are only reported.
+
+        Returns
+        -------
+        result: PruneResult
+            The deletion accounting (empty for a dry run).
+        """
+
+        prunable_model_versions: list[ModelVersion] = pruner.discover_pruneable_models()
+
+        print("[START] Stale Model Pruning")
+        result: PruneResult = pruner.prune_models(models=prunable_model_versions, dry_run=dry_run)
+        print("[COMPLETE] Stale Model Pruning")
+
+        # Deleting runs while paging through `ACTIVE_ONLY` results would shift the server side offsets
+        # and skip runs, so when deleting we page over all runs and drop the inactive ones client side.
+        run_view_type: int = ViewType.ACTIVE_ONLY if dry_run else ViewType.ALL
+
+        print("[START] Stale Run Pruning")
+        for page in self.iter_pruneable_runs(pruner=pruner, run_view_type=run_view_type):
+            result.merge(pruner.prune_runs(runs=page, dry_run=dry_run))
+        print("[COMPLETE] Stale Run Pruning")
+        pruner.decision_log.summary()
+        return result
@@ -0,0 +1,252 @@
+""" Defines the Adaptive Request Controller """
+
+import asyncio
+import os
+import random
+from contextlib import contextmanager
+from threading import Condition, Lock
+from time import monotonic, sleep
+from typing import Any, Awaitable, Callable, Iterator, Optional
+
+from mlflow.exceptions import MlflowException
+
+# Weight given to the latest latency sample in the smoothed latency
+LATENCY_SMOOTHING: float = 0.2
+
+# Environment variable defining the number of retries MLFlow makes within each REST call
+MLFLOW_RETRIES_VARIABLE: str = "MLFLOW_HTTP_REQUEST_MAX_RETRIES"
+
+
+# The limits, the rate limiter and the latency statistics the controller adapts to
+# pylint: disable=too-many-instance-attributes
+class RequestController:
+    """
+    Adaptive Request Controller
+    Gates calls to the MLFlow Tracking Server, adapting the number of concurrent calls to the server's
+    observed health using additive-increase/multiplicative-decrease (AIMD):
+
+    1. Each healthy call raises the concurrency limit by `1 / limit` (roughly one per round of calls).
+    2. A throttled (429) or failed (5xx) call, or a smoothed latency above the target, halves the limit
+       (at most once per smoothed latency interval).
+
+    Other failed calls (e.g. 404) leave the limit and smoothed latency unchanged.  Throttled and failed calls
+    are retried with jittered exponential backoff, and calls are additionally spaced to honour the `max_rps`
+    ceiling.  MLFlow's own retries must be disabled (see `client_retries_disabled`) so that every attempt is
+    observed by the controller.
+
+    Attributes
+    ----------
+    max_limit: int
+        The upper bound of the concurrency limit (the worker pool size).
+    min_limit: int
+        The lower bound of the concurrency limit.
+    max_rps: Optional[float]
+        The ceiling on requests per second, unlimited when `None`.
+    max_retries: int
+        The number of retries of a throttled or failed call.
+    base_delay: float
+        The initial backoff delay (in seconds).
+    max_delay: float
+        The maximum backoff delay (in seconds).
+    latency_target: Optional[float]
+        The smoothed latency (in seconds) above which the limit is decreased.  When `None`, twice the
+        lowest smoothed latency observed is used.
+    """
+
+    # A controller is built from each of its limits
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        max_limit: int = 1,
+        min_limit: int = 1,
+        max_rps: Optional[float] = None,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        latency_target: Optional[float] = None,
+    ):
+        self.max_limit = max(max_limit, min_limit)
+        self.min_limit = min_limit
+        self.max_rps = max_rps
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.latency_target = latency_target
+
+        self.limit: float = float(min_limit)
+        self.in_flight: int = 0
+        self.retries: int = 0
+        self.decreases: int = 0
+        self.latency: Optional[float] = None
+        self.baseline: Optional[float] = None
+        self.last_decrease: float = 0.0
+        self.next_slot: float = 0.0
+        self.condition: Condition = Condition()
+        self.rate_lock: Lock = Lock()
+
+    @staticmethod
+    def is_retriable(error: MlflowException) -> bool:
+        """Returns `True` for errors indicating the server is throttling (429) or failing (5xx)."""
+
+        status: int = error.get_http_status_code()
+        return status == 429 or status >= 500
+
+    @staticmethod
+    @contextmanager
+    def client_retries_disabled() -> Iterator[None]:
+        """
+        Disables the retries MLFlow makes within each REST call (which would otherwise hide throttled and failed
+        attempts from the controller and multiply its own retries) for the duration of the context, restoring the
+        previous setting on exit.  MLFlow reads the setting from the environment on each call, so the context
+        spans a whole prune rather than individual (concurrent) calls.
+        """
+
+        previous: Optional[str] = os.environ.get(MLFLOW_RETRIES_VARIABLE)
+        os.environ[MLFLOW_RETRIES_VARIABLE] = "0"
+        try:
+            yield
+        finally:
+            if previous is None:
+                os.environ.pop(MLFLOW_RETRIES_VARIABLE, None)
+            else:
+                os.environ[MLFLOW_RETRIES_VARIABLE] = previous
+
+    def backoff(self, attempt: int) -> float:
+        """Returns the jittered ("full jitter") exponential backoff delay of a retry attempt."""
+
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def acquire(self) -> None:
+        """Waits for a free concurrency slot, then for the next slot allowed by the rate ceiling."""
+
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+
+        if self.max_rps:
+            with self.rate_lock:
+                now: float = monotonic()
+                delay: float = self.next_slot - now
+                self.next_slot = max(now, self.next_slot) + 1 / self.max_rps
+            if delay > 0:
+                sleep(delay)
+
+    def release(self, elapsed: float, congested: bool, sampled: bool = True) -> None:
+        """
+        Frees a concurrency slot, adapting the limit to the call's outcome.  The limit is left unchanged for
+        calls which are neither congested nor `sampled` (those failing for reasons other than the server's health).
+        """
+
+        with self.condition:
+            self.in_flight -= 1
+            if not congested and not sampled:
+                self.condition.notify_all()
+                return
+            if not congested:
+                if self.latency is None:
+                    self.latency = elapsed
+                else:
+                    self.latency = (1 - LATENCY_SMOOTHING) * self.latency + LATENCY_SMOOTHING * elapsed
+                self.baseline = self.latency if self.baseline is None else min(self.baseline, self.latency)
+                target: float = self.latency_target if self.latency_target is not None else 2 * self.baseline
+                congested = self.latency > target
+
+            now: float = monotonic()
+            if congested:
+                # Multiplicative decrease, once per smoothed latency interval so a burst of slow calls
+                # (already in flight before the decrease) does not collapse the limit
+                if now - self.last_decrease > (self.latency or 0.0):
+                    self.limit = max(float(self.min_limit), self.limit / 2)
+                    self.last_decrease = now
+                    self.decreases += 1
+            else:
+                # Additive increase
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+            self.condition.notify_all()
+
+    def call(self, function: Callable[[], Any]) -> Any:
+        """
+        Calls `function` under the controller, retrying throttled and failed calls.
+
+        Parameters
+        ----------
+        function: Callable[[], Any]
+            The call to make.
+
+        Returns
+        -------
+        result: Any
+            The result of the call.
+        """
+
+        attempt: int = 0
+        while True:
+            self.acquire()
+            start: float = monotonic()
+            congested: bool = False
+            sampled: bool = False
+            try:
+                result: Any = function()
+                sampled = True
+                return result
+            except MlflowException as error:
+                congested = RequestController.is_retriable(error)
+                if not congested or attempt >= self.max_retries:
+                    raise
+            finally:
+                self.release(elapsed=monotonic() - start, congested=congested, sampled=sampled)
+
+            with self.condition:
+                self.retries += 1
+            sleep(self.backoff(attempt))
+            attempt += 1
+
+    async def call_async(self, function: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Awaits `function` under the controller, retrying throttled and failed calls (see `call`).  Waiting for a
+        concurrency slot (and the rate ceiling) is done off the event loop, so other calls are not held up.
+
+        Parameters
+        ----------
+        function: Callable[[], Awaitable[Any]]
+            The call to make.
+
+        Returns
+        -------
+        result: Any
+            The result of the call.
+        """
+
+        attempt: int = 0
+        while True:
+            await asyncio.get_running_loop().run_in_executor(None, self.acquire)
+            start: float = monotonic()
+            congested: bool = False
+            sampled: bool = False
+            try:
+                result: Any = await function()
+                sampled = True
+                return result
+            except MlflowException as error:
+                congested = RequestController.is_retriable(error)
+                if not congested or attempt >= self.max_retries:
+                    raise
+            finally:
+                self.release(elapsed=monotonic() - start, congested=congested, sampled=sampled)
+
+            with self.condition:
+                self.retries += 1
+            await asyncio.sleep(self.backoff(attempt))
+            attempt += 1
+
+    def to_dict(self) -> dict:
+        """Returns the controller state."""
+
+        with self.condition:
+            return {
+                "limit": self.limit,
+                "retries": self.retries,
+                "decreases": self.decreases,
+                "latency": self.latency,
+            }
@@ -0,0 +1,142 @@
+""" Synthetic-Scale Pruning Benchmark """
+
+import json
+import os
+import sys
+import tracemalloc
+from argparse import ArgumentParser, Namespace
+from contextlib import contextmanager
+from pathlib import Path
+from test.utils.fake import FakeMlflowClient
+from time import perf_counter
+from typing import Iterator, Optional
+
+from anaconda.mlflow.tracking.sdk import build_mlflow_client
+from src.anaconda.mlflow.tracking.prune.dto.pruneable import Pruneable
+from src.anaconda.mlflow.tracking.prune.service.audit import DecisionLog
+from src.anaconda.mlflow.tracking.prune.service.client import PruneClient
+from src.anaconda.mlflow.tracking.prune.service.metrics import InstrumentedClient
+
+VERSION_PATH: Path = Path(__file__).parents[2] / "version.json"
+
+
+class Benchmark:
+    """
+    Runs the pruning phases against a generated `FakeMlflowClient`, recording the wall time,
+    peak (traced) memory and MLFlow client call counts of each phase.
+    """
+
+    def __init__(
+        self,
+        fake: FakeMlflowClient,
+        delete_concurrency: int = 1,
+        model_version_search: bool = False,
+        compact_records: bool = False,
+    ):
+        self.fake: FakeMlflowClient = fake
+        self.pruner: PruneClient = PruneClient(
+            client=build_mlflow_client(),
+            delete_concurrency=delete_concurrency,
+            model_version_search=model_version_search,
+            compact_records=compact_records,
+            decision_log=DecisionLog(level="WARNING"),
+        )
+        self.pruner.client = InstrumentedClient(client=fake, metrics=self.pruner.metrics)
+        self.phases: dict[str, dict] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        calls: dict[str, int] = {method: stats.count for method, stats in self.pruner.metrics.calls.items()}
+        tracemalloc.start()
+        start: float = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed: float = perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.phases[name] = {
+                "seconds": elapsed,
+                "peak_memory_bytes": peak,
+                "calls": {
+                    method: stats.count - calls.get(method, 0)
+                    for method, stats in self.pruner.metrics.calls.items()
+                    if stats.count > calls.get(method, 0)
+                },
+            }
+            print(f"[BENCHMARK] {name}: {self.phases[name]}")
+
+    def run(self) -> dict:
+        with self.phase("get_pruneables"):
+            pruneables: Pruneable = self.pruner.get_pruneables()
+
+        stale_runs: list = self.pruner.get_stale_runs(experiment_ids=list(self.fake.experiments))
+        model_versions: list = [version for versions in self.fake.models.values() for version in versions]
+        with self.phase("filter_runs"):
+            PruneClient.filter_runs(runs=stale_runs, model_versions=model_versions)
+        with self.phase("filter_runs_linked"):
+            PruneClient.filter_runs(
+                runs=stale_runs,
+                model_versions=[],
+                linked_run_ids={version.run_id for version in model_versions if version.run_id},
+            )
+        del stale_runs
+
+        with self.phase("prune"):
+            self.pruner.prune(pruneables=pruneables, dry_run=False)
+        self.pruner.decision_log.close()
+
+        return {
+            "entities": {
+                "experiments": len(self.fake.experiments),
+                "runs": len(self.fake.runs),
+                "model_versions": len(model_versions),
+                "pruneable_runs": len(pruneables.runs),
+                "pruneable_model_versions": len(pruneables.models),
+            },
+            "phases": self.phases,
+            "metrics": self.pruner.metrics.to_dict(),
+        }
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(prog="benchmark", description="Synthetic-scale benchmark of the pruning process")
+    parser.add_argument("--experiments", action="store", default=10, type=int, help="Number of experiments")
+    parser.add_argument("--runs", action="store", default=1000, type=int, help="Number of runs per experiment")
+    parser.add_argument("--models", action="store", default=100, type=int, help="Number of registered models")
+    parser.add_argument("--versions", action="store", default=10, type=int, help="Number of versions per model")
+    parser.add_argument("--ttl", action="store", default=30, type=int, help="Entity TTL (in days)")
+    parser.add_argument("--latency", action="store", default=0.0, type=float, help="Per-call latency (in seconds)")
+    parser.add_argument("--delete-concurrency", action="store", default=1, type=int, help="Delete concurrency")
+    parser.add_argument("--model-version-search", action="store_true", help="Use the model version search")
+    parser.add_argument("--compact-records", action="store_true", help="Hold compact records for the candidates")
+    parser.add_argument("--seed", action="store", default=0, type=int, help="Random seed for the generated store")
+    parser.add_argument("--output", action="store", default=None, help="Path of the JSON results to write")
+    cli_args: Namespace = parser.parse_args(sys.argv[1:])
+
+    os.environ["MLFLOW_TRACKING_ENTITY_TTL"] = str(cli_args.ttl)
+
+    results: dict = Benchmark(
+        fake=FakeMlflowClient.generate(
+            experiments=cli_args.experiments,
+            runs_per_experiment=cli_args.runs,
+            models=cli_args.models,
+            versions_per_model=cli_args.versions,
+            ttl=cli_args.ttl,
+            latency=cli_args.latency,
+            seed=cli_args.seed,
+        ),
+        delete_concurrency=cli_args.delete_concurrency,
+        model_version_search=cli_args.model_version_search,
+        compact_records=cli_args.compact_records,
+    ).run()
+    results = {
+        "version": json.loads(VERSION_PATH.read_text(encoding="utf-8"))["version"],
+        "config": vars(cli_args),
+        **results,
+    }
+
+    output: Optional[str] = cli_args.output
+    if output:
+        Path(output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(json.dumps(results))
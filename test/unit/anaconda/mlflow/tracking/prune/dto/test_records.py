@@ -0,0 +1,94 @@
+import unittest
+from uuid import uuid4
+
+from mlflow.entities import Run, RunInfo
+from mlflow.entities.model_registry import ModelVersion
+
+from src.anaconda.mlflow.tracking.prune.dto.pruneable import Pruneable
+from src.anaconda.mlflow.tracking.prune.dto.records import ModelVersionRecord, RunRecord, RunTable
+
+
+class TestRecords(unittest.TestCase):
+    def generate_record(self, experiment_id: str = "0", end_time: int = 1) -> RunRecord:
+        run_id: str = uuid4().hex
+        return RunRecord(
+            run_id=run_id,
+            experiment_id=experiment_id,
+            end_time=end_time,
+            status="FINISHED",
+            artifact_uri=f"mlflow-artifacts:/{experiment_id}/{run_id}/artifacts",
+        )
+
+    def test_run_record_from_run(self):
+        run: Run = Run(
+            run_info=RunInfo(
+                run_uuid="1",
+                experiment_id="0",
+                user_id="",
+                status="FAILED",
+                start_time=0,
+                end_time=5,
+                lifecycle_stage="active",
+                artifact_uri="file:///mlruns/0/1/artifacts",
+                run_id="1",
+            ),
+            run_data=None,
+        )
+
+        record: RunRecord = RunRecord.from_run(run)
+
+        self.assertEqual(record.info.run_id, "1")
+        self.assertEqual(record.info.end_time, 5)
+        self.assertEqual(record.info.status, "FAILED")
+        self.assertEqual(record.info.artifact_uri, "file:///mlruns/0/1/artifacts")
+        self.assertFalse(hasattr(record, "__dict__"))
+
+    def test_model_version_record_from_model_version(self):
+        version: ModelVersion = ModelVersion(
+            name="mock-model",
+            version="3",
+            creation_timestamp=0,
+            last_updated_timestamp=7,
+            current_stage="None",
+            run_id="1",
+        )
+
+        record: ModelVersionRecord = ModelVersionRecord.from_model_version(version)
+
+        self.assertEqual(
+            record, ModelVersionRecord(name="mock-model", version="3", last_updated_timestamp=7, run_id="1")
+        )
+
+        # Database backed stores return integer versions
+        version._version = 3
+        self.assertEqual(ModelVersionRecord.from_model_version(version).version, "3")
+
+    def test_run_table_round_trip(self):
+        records: list[RunRecord] = [self.generate_record(experiment_id=str(index % 3)) for index in range(10)]
+        records.append(
+            RunRecord(run_id="not-a-uuid", experiment_id="0", end_time=None, status="FAILED", artifact_uri="s3://b/x")
+        )
+
+        table: RunTable = RunTable(records)
+
+        self.assertEqual(len(table), 11)
+        self.assertEqual(list(table), records)
+        self.assertEqual(table[-1].info.run_id, "not-a-uuid")
+        self.assertIsNone(table[-1].info.end_time)
+        self.assertEqual(table.nbytes, 11 * (16 + 8 + 4 + 1))
+
+    def test_run_table_exclude(self):
+        records: list[RunRecord] = [self.generate_record() for _ in range(5)]
+        table: RunTable = RunTable(records)
+
+        excluded: RunTable = table.exclude(run_ids={records[1].run_id, records[3].run_id})
+
+        self.assertEqual(list(excluded), [records[0], records[2], records[4]])
+        self.assertEqual(len(table), 5)
+
+    def test_pruneable_accepts_run_table(self):
+        table: RunTable = RunTable([self.generate_record()])
+
+        pruneable: Pruneable = Pruneable(runs=table, models=[])
+
+        self.assertIs(pruneable.runs, table)
@@ -0,0 +1,97 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.anaconda.mlflow.tracking.prune.dto.artifact_reclaim import ArtifactReclaim
+from src.anaconda.mlflow.tracking.prune.dto.records import RunRecord
+from src.anaconda.mlflow.tracking.prune.service.artifacts import ArtifactCollector
+from src.anaconda.mlflow.tracking.prune.service.audit import DecisionLog
+
+
+class TestArtifacts(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.root: Path = Path(self.directory.name)
+        self.collector: ArtifactCollector = ArtifactCollector(
+            max_workers=2, artifacts_destination=str(self.root), decision_log=DecisionLog(level="WARNING")
+        )
+
+    def tearDown(self) -> None:
+        self.collector.decision_log.close()
+        self.directory.cleanup()
+
+    def generate_run(self, run_id: str, artifact_uri: str) -> RunRecord:
+        return RunRecord(run_id=run_id, experiment_id="0", end_time=1, status="FINISHED", artifact_uri=artifact_uri)
+
+    def generate_artifacts(self, run_id: str) -> Path:
+        artifacts: Path = self.root / "0" / run_id / "artifacts"
+        (artifacts / "model").mkdir(parents=True)
+        (artifacts / "metrics.json").write_bytes(b"12345")
+        (artifacts / "model" / "model.pkl").write_bytes(b"1234567890")
+        return artifacts
+
+    def test_resolve(self):
+        self.assertEqual(self.collector.resolve(artifact_uri="file:///mlruns/0/1/artifacts"), "/mlruns/0/1/artifacts")
+        self.assertEqual(self.collector.resolve(artifact_uri="/mlruns/0/1/artifacts"), "/mlruns/0/1/artifacts")
+        self.assertEqual(
+            self.collector.resolve(artifact_uri="mlflow-artifacts:/0/1/artifacts"),
+            str(self.root / "0" / "1" / "artifacts"),
+        )
+        self.assertEqual(self.collector.resolve(artifact_uri="s3://bucket/0/1/artifacts"), None)
+        self.assertEqual(self.collector.resolve(artifact_uri=None), None)
+
+    def test_collect(self):
+        first: Path = self.generate_artifacts(run_id="1")
+        second: Path = self.generate_artifacts(run_id="2")
+        runs: list[RunRecord] = [
+            self.generate_run(run_id="1", artifact_uri=first.as_uri()),
+            self.generate_run(run_id="2", artifact_uri="mlflow-artifacts:/0/2/artifacts"),
+            self.generate_run(run_id="3", artifact_uri="s3://bucket/0/3/artifacts"),
+        ]
+
+        reclaim: ArtifactReclaim = self.collector.collect(runs=runs, dry_run=False)
+
+        self.assertEqual(reclaim.runs, 2)
+        self.assertEqual(reclaim.files, 4)
+        self.assertEqual(reclaim.bytes, 30)
+        self.assertEqual(reclaim.skipped, 1)
+        self.assertEqual(self.collector.decision_log.summary(), {"artifacts_reclaimed": 2, "artifacts_not_local": 1})
+        self.assertEqual(first.exists(), False)
+        self.assertEqual(second.exists(), False)
+
+    def test_collect_dry_run(self):
+        artifacts: Path = self.generate_artifacts(run_id="1")
+
+        reclaim: ArtifactReclaim = self.collector.collect(
+            runs=[self.generate_run(run_id="1", artifact_uri=artifacts.as_uri())], dry_run=True
+        )
+
+        self.assertEqual(reclaim.files, 2)
+        self.assertEqual(reclaim.bytes, 15)
+        self.assertEqual(artifacts.exists(), True)
+
+    def test_collect_refuses_foreign_directory(self):
+        shared: Path = self.root / "shared"
+        shared.mkdir()
+        (shared / "data.csv").write_bytes(b"12345")
+        artifacts: Path = self.generate_artifacts(run_id="2")
+        runs: list[RunRecord] = [
+            self.generate_run(run_id="1", artifact_uri=shared.as_uri()),
+            self.generate_run(run_id="1", artifact_uri=artifacts.as_uri()),
+            self.generate_run(run_id="1", artifact_uri=(artifacts / ".." / ".." / "1" / "artifacts").as_uri()),
+        ]
+
+        with self.assertRaises(ValueError):
+            self.collector.collect_run(run=runs[0], dry_run=False)
+        self.assertEqual(self.collector.measure(runs=runs), [-1, -1, 0])
+        reclaim: ArtifactReclaim = self.collector.collect(runs=runs[:2], dry_run=False)
+
+        self.assertEqual(reclaim.failed, 2)
+        self.assertEqual(reclaim.runs, 0)
+        self.assertEqual((shared / "data.csv").exists(), True)
+        self.assertEqual(artifacts.exists(), True)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestArtifacts())
@@ -0,0 +1,46 @@
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.anaconda.mlflow.tracking.prune.service.audit import DecisionLog
+
+
+class TestDecisionLog(unittest.TestCase):
+    def test_counts_and_sampling(self):
+        decision_log: DecisionLog = DecisionLog(level="DEBUG", sample_rate=0.0)
+        with patch.object(decision_log.logger, "log") as mock_log:
+            decision_log.decision("stage_set", name="mock", version="1")
+            decision_log.decision("stage_set", name="mock", version="2")
+            decision_log.action("delete", id="mock-run")
+            decision_log.count(reason="linked_to_model_version", count=5)
+            mock_log.assert_not_called()
+
+        self.assertEqual(decision_log.summary(), {"stage_set": 2, "delete": 1, "linked_to_model_version": 5})
+        decision_log.close()
+
+    def test_level(self):
+        decision_log: DecisionLog = DecisionLog(level="INFO")
+        with patch.object(decision_log.logger, "log") as mock_log:
+            decision_log.decision("not_stale", name="mock", version="1")
+            decision_log.action("dry_run", id="mock-run")
+            self.assertEqual(mock_log.call_count, 1)
+        decision_log.close()
+
+    def test_audit_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            audit_path: Path = Path(directory) / "audit.jsonl.gz"
+            decision_log: DecisionLog = DecisionLog(audit_path=str(audit_path))
+            with patch.object(decision_log.logger, "log") as mock_log:
+                decision_log.decision("pruneable", kind="model_version", name="mock", version="1")
+                decision_log.action("delete", kind="run", id="mock-run")
+                mock_log.assert_not_called()
+            decision_log.close()
+
+            with gzip.open(audit_path, mode="rt", encoding="utf-8") as audit_file:
+                records: list[dict] = [json.loads(line) for line in audit_file]
+
+        self.assertEqual([record["reason"] for record in records], ["pruneable", "delete"])
+        self.assertEqual(records[1]["id"], "mock-run")
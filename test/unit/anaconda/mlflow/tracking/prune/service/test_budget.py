@@ -0,0 +1,67 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.anaconda.mlflow.tracking.prune.dto.pruneable import Pruneable
+from src.anaconda.mlflow.tracking.prune.dto.records import ModelVersionRecord, RunRecord, RunTable
+from src.anaconda.mlflow.tracking.prune.service.budget import PruneBudget, prioritize
+
+
+class TestPruneBudget(unittest.TestCase):
+    def test_limit_max_deletes(self):
+        budget: PruneBudget = PruneBudget(max_deletes=3)
+
+        self.assertEqual(list(budget.limit(kind="model_version", deletions=[1, 2])), [1, 2])
+        self.assertEqual(list(budget.limit(kind="run", deletions=[3, 4, 5])), [3])
+        self.assertEqual(budget.to_dict(), {"issued": {"model_version": 2, "run": 1}, "exhausted": "max_deletes"})
+
+    @patch("src.anaconda.mlflow.tracking.prune.service.budget.monotonic")
+    def test_limit_max_duration(self, mock_monotonic: MagicMock):
+        mock_monotonic.side_effect = [0, 1, 2, 11]
+        budget: PruneBudget = PruneBudget(max_duration=10)
+
+        self.assertEqual(list(budget.limit(kind="run", deletions=[1, 2, 3, 4])), [1, 2])
+        self.assertEqual(budget.exhausted, "max_duration")
+
+    def test_limit_unbounded(self):
+        budget: PruneBudget = PruneBudget()
+
+        self.assertEqual(list(budget.limit(kind="run", deletions=range(5))), [0, 1, 2, 3, 4])
+        self.assertEqual(budget.is_exhausted(), False)
+
+
+class TestPrioritize(unittest.TestCase):
+    @staticmethod
+    def generate_pruneable() -> Pruneable:
+        runs: list[RunRecord] = [
+            RunRecord(
+                run_id=f"{index:032x}", experiment_id="0", end_time=end_time, status="FINISHED", artifact_uri=None
+            )
+            for index, end_time in enumerate([30, 10, 20])
+        ]
+        models: list[ModelVersionRecord] = [
+            ModelVersionRecord(name="model", version="1", last_updated_timestamp=5),
+            ModelVersionRecord(name="model", version="2", last_updated_timestamp=1),
+        ]
+        return Pruneable(runs=RunTable(runs), models=models)
+
+    def test_prioritize_oldest(self):
+        pruneable: Pruneable = prioritize(pruneables=self.generate_pruneable(), priority="oldest")
+
+        self.assertEqual([run.end_time for run in pruneable.runs], [10, 20, 30])
+        self.assertEqual([model.version for model in pruneable.models], ["2", "1"])
+
+    def test_prioritize_largest(self):
+        collector: MagicMock = MagicMock()
+        collector.measure.return_value = [100, -1, 500]
+
+        pruneable: Pruneable = prioritize(pruneables=self.generate_pruneable(), priority="largest", collector=collector)
+
+        self.assertEqual([run.end_time for run in pruneable.runs], [20, 30, 10])
+
+    def test_prioritize_unknown(self):
+        with self.assertRaises(ValueError):
+            prioritize(pruneables=self.generate_pruneable(), priority="newest")
+
+
+if __name__ == "__main__":
+    unittest.main()
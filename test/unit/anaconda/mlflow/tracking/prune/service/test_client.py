@@ -4,13 +4,21 @@ from test.utils.mocks import MockFactory
 from typing import Any, Optional
 from unittest.mock import MagicMock, patch
 
-from mlflow.entities import Experiment, Run
+from mlflow.entities import Experiment, Run, RunInfo, ViewType
 from mlflow.entities.model_registry import ModelVersion, RegisteredModel
+from mlflow.exceptions import MlflowException
 from mlflow.store.entities import PagedList
 
 from anaconda.mlflow.tracking.sdk import build_mlflow_client
+from src.anaconda.mlflow.tracking.prune.dto.prune_result import PruneResult
 from src.anaconda.mlflow.tracking.prune.dto.pruneable import Pruneable
+from src.anaconda.mlflow.tracking.prune.dto.records import RunRecord, RunTable
 from src.anaconda.mlflow.tracking.prune.service.client import PruneClient
+from src.anaconda.mlflow.tracking.prune.service.digest import DIGEST_LOOKAHEAD
+from src.anaconda.mlflow.tracking.prune.service.linkage import LinkageIndex
+from src.anaconda.mlflow.tracking.prune.service.policy import RetentionPolicy
+from src.anaconda.mlflow.tracking.prune.service.shards import ShardedScanner
+from src.anaconda.mlflow.tracking.prune.service.state import ScanState
 
 
 class TestClient(unittest.TestCase):
@@ -88,6 +96,127 @@ class TestClient(unittest.TestCase):
             run_view_type=1,
         )
 
+    # iter_stale_runs tests
+
+    def test_iter_stale_runs_follows_page_tokens(self):
+        mock_run_one: Run = self.factory.generate_mock_run()
+        mock_run_two: Run = self.factory.generate_mock_run()
+        self.client.page_size = 1
+        self.client.client.search_runs.side_effect = [
+            PagedList[Run](items=[mock_run_one], token="next"),
+            PagedList[Run](items=[mock_run_two], token=None),
+            PagedList[Run](items=[], token=None),
+        ]
+
+        pages: list[list[Run]] = list(self.client.iter_stale_runs(experiment_ids=["mock"]))
+
+        self.assertEqual(pages, [[mock_run_one], [mock_run_two]])
+        self.assertEqual(self.client.client.search_runs.call_count, 3)
+        self.assertEqual(self.client.client.search_runs.call_args_list[1].kwargs["page_token"], "next")
+        self.assertEqual(self.client.client.search_runs.call_args_list[1].kwargs["max_results"], 1)
+
+    def test_iter_stale_runs_drops_inactive_runs(self):
+        mock_active_run: Run = self.factory.generate_mock_run()
+        mock_active_run._info = MagicMock()
+        mock_active_run._info.lifecycle_stage = "active"
+        mock_deleted_run: Run = self.factory.generate_mock_run()
+        mock_deleted_run._info = MagicMock()
+        mock_deleted_run._info.lifecycle_stage = "deleted"
+        self.client.client.search_runs.return_value = PagedList[Run](
+            items=[mock_active_run, mock_deleted_run], token=None
+        )
+
+        pages: list[list[Run]] = list(self.client.iter_stale_runs(experiment_ids=["mock"], run_view_type=ViewType.ALL))
+
+        self.assertEqual(pages, [[mock_active_run], [mock_active_run]])
+
+    def test_get_stale_runs_compact_records(self):
+        mock_run: Run = self.factory.generate_mock_run()
+        mock_run._info = RunInfo(
+            run_uuid="0123456789abcdef0123456789abcdef",
+            experiment_id="1",
+            user_id="",
+            status="FINISHED",
+            start_time=0,
+            end_time=1,
+            lifecycle_stage="active",
+            artifact_uri="mlflow-artifacts:/1/0123456789abcdef0123456789abcdef/artifacts",
+        )
+        self.client.compact_records = True
+        self.client.client.search_runs.side_effect = [
+            PagedList[Run](items=[mock_run], token=None),
+            PagedList[Run](items=[], token=None),
+        ]
+
+        runs: RunTable = self.client.get_stale_runs(experiment_ids=["1"])
+        filtered: RunTable = self.client.filter_runs(runs=runs, model_versions=[], linked_run_ids=set())
+
+        self.assertIsInstance(runs, RunTable)
+        self.assertEqual(runs, [RunRecord.from_run(mock_run)])
+        self.assertIsInstance(filtered, RunTable)
+        self.assertEqual(filtered[0].info.artifact_uri, mock_run.info.artifact_uri)
+
+    # apply_policy tests
+
+    def test_apply_policy(self):
+        stale_run: RunRecord = RunRecord(
+            run_id="0" * 32, experiment_id="1", end_time=0, status="FINISHED", artifact_uri="s3://bucket/0"
+        )
+        retained_run: RunRecord = RunRecord(
+            run_id="1" * 32, experiment_id="2", end_time=0, status="FINISHED", artifact_uri="s3://bucket/1"
+        )
+        self.client.policy = RetentionPolicy(ttl=30, experiment_ttls={"2": 100000})
+
+        self.assertEqual(self.client.stale_run_statuses(), ("FINISHED", "FAILED"))
+        self.assertEqual(self.client.apply_policy(runs=[stale_run, retained_run]), [stale_run])
+        self.assertEqual(self.client.apply_policy(runs=RunTable([stale_run, retained_run])), [stale_run])
+
+    def test_policy_with_scan_state(self):
+        scan_state: ScanState = ScanState(path=":memory:")
+        with self.assertRaisesRegex(ValueError, "incremental scan state"):
+            PruneClient(client=build_mlflow_client(), policy=RetentionPolicy(ttl=30), scan_state=scan_state)
+        scan_state.close()
+
+    # exclude_best_runs tests
+
+    def test_exclude_best_runs(self):
+        best_run: RunRecord = RunRecord(
+            run_id="0" * 32, experiment_id="1", end_time=0, status="FINISHED", artifact_uri="s3://bucket/0"
+        )
+        other_run: RunRecord = RunRecord(
+            run_id="1" * 32, experiment_id="1", end_time=0, status="FINISHED", artifact_uri="s3://bucket/1"
+        )
+        self.client.best_run_retention = MagicMock()
+        self.client.best_run_retention.best_run_ids.return_value = {best_run.run_id}
+
+        self.assertEqual(self.client.exclude_best_runs(runs=RunTable([best_run, other_run])), [other_run])
+        self.assertEqual(self.client.best_run_retention.best_run_ids.call_args.kwargs["experiment_ids"], ["1"])
+
+    # sharded get_stale_runs tests
+
+    def test_get_stale_runs_sharded(self):
+        mock_runs: dict[tuple[str, str], Run] = {}
+        for experiment_id in ["1", "2", "3"]:
+            for status in ["FINISHED", "FAILED"]:
+                mock_runs[(experiment_id, status)] = self.factory.generate_mock_run()
+
+        def mock_search_runs(experiment_ids: list[str], filter_string: str, **kwargs) -> PagedList[Run]:
+            status: str = "FINISHED" if "FINISHED" in filter_string else "FAILED"
+            return PagedList[Run](items=[mock_runs[(eid, status)] for eid in experiment_ids], token=None)
+
+        self.client.client.search_runs.side_effect = mock_search_runs
+        self.client.sharded_scanner = ShardedScanner(shard_size=2)
+
+        runs: list[Run] = self.client.get_stale_runs(experiment_ids=["1", "2", "3"])
+
+        self.assertEqual(self.client.client.search_runs.call_count, 4)
+        self.assertEqual(
+            runs,
+            [mock_runs[(eid, "FINISHED")] for eid in ["1", "2", "3"]]
+            + [mock_runs[(eid, "FAILED")] for eid in ["1", "2", "3"]],
+        )
+        self.assertEqual(self.client.decision_log.summary()["shard_scanned"], 4)
+
     # filter_runs tests
 
     def test_filter_runs_empty(self):
@@ -119,6 +248,21 @@ class TestClient(unittest.TestCase):
         )
         self.assertEqual(results[0].info.run_id, "mock_run_id_2")
 
+    def test_filter_runs_linkage_index(self):
+        runs: RunTable = RunTable(
+            [
+                RunRecord(run_id=run_id, experiment_id="1", end_time=0, status="FINISHED", artifact_uri="")
+                for run_id in ["0" * 32, "1" * 32]
+            ]
+        )
+        mock_model_version: ModelVersion = self.factory.generate_mock_model_version()
+        mock_model_version._run_id = "0" * 32
+
+        filtered: RunTable = self.client.filter_runs(
+            runs=runs, model_versions=[], linked_run_ids=LinkageIndex.from_model_versions([mock_model_version])
+        )
+        self.assertEqual([run.info.run_id for run in filtered], ["1" * 32])
+
     # get_pruneable_runs tests
 
     def test_get_pruneable_runs_empty(self):
@@ -151,10 +295,14 @@ class TestClient(unittest.TestCase):
         def mock_get_experiments(self: Any) -> list[Experiment]:
             return mock_experiments
 
-        def mock_get_stale_runs(self: Any, experiment_ids: list[str]) -> list[Run]:
+        def mock_get_stale_runs(
+            self: Any, experiment_ids: list[str], upcoming: Optional[dict[str, int]] = None
+        ) -> list[Run]:
             return mock_stale_runs
 
-        def mock_filter_runs(runs: list[Run], model_versions: list[ModelVersion]) -> list[Run]:
+        def mock_filter_runs(
+            runs: list[Run], model_versions: list[ModelVersion], linked_run_ids: Optional[set[str]] = None
+        ) -> list[Run]:
             return mock_filtered_runs
 
         with patch("anaconda.mlflow.tracking.sdk.AnacondaMlFlowClient.get_experiments", mock_get_experiments):
@@ -172,6 +320,131 @@ class TestClient(unittest.TestCase):
                     # Review results
                     self.assertEqual(runs, [mock_run])
 
+    def test_get_pruneable_runs_skips_dormant_experiments(self):
+        mock_experiments: list[Experiment] = [
+            self.factory.generate_mock_experiment(),
+            self.factory.generate_mock_experiment(),
+        ]
+        changed_experiment_id: str = mock_experiments[1].experiment_id
+        mock_linked_run: RunRecord = RunRecord(
+            run_id="mock_linked_run_id",
+            experiment_id=changed_experiment_id,
+            end_time=0,
+            status="FINISHED",
+            artifact_uri="",
+        )
+        mock_run: RunRecord = RunRecord(
+            run_id="mock_run_id", experiment_id=changed_experiment_id, end_time=0, status="FINISHED", artifact_uri=""
+        )
+        mock_next_run: RunRecord = RunRecord(
+            run_id="mock_next_run_id",
+            experiment_id=changed_experiment_id,
+            end_time=self.client.oldest_allowed_timestamp + 5,
+            status="KILLED",
+            artifact_uri="",
+        )
+
+        mock_digests: MagicMock = MagicMock()
+        mock_digests.get_changed_experiments.return_value = [mock_experiments[1]]
+        self.client.experiment_digests = mock_digests
+
+        def mock_search_runs(experiment_ids: list[str], filter_string: str, **kwargs) -> PagedList[Run]:
+            self.assertEqual(experiment_ids, [changed_experiment_id])
+            # The next stale time is found by the stale run scan itself (looking ahead of the cut-off)
+            self.assertNotIn("order_by", kwargs)
+            self.assertIn(
+                f"attributes.end_time < {self.client.oldest_allowed_timestamp + DIGEST_LOOKAHEAD}", filter_string
+            )
+            if "FINISHED" in filter_string:
+                return PagedList[Run](items=[mock_linked_run, mock_run], token=None)
+            return PagedList[Run](items=[mock_next_run], token=None)
+
+        self.client.client.search_runs.side_effect = mock_search_runs
+
+        def mock_get_experiments(self: Any) -> list[Experiment]:
+            return mock_experiments
+
+        with patch("anaconda.mlflow.tracking.sdk.AnacondaMlFlowClient.get_experiments", mock_get_experiments):
+            runs: list[Run] = self.client.get_pruneable_runs(model_versions=[], linked_run_ids={"mock_linked_run_id"})
+
+        self.assertEqual(runs, [mock_run])
+        mock_digests.get_changed_experiments.assert_called_once_with(
+            experiments=mock_experiments, cutoff=self.client.oldest_allowed_timestamp, config=""
+        )
+        evaluation: dict = mock_digests.stage_evaluation.call_args.kwargs
+        self.assertEqual(evaluation["experiments"], [mock_experiments[1]])
+        self.assertEqual(evaluation["stale_runs"], [mock_linked_run, mock_run])
+        self.assertEqual(evaluation["unheld_runs"], [mock_run])
+        self.assertEqual(evaluation["upcoming"], {changed_experiment_id: self.client.oldest_allowed_timestamp + 5})
+
+    # get_incremental_pruneable_runs tests
+
+    def test_get_incremental_pruneable_runs(self):
+        mock_experiments: list[Experiment] = [
+            self.factory.generate_mock_experiment(),
+            self.factory.generate_mock_experiment(),
+        ]
+        scanned_experiment_id: str = mock_experiments[0].experiment_id
+        new_experiment_id: str = mock_experiments[1].experiment_id
+
+        mock_new_run: Run = self.factory.generate_mock_run()
+        mock_new_run._info = MagicMock()
+        mock_new_run._info.run_id = "mock_new_run_id"
+
+        mock_released_run: Run = self.factory.generate_mock_run()
+        mock_released_run._info = MagicMock()
+        mock_released_run._info.run_id = "mock_released_run_id"
+        mock_released_run._info.lifecycle_stage = "active"
+        mock_released_run._info.status = "FINISHED"
+
+        mock_state: MagicMock = MagicMock()
+        mock_state.get_watermarks.return_value = {scanned_experiment_id: 100}
+        mock_state.get_held_run_ids.return_value = {"mock_released_run_id", "mock_held_run_id"}
+        self.client.scan_state = mock_state
+
+        def mock_search_runs(experiment_ids: list[str], filter_string: str, **kwargs) -> PagedList[Run]:
+            if filter_string.startswith("attributes.run_id IN "):
+                self.assertEqual(filter_string, "attributes.run_id IN ('mock_released_run_id')")
+                self.assertEqual(experiment_ids, [scanned_experiment_id, new_experiment_id])
+                return PagedList[Run](items=[mock_released_run], token=None)
+            if experiment_ids == [scanned_experiment_id]:
+                self.assertTrue(filter_string.startswith("attributes.end_time >= 100 AND "))
+                return PagedList[Run](items=[], token=None)
+            self.assertTrue(filter_string.startswith("attributes.end_time < "))
+            return PagedList[Run](items=[mock_new_run], token=None)
+
+        self.client.client.search_runs.side_effect = mock_search_runs
+
+        def mock_get_experiments(self: Any) -> list[Experiment]:
+            return mock_experiments
+
+        with patch("anaconda.mlflow.tracking.sdk.AnacondaMlFlowClient.get_experiments", mock_get_experiments):
+            runs: list[Run] = self.client.get_pruneable_runs(
+                model_versions=[], linked_run_ids={"mock_held_run_id", "mock_new_run_id"}
+            )
+
+        self.assertEqual(runs, [mock_released_run])
+        self.client.client.get_run.assert_not_called()
+        mock_state.stage.assert_called_once_with(
+            cutoff=self.client.oldest_allowed_timestamp,
+            experiment_ids=[scanned_experiment_id, new_experiment_id],
+            held_run_ids={"mock_held_run_id", "mock_new_run_id"},
+        )
+
+    def test_iter_runs_by_id(self):
+        self.client.page_size = 2
+        mock_run: Run = self.factory.generate_mock_run()
+        self.client.client.search_runs.return_value = PagedList[Run](items=[mock_run], token=None)
+
+        pages: list[list[Run]] = list(self.client.iter_runs_by_id(run_ids=["a", "b", "c"], experiment_ids=["1"]))
+
+        self.assertEqual(len(pages), 2)
+        self.assertEqual(
+            [call.kwargs["filter_string"] for call in self.client.client.search_runs.call_args_list],
+            ["attributes.run_id IN ('a', 'b')", "attributes.run_id IN ('c')"],
+        )
+        self.assertEqual(list(self.client.iter_runs_by_id(run_ids=["a"], experiment_ids=[])), [])
+
     # get_pruneables tests
     def test_get_pruneables_empty(self):
         def mock_get_registered_models(self: Any, filter_string: Optional[str] = None) -> list[RegisteredModel]:
@@ -183,7 +456,9 @@ class TestClient(unittest.TestCase):
         def mock_get_pruneable_model_versions(self: Any, versions: list[ModelVersion]) -> list[ModelVersion]:
             return []
 
-        def mock_get_pruneable_runs(self: Any, model_versions: list[ModelVersion]) -> list[Run]:
+        def mock_get_pruneable_runs(
+            self: Any, model_versions: list[ModelVersion], linked_run_ids: Optional[set[str]] = None
+        ) -> list[Run]:
             return []
 
         with patch(
@@ -228,7 +503,9 @@ class TestClient(unittest.TestCase):
         def mock_get_pruneable_model_versions(self: Any, versions: list[ModelVersion]) -> list[ModelVersion]:
             return mock_model_versions
 
-        def mock_get_pruneable_runs(self: Any, model_versions: list[ModelVersion]) -> list[Run]:
+        def mock_get_pruneable_runs(
+            self: Any, model_versions: list[ModelVersion], linked_run_ids: Optional[set[str]] = None
+        ) -> list[Run]:
             return mock_runs
 
         with patch(
@@ -250,6 +527,61 @@ class TestClient(unittest.TestCase):
                         self.assertEqual(pruneable.runs, mock_runs)
                         self.assertEqual(pruneable.models, mock_model_versions)
 
+    # search_pruneable_models tests
+
+    def test_search_pruneable_models(self):
+        mock_stale_version: ModelVersion = self.factory.generate_mock_model_version()
+        mock_stale_version._current_stage = "None"
+        mock_stale_version._last_updated_timestamp = 0
+        mock_stale_version._run_id = "mock_run_id_1"
+
+        mock_staged_version: ModelVersion = self.factory.generate_mock_model_version()
+        mock_staged_version._current_stage = "Production"
+        mock_staged_version._last_updated_timestamp = 0
+        mock_staged_version._run_id = "mock_run_id_2"
+
+        self.client.page_size = 1
+        self.client.client.search_model_versions.side_effect = [
+            PagedList[ModelVersion](items=[mock_stale_version], token="next"),
+            PagedList[ModelVersion](items=[mock_staged_version], token=None),
+        ]
+
+        linked_run_ids, versions = self.client.search_pruneable_models()
+
+        self.assertEqual(linked_run_ids, {"mock_run_id_1", "mock_run_id_2"})
+        self.assertEqual(versions, [mock_stale_version])
+        self.assertEqual(self.client.client.search_model_versions.call_count, 2)
+        self.assertEqual(self.client.client.search_model_versions.call_args_list[1].kwargs["page_token"], "next")
+
+    def test_get_pruneables_model_version_search(self):
+        mock_version: ModelVersion = self.factory.generate_mock_model_version()
+        mock_runs: list[Run] = [self.factory.generate_mock_run()]
+        captured: dict = {}
+
+        def mock_search_pruneable_models(self: Any) -> tuple[set[str], list[ModelVersion]]:
+            return {"mock_run_id"}, [mock_version]
+
+        def mock_get_pruneable_runs(
+            self: Any, model_versions: list[ModelVersion], linked_run_ids: Optional[set[str]] = None
+        ) -> list[Run]:
+            captured["linked_run_ids"] = linked_run_ids
+            return mock_runs
+
+        self.client.model_version_search = True
+        with patch(
+            "src.anaconda.mlflow.tracking.prune.service.client.PruneClient.search_pruneable_models",
+            mock_search_pruneable_models,
+        ):
+            with patch(
+                "src.anaconda.mlflow.tracking.prune.service.client.PruneClient.get_pruneable_runs",
+                mock_get_pruneable_runs,
+            ):
+                pruneable: Pruneable = self.client.get_pruneables()
+
+        self.assertEqual(captured["linked_run_ids"], {"mock_run_id"})
+        self.assertEqual(pruneable.runs, mock_runs)
+        self.assertEqual(pruneable.models, [mock_version])
+
     def test_prune_dry_run(self):
         # Set up test
         mock_run: Run = self.factory.generate_mock_run()
@@ -268,6 +600,24 @@ class TestClient(unittest.TestCase):
         mock_client.delete_model_version.assert_not_called()
         mock_client.delete_run.assert_not_called()
 
+    def test_prune_skips_linked_runs(self):
+        mock_runs: list[RunRecord] = [
+            RunRecord(run_id=run_id, experiment_id="1", end_time=0, status="FINISHED", artifact_uri="")
+            for run_id in ["0" * 32, "1" * 32]
+        ]
+        mock_model_version: ModelVersion = self.factory.generate_mock_model_version()
+        mock_model_version._run_id = "0" * 32
+        self.client.linkage_index = LinkageIndex.from_model_versions([mock_model_version])
+        self.client.track_deleted_runs = True
+
+        # Perform test
+        result: PruneResult = self.client.prune(pruneables=Pruneable(runs=mock_runs, models=[]), dry_run=False)
+
+        # Review results
+        self.client.client.delete_run.assert_called_once_with(run_id="1" * 32)
+        self.assertEqual(result.skips, [{"kind": "run", "id": "0" * 32, "reason": "linked_to_model_version"}])
+        self.assertEqual(result.deleted_run_ids, ["1" * 32])
+
     def test_prune(self):
         # Set up test
         mock_run: Run = self.factory.generate_mock_run()
@@ -288,6 +638,32 @@ class TestClient(unittest.TestCase):
         )
         mock_client.delete_run.assert_called_once_with(run_id=mock_run.info.run_id)
 
+    def test_prune_concurrent_isolates_failures(self):
+        # Set up test
+        mock_runs: list[Run] = []
+        for run_id in ["1", "2", "3"]:
+            mock_run: Run = self.factory.generate_mock_run()
+            mock_run._info = MagicMock()
+            mock_run.info.run_id = run_id
+            mock_runs.append(mock_run)
+
+        def mock_delete_run(run_id: str) -> None:
+            if run_id == "2":
+                raise MlflowException("mock failure")
+
+        self.client.client.delete_run.side_effect = mock_delete_run
+        self.client.delete_concurrency = 2
+
+        # Perform test
+        with patch("src.anaconda.mlflow.tracking.prune.service.client.configure_connection_pool"):
+            result: PruneResult = self.client.prune(pruneables=Pruneable(runs=mock_runs, models=[]), dry_run=False)
+
+        # Review results
+        self.assertEqual(self.client.client.delete_run.call_count, 3)
+        self.assertEqual(result.succeeded, {"run": 2})
+        self.assertEqual(result.failed, {"run": 1})
+        self.assertEqual(result.failures[0]["id"], "2")
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner()
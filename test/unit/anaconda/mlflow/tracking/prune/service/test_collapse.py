@@ -0,0 +1,97 @@
+import unittest
+from typing import Optional
+from unittest.mock import MagicMock
+
+from mlflow.entities.model_registry import RegisteredModel
+from mlflow.exceptions import MlflowException
+
+from anaconda.mlflow.tracking.sdk import build_mlflow_client
+from src.anaconda.mlflow.tracking.prune.dto.prune_result import PruneResult
+from src.anaconda.mlflow.tracking.prune.dto.pruneable import Pruneable
+from src.anaconda.mlflow.tracking.prune.dto.records import ModelVersionRecord
+from src.anaconda.mlflow.tracking.prune.service.client import PruneClient
+from src.anaconda.mlflow.tracking.prune.service.collapse import ModelCollapser
+
+
+class TestModelCollapser(unittest.TestCase):
+    client: Optional[PruneClient]
+
+    def setUp(self) -> None:
+        self.client = PruneClient(client=build_mlflow_client())
+        self.client.client = MagicMock()
+        self.collapser: ModelCollapser = ModelCollapser()
+
+    @staticmethod
+    def generate_model_versions(name: str, count: int) -> list[ModelVersionRecord]:
+        return [
+            ModelVersionRecord(name=name, version=str(version), last_updated_timestamp=version)
+            for version in range(1, count + 1)
+        ]
+
+    def test_get_collapsible_models(self):
+        self.client.model_version_counts = {"model-a": 3, "model-b": 4, "model-c": 2}
+        versions: list[ModelVersionRecord] = (
+            self.generate_model_versions(name="model-a", count=3)
+            + self.generate_model_versions(name="model-b", count=3)
+            + self.generate_model_versions(name="model-c", count=2)
+        )
+
+        # Partially stale models are not collapsed, whatever their number of versions
+        self.assertEqual(
+            self.collapser.get_collapsible_models(pruner=self.client, versions=versions), ["model-a", "model-c"]
+        )
+
+    def test_prune_collapses_registered_models(self):
+        collapsed_versions: list[ModelVersionRecord] = self.generate_model_versions(name="model-a", count=4)
+        other_versions: list[ModelVersionRecord] = self.generate_model_versions(name="model-b", count=1)
+
+        mock_client: MagicMock = self.client.client
+        mock_client.get_registered_model.return_value = RegisteredModel(name="model-a", last_updated_timestamp=4)
+
+        result: PruneResult = self.collapser.prune(
+            pruner=self.client,
+            pruneables=Pruneable(runs=[], models=collapsed_versions + other_versions, registered_models=["model-a"]),
+            dry_run=False,
+        )
+
+        # The planned versions are reused, rather than listed again
+        mock_client.get_registered_model.assert_called_once_with(name="model-a")
+        mock_client.search_model_versions.assert_not_called()
+        mock_client.delete_registered_model.assert_called_once_with(name="model-a")
+        mock_client.delete_model_version.assert_called_once_with(name="model-b", version="1")
+        self.assertEqual(result.succeeded, {"registered_model": 1, "model_version": 5})
+        self.assertEqual(self.client.metrics.calls_saved, {"delete_model_version": 2})
+
+    def test_prune_does_not_collapse_changed_registered_models(self):
+        planned_versions: list[ModelVersionRecord] = self.generate_model_versions(name="model-a", count=3)
+
+        # A version has been registered since the plan was computed
+        mock_client: MagicMock = self.client.client
+        mock_client.get_registered_model.return_value = RegisteredModel(name="model-a", last_updated_timestamp=4)
+
+        result: PruneResult = self.collapser.prune(
+            pruner=self.client,
+            pruneables=Pruneable(runs=[], models=planned_versions, registered_models=["model-a"]),
+            dry_run=False,
+        )
+
+        mock_client.delete_registered_model.assert_not_called()
+        self.assertEqual(mock_client.delete_model_version.call_count, 3)
+        self.assertEqual(result.succeeded, {"model_version": 3})
+
+    def test_prune_saved_calls(self):
+        collapsed_versions: list[ModelVersionRecord] = self.generate_model_versions(name="model-a", count=4)
+        pruneable: Pruneable = Pruneable(runs=[], models=collapsed_versions, registered_models=["model-a"])
+
+        # Neither a dry run nor a failed deletion saves any calls
+        self.collapser.prune(pruner=self.client, pruneables=pruneable, dry_run=True)
+        self.client.client.get_registered_model.return_value = RegisteredModel(name="model-a", last_updated_timestamp=4)
+        self.client.client.delete_registered_model.side_effect = MlflowException("Failed")
+        self.collapser.prune(pruner=self.client, pruneables=pruneable, dry_run=False)
+
+        self.assertEqual(self.client.metrics.calls_saved, {})
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestModelCollapser())
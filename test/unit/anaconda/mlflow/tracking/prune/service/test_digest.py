@@ -0,0 +1,170 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Optional
+from unittest.mock import MagicMock
+
+from src.anaconda.mlflow.tracking.prune.dto.records import RunRecord
+from src.anaconda.mlflow.tracking.prune.service.digest import DIGEST_LOOKAHEAD, ExperimentDigest, ExperimentDigests
+
+
+class TestDigest(unittest.TestCase):
+    digests: Optional[ExperimentDigests]
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path: str = str(Path(self.directory.name) / "digests.db")
+        self.digests = ExperimentDigests(path=self.path)
+
+    def tearDown(self) -> None:
+        self.digests.close()
+        self.directory.cleanup()
+
+    @staticmethod
+    def generate_digest(experiment_id: str, **kwargs) -> ExperimentDigest:
+        fields: dict = {
+            "last_update_time": 10,
+            "cutoff": 100,
+            "evaluated_at": 200,
+            "next_stale_time": None,
+            "stale_runs": 3,
+            "held_runs": 0,
+        }
+        fields.update(kwargs)
+        return ExperimentDigest(experiment_id=experiment_id, **fields)
+
+    @staticmethod
+    def generate_experiment(experiment_id: str, last_update_time: int = 10) -> MagicMock:
+        experiment: MagicMock = MagicMock()
+        experiment.experiment_id = experiment_id
+        experiment.last_update_time = last_update_time
+        return experiment
+
+    def test_is_dormant(self):
+        experiment: MagicMock = self.generate_experiment(experiment_id="1")
+
+        self.assertTrue(self.generate_digest(experiment_id="1").is_dormant(experiment=experiment, cutoff=150))
+        self.assertTrue(
+            self.generate_digest(experiment_id="1", next_stale_time=150).is_dormant(experiment=experiment, cutoff=150)
+        )
+
+        # Updated experiments, held back runs, runs ending before the cut-off and runs ending since the evaluation
+        self.assertFalse(
+            self.generate_digest(experiment_id="1", last_update_time=5).is_dormant(experiment=experiment, cutoff=150)
+        )
+        self.assertFalse(
+            self.generate_digest(experiment_id="1", held_runs=1).is_dormant(experiment=experiment, cutoff=150)
+        )
+        self.assertFalse(
+            self.generate_digest(experiment_id="1", next_stale_time=120).is_dormant(experiment=experiment, cutoff=150)
+        )
+        self.assertFalse(self.generate_digest(experiment_id="1").is_dormant(experiment=experiment, cutoff=250))
+
+        # Experiments evaluated with a different best run ranking configuration
+        self.assertFalse(
+            self.generate_digest(experiment_id="1").is_dormant(experiment=experiment, cutoff=150, config="keep=1")
+        )
+        self.assertTrue(
+            self.generate_digest(experiment_id="1", config="keep=1").is_dormant(
+                experiment=experiment, cutoff=150, config="keep=1"
+            )
+        )
+
+    def test_get_changed_experiments(self):
+        self.digests.stage(digests=[self.generate_digest(experiment_id="1"), self.generate_digest(experiment_id="2")])
+        self.digests.commit()
+        experiments: list[MagicMock] = [
+            self.generate_experiment(experiment_id="1"),
+            self.generate_experiment(experiment_id="2", last_update_time=20),
+            self.generate_experiment(experiment_id="3"),
+        ]
+
+        self.assertEqual(
+            self.digests.get_changed_experiments(experiments=experiments, cutoff=150), [experiments[1], experiments[2]]
+        )
+        self.assertEqual(
+            self.digests.get_changed_experiments(experiments=experiments, cutoff=150, config="keep=1"), experiments
+        )
+
+    def test_split_upcoming_runs(self):
+        upcoming: dict[str, int] = {"2": 160}
+        runs: list[RunRecord] = [
+            RunRecord(
+                run_id=str(index), experiment_id=experiment_id, end_time=end_time, status="FINISHED", artifact_uri=""
+            )
+            for index, (experiment_id, end_time) in enumerate([("1", 90), ("1", 170), ("1", 120), ("2", 180)])
+        ]
+
+        self.assertEqual(ExperimentDigests.split_upcoming_runs(runs=runs, cutoff=100, upcoming=upcoming), runs[:1])
+        self.assertEqual(upcoming, {"1": 120, "2": 160})
+
+    def test_stage_evaluation(self):
+        experiments: list[MagicMock] = [
+            self.generate_experiment(experiment_id="1"),
+            self.generate_experiment(experiment_id="2"),
+        ]
+        stale_runs: list[RunRecord] = [
+            RunRecord(run_id="held", experiment_id="1", end_time=50, status="FINISHED", artifact_uri=""),
+            RunRecord(run_id="unheld", experiment_id="1", end_time=50, status="FINISHED", artifact_uri=""),
+        ]
+
+        self.digests.stage_evaluation(
+            experiments=experiments,
+            stale_runs=stale_runs,
+            unheld_runs=stale_runs[1:],
+            upcoming={"1": 120},
+            cutoff=100,
+            evaluated_at=200,
+            config="keep=1",
+        )
+
+        self.assertEqual(
+            list(self.digests.staged.values()),
+            [
+                self.generate_digest(
+                    experiment_id="1", next_stale_time=120, stale_runs=2, held_runs=1, config="keep=1"
+                ),
+                self.generate_digest(
+                    experiment_id="2", next_stale_time=100 + DIGEST_LOOKAHEAD, stale_runs=0, config="keep=1"
+                ),
+            ],
+        )
+
+    def test_commit_is_persisted(self):
+        self.digests.stage(digests=[self.generate_digest(experiment_id="1"), self.generate_digest(experiment_id="2")])
+        self.digests.commit(failed_experiment_ids=["2"])
+        self.digests.close()
+
+        self.digests = ExperimentDigests(path=self.path)
+        self.assertEqual(
+            self.digests.get_digests(experiment_ids=["1", "2", "3"]), {"1": self.generate_digest(experiment_id="1")}
+        )
+
+    def test_digests_without_config_are_migrated(self):
+        self.digests.close()
+        connection: sqlite3.Connection = sqlite3.connect(self.path)
+        connection.execute("DROP TABLE digests")
+        connection.execute(
+            "CREATE TABLE digests (experiment_id TEXT PRIMARY KEY, last_update_time INTEGER, cutoff INTEGER NOT NULL, "
+            "evaluated_at INTEGER NOT NULL, next_stale_time INTEGER, stale_runs INTEGER NOT NULL, "
+            "held_runs INTEGER NOT NULL)"
+        )
+        connection.execute("INSERT INTO digests VALUES ('1', 10, 100, 200, NULL, 3, 0)")
+        connection.commit()
+        connection.close()
+
+        self.digests = ExperimentDigests(path=self.path)
+        self.assertEqual(self.digests.get_digests(experiment_ids=["1"]), {"1": self.generate_digest(experiment_id="1")})
+
+    def test_uncommitted_stage_is_discarded(self):
+        self.digests.stage(digests=[self.generate_digest(experiment_id="1")])
+        self.digests.close()
+
+        self.digests = ExperimentDigests(path=self.path)
+        self.assertEqual(self.digests.get_digests(experiment_ids=["1"]), {})
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestDigest())
@@ -0,0 +1,43 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.anaconda.mlflow.tracking.prune.service.http import configure_connection_pool
+
+
+class TestHttp(unittest.TestCase):
+    def test_configure_connection_pool(self):
+        session: MagicMock = MagicMock()
+        sessions: list[MagicMock] = []
+
+        def get_request_session(*args) -> MagicMock:
+            sessions.append(session)
+            return session
+
+        rest_utils: SimpleNamespace = SimpleNamespace(_get_request_session=get_request_session)
+
+        with patch.multiple(
+            "src.anaconda.mlflow.tracking.prune.service.http", rest_utils=rest_utils, request_utils=None
+        ):
+            configure_connection_pool(pool_size=16)
+            configure_connection_pool(pool_size=16)
+
+            self.assertEqual(rest_utils._get_request_session(), session)
+
+        # Re-configuring wraps the original factory rather than the previous wrapper
+        self.assertEqual(rest_utils._get_request_session.unpooled, get_request_session)
+        self.assertEqual(len(sessions), 1)
+        self.assertEqual(session.pool_size, 16)
+        self.assertEqual(session.mount.call_count, 2)
+
+    def test_configure_connection_pool_unavailable(self):
+        with patch.multiple(
+            "src.anaconda.mlflow.tracking.prune.service.http", rest_utils=SimpleNamespace(), request_utils=None
+        ):
+            with self.assertWarns(RuntimeWarning):
+                configure_connection_pool(pool_size=16)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestHttp())
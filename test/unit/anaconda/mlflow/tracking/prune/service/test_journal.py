@@ -0,0 +1,99 @@
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Optional
+
+from mlflow.entities import Run, RunInfo
+from mlflow.entities.model_registry import ModelVersion
+
+from src.anaconda.mlflow.tracking.prune.dto.pruneable import Pruneable
+from src.anaconda.mlflow.tracking.prune.service.journal import PruneJournal
+
+
+class TestJournal(unittest.TestCase):
+    journal: Optional[PruneJournal]
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal = PruneJournal(path=str(Path(self.directory.name) / "journal.db"), max_age=1000)
+
+    def tearDown(self) -> None:
+        self.journal.close()
+        self.directory.cleanup()
+
+    @staticmethod
+    def generate_run(run_id: str) -> Run:
+        return Run(
+            run_info=RunInfo(
+                run_uuid=run_id,
+                experiment_id="0",
+                user_id="",
+                status="FINISHED",
+                start_time=0,
+                end_time=1,
+                lifecycle_stage="active",
+                artifact_uri=f"file:///mlruns/0/{run_id}/artifacts",
+                run_id=run_id,
+            ),
+            run_data=None,
+        )
+
+    def generate_pruneable(self) -> Pruneable:
+        model_version: ModelVersion = ModelVersion(
+            name="mock-model", version="1", creation_timestamp=0, last_updated_timestamp=1
+        )
+        return Pruneable(runs=[self.generate_run("1"), self.generate_run("2")], models=[model_version])
+
+    def test_is_resumable_empty(self):
+        self.assertEqual(self.journal.is_resumable(cutoff=0, ttl=30), False)
+
+    def test_resume_skips_completed(self):
+        self.journal.record_plan(pruneables=self.generate_pruneable(), cutoff=0, ttl=30)
+        self.journal.mark_done(kind="run", entity_id="1")
+        self.journal.mark_done(kind="model_version", entity_id="mock-model/1")
+
+        self.assertEqual(self.journal.is_resumable(cutoff=10, ttl=30), True)
+        pruneable: Pruneable = self.journal.load_plan()
+
+        self.assertEqual([run.info.run_id for run in pruneable.runs], ["2"])
+        self.assertEqual(pruneable.runs[0].info.artifact_uri, "file:///mlruns/0/2/artifacts")
+        self.assertEqual(pruneable.models, [])
+
+    def test_resume_registered_models(self):
+        pruneable: Pruneable = self.generate_pruneable()
+        pruneable.registered_models = ["mock-model"]
+        self.journal.record_plan(pruneables=pruneable, cutoff=0, ttl=30)
+
+        self.assertEqual(self.journal.load_plan().registered_models, ["mock-model"])
+
+    def test_record_plan_carries_pending_first(self):
+        self.journal.record_plan(pruneables=self.generate_pruneable(), cutoff=0, ttl=30)
+        self.journal.mark_done(kind="run", entity_id="1")
+
+        # Re-analysis finds a new run, the pending run "2" and the (already deleted) run "1" is gone
+        self.journal.record_plan(
+            pruneables=Pruneable(runs=[self.generate_run("3"), self.generate_run("2")], models=[]), cutoff=1, ttl=30
+        )
+
+        self.assertEqual([run.info.run_id for run in self.journal.load_plan().runs], ["2", "3"])
+
+    def test_is_resumable_stale(self):
+        self.journal.record_plan(pruneables=self.generate_pruneable(), cutoff=0, ttl=30)
+
+        # TTL change
+        self.assertEqual(self.journal.is_resumable(cutoff=10, ttl=10), False)
+        # Cut-off older than the maximum age
+        self.assertEqual(self.journal.is_resumable(cutoff=2000, ttl=30), False)
+
+    def test_is_resumable_complete(self):
+        self.journal.record_plan(pruneables=self.generate_pruneable(), cutoff=0, ttl=30)
+        for run_id in ["1", "2"]:
+            self.journal.mark_done(kind="run", entity_id=run_id)
+        self.journal.mark_done(kind="model_version", entity_id="mock-model/1")
+
+        self.assertEqual(self.journal.is_resumable(cutoff=10, ttl=30), False)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestJournal())
@@ -0,0 +1,70 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy
+
+from src.anaconda.mlflow.tracking.prune.dto.records import RunRecord, RunTable
+from src.anaconda.mlflow.tracking.prune.service.linkage import LinkageIndex
+
+
+class TestLinkage(unittest.TestCase):
+    @staticmethod
+    def generate_version(name: str, version: str, run_id: str) -> MagicMock:
+        model_version: MagicMock = MagicMock()
+        model_version.name = name
+        model_version.version = version
+        model_version.run_id = run_id
+        return model_version
+
+    def setUp(self) -> None:
+        self.index: LinkageIndex = LinkageIndex.from_model_versions(
+            [
+                self.generate_version(name="model-a", version="2", run_id="b" * 32),
+                self.generate_version(name="model-b", version="1", run_id="a" * 32),
+                self.generate_version(name="model-a", version="1", run_id="b" * 32),
+                self.generate_version(name="model-c", version="1", run_id="custom-run-id"),
+                self.generate_version(name="model-c", version="2", run_id=""),
+            ]
+        )
+
+    def test_contains(self):
+        self.assertIn("a" * 32, self.index)
+        self.assertIn("b" * 32, self.index)
+        self.assertIn("custom-run-id", self.index)
+        self.assertNotIn("c" * 32, self.index)
+        self.assertNotIn("", self.index)
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index, {"a" * 32, "b" * 32, "custom-run-id"})
+
+    def test_versions_of(self):
+        self.assertEqual(self.index.versions_of(run_id="b" * 32), [("model-a", "2"), ("model-a", "1")])
+        self.assertEqual(self.index.versions_of(run_id="a" * 32), [("model-b", "1")])
+        self.assertEqual(self.index.versions_of(run_id="custom-run-id"), [("model-c", "1")])
+        self.assertEqual(self.index.versions_of(run_id="c" * 32), [])
+
+    def test_linked_mask(self):
+        table: RunTable = RunTable(
+            [
+                RunRecord(run_id=run_id, experiment_id="1", end_time=0, status="FINISHED", artifact_uri="")
+                for run_id in ["a" * 32, "c" * 32, "custom-run-id", "other-run-id"]
+            ]
+        )
+
+        numpy.testing.assert_array_equal(self.index.linked_mask(table=table), [True, False, True, False])
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = str(Path(directory) / "linkage.npz")
+            self.index.save(path=path)
+            loaded: LinkageIndex = LinkageIndex.load(path=path)
+
+        self.assertEqual(loaded, self.index)
+        self.assertEqual(loaded.versions_of(run_id="b" * 32), [("model-a", "2"), ("model-a", "1")])
+        self.assertEqual(loaded.versions_of(run_id="custom-run-id"), [("model-c", "1")])
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestLinkage())
@@ -0,0 +1,74 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.anaconda.mlflow.tracking.prune.service.metrics import InstrumentedClient, PruneMetrics
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.metrics: PruneMetrics = PruneMetrics()
+
+    def test_instrumented_client(self):
+        mock_client: MagicMock = MagicMock()
+        mock_client.search_runs.return_value = "MOCK"
+        mock_client.delete_run.side_effect = ValueError("mock failure")
+        client: InstrumentedClient = InstrumentedClient(client=mock_client, metrics=self.metrics)
+
+        self.assertEqual(client.search_runs(experiment_ids=["1"]), "MOCK")
+        client.search_runs(experiment_ids=["2"])
+        with self.assertRaises(ValueError):
+            client.delete_run(run_id="1")
+
+        mock_client.search_runs.assert_called_with(experiment_ids=["2"])
+        self.assertEqual(self.metrics.calls["search_runs"].count, 2)
+        self.assertEqual(self.metrics.calls["search_runs"].errors, 0)
+        self.assertEqual(sum(self.metrics.calls["search_runs"].buckets), 2)
+        self.assertEqual(self.metrics.calls["delete_run"].errors, 1)
+
+    def test_phase_accumulates(self):
+        with self.metrics.phase("delete"):
+            pass
+        first: float = self.metrics.phases["delete"]
+        with self.metrics.phase("delete"):
+            pass
+
+        self.assertGreater(self.metrics.phases["delete"], first)
+
+    def test_write(self):
+        with self.metrics.phase("delete"):
+            self.metrics.count_entities(kind="run", outcome="deleted", count=3)
+        self.metrics.observe_call(method="delete_run", elapsed=0.02, error=False)
+        self.metrics.count_saved_calls(method="delete_model_version", count=5)
+
+        with tempfile.TemporaryDirectory() as directory:
+            textfile: Path = Path(directory) / "prune.prom"
+            summary: Path = Path(directory) / "prune.json"
+            self.metrics.write(textfile_path=str(textfile), summary_path=str(summary))
+
+            prometheus: str = textfile.read_text()
+            self.assertIn('mlflow_prune_entities_total{kind="run",outcome="deleted"} 3', prometheus)
+            self.assertIn('mlflow_prune_client_call_seconds_bucket{method="delete_run",le="0.01"} 0', prometheus)
+            self.assertIn('mlflow_prune_client_call_seconds_bucket{method="delete_run",le="0.025"} 1', prometheus)
+            self.assertIn('mlflow_prune_client_call_seconds_count{method="delete_run"} 1', prometheus)
+            self.assertIn('mlflow_prune_client_calls_saved_total{method="delete_model_version"} 5', prometheus)
+            self.assertIn("mlflow_prune_peak_rss_bytes", prometheus)
+
+            document: dict = json.loads(summary.read_text())
+            self.assertEqual(document["entities"], {"run.deleted": 3})
+            self.assertEqual(document["calls"]["delete_run"]["count"], 1)
+            self.assertEqual(document["calls_saved"], {"delete_model_version": 5})
+            self.assertIn("run", document["entities_per_second"])
+
+    @patch("src.anaconda.mlflow.tracking.prune.service.metrics.resource", None)
+    def test_peak_rss_unavailable(self):
+        self.assertIsNone(PruneMetrics.peak_rss())
+        self.assertIsNone(self.metrics.to_dict()["peak_rss_bytes"])
+        self.assertNotIn("mlflow_prune_peak_rss_bytes", self.metrics.to_prometheus())
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestMetrics())
@@ -0,0 +1,84 @@
+import unittest
+from test.utils.mocks import MockFactory
+from typing import Any, Optional
+from unittest.mock import MagicMock, patch
+
+from mlflow.entities import Experiment
+from mlflow.entities.model_registry import ModelVersion
+from mlflow.exceptions import MlflowException
+
+from anaconda.mlflow.tracking.sdk import build_mlflow_client
+from src.anaconda.mlflow.tracking.prune.dto.records import RunRecord
+from src.anaconda.mlflow.tracking.prune.service.client import PruneClient
+from src.anaconda.mlflow.tracking.prune.service.linkage import LinkageIndex
+from src.anaconda.mlflow.tracking.prune.service.pipeline import PipelinedEngine
+
+
+class TestPipelinedEngine(unittest.TestCase):
+    client: Optional[PruneClient]
+    factory: MockFactory = MockFactory()
+
+    def setUp(self) -> None:
+        self.client = PruneClient(client=build_mlflow_client())
+        self.client.client = MagicMock()
+
+    def test_prune(self):
+        mock_runs: list[RunRecord] = [
+            RunRecord(run_id=run_id, experiment_id="1", end_time=0, status="FINISHED", artifact_uri="")
+            for run_id in ["0" * 32, "1" * 32, "2" * 32]
+        ]
+        mock_model_version: ModelVersion = self.factory.generate_mock_model_version()
+        mock_model_version._run_id = "0" * 32
+
+        def mock_get_pruneable_models(self: Any) -> tuple[list[ModelVersion], list[ModelVersion]]:
+            self.linkage_index = LinkageIndex.from_model_versions([mock_model_version])
+            return [mock_model_version], [mock_model_version]
+
+        def mock_get_experiments(self: Any) -> list[Experiment]:
+            return [MagicMock(experiment_id="1")]
+
+        def mock_iter_stale_runs(self: Any, experiment_ids: list[str], run_view_type: int):
+            yield mock_runs[:2]
+            yield mock_runs[2:]
+
+        with patch.multiple(
+            "src.anaconda.mlflow.tracking.prune.service.client.PruneClient",
+            get_pruneable_models=mock_get_pruneable_models,
+            get_experiments=mock_get_experiments,
+            iter_stale_runs=mock_iter_stale_runs,
+        ):
+            PipelinedEngine(queue_size=1).prune(pruner=self.client, dry_run=False)
+
+        mock_client: MagicMock = self.client.client
+        mock_client.delete_model_version.assert_called_once_with(
+            name=mock_model_version.name, version=mock_model_version.version
+        )
+        self.assertEqual(
+            sorted(call.kwargs["run_id"] for call in mock_client.delete_run.call_args_list), ["1" * 32, "2" * 32]
+        )
+
+    def test_prune_discovery_failure(self):
+        def mock_get_pruneable_models(self: Any) -> tuple[list[ModelVersion], list[ModelVersion]]:
+            self.linkage_index = LinkageIndex()
+            return [], []
+
+        def mock_get_experiments(self: Any) -> list[Experiment]:
+            return [MagicMock(experiment_id="1")]
+
+        def mock_iter_stale_runs(self: Any, experiment_ids: list[str], run_view_type: int):
+            yield [RunRecord(run_id="1" * 32, experiment_id="1", end_time=0, status="FINISHED", artifact_uri="")]
+            raise MlflowException("mock failure")
+
+        with patch.multiple(
+            "src.anaconda.mlflow.tracking.prune.service.client.PruneClient",
+            get_pruneable_models=mock_get_pruneable_models,
+            get_experiments=mock_get_experiments,
+            iter_stale_runs=mock_iter_stale_runs,
+        ):
+            with self.assertRaises(MlflowException):
+                PipelinedEngine().prune(pruner=self.client, dry_run=False)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestPipelinedEngine())
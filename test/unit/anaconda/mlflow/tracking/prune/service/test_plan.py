@@ -0,0 +1,105 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from mlflow.entities import Run, RunInfo
+from mlflow.entities.model_registry import ModelVersion
+
+from src.anaconda.mlflow.tracking.prune.dto.pruneable import Pruneable
+from src.anaconda.mlflow.tracking.prune.dto.records import ModelVersionRecord, RunRecord
+from src.anaconda.mlflow.tracking.prune.service.plan import PrunePlan
+
+
+class TestPrunePlan(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path: str = str(Path(self.directory.name) / "plan.bin")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    @staticmethod
+    def generate_run(run_id: str, experiment_id: str = "0") -> Run:
+        return Run(
+            run_info=RunInfo(
+                run_uuid=run_id,
+                experiment_id=experiment_id,
+                user_id="",
+                status="FINISHED",
+                start_time=0,
+                end_time=1,
+                lifecycle_stage="active",
+                artifact_uri=f"file:///mlruns/{experiment_id}/{run_id}/artifacts",
+                run_id=run_id,
+            ),
+            run_data=None,
+        )
+
+    def generate_pruneable(self) -> Pruneable:
+        model_version: ModelVersion = ModelVersion(
+            name="mock-model", version="1", creation_timestamp=0, last_updated_timestamp=1
+        )
+        runs: list[Run] = [self.generate_run(f"{index:032x}", experiment_id=str(index % 3)) for index in range(5)]
+        return Pruneable(
+            runs=runs + [self.generate_run("legacy-id")], models=[model_version], registered_models=["mock-model"]
+        )
+
+    def test_round_trip(self):
+        PrunePlan.write(path=self.path, pruneables=self.generate_pruneable(), cutoff=100, ttl=30, tracking_uri="uri")
+
+        plan: PrunePlan = PrunePlan(path=self.path)
+        self.assertEqual(len(plan.runs), 6)
+        self.assertEqual(len(plan.models), 1)
+        self.assertEqual([run.info.run_id for run in plan.runs][-1], "legacy-id")
+        self.assertEqual(
+            list(plan.runs)[2],
+            RunRecord(
+                run_id=f"{2:032x}",
+                experiment_id="2",
+                end_time=1,
+                status="FINISHED",
+                artifact_uri=f"file:///mlruns/2/{2:032x}/artifacts",
+            ),
+        )
+        self.assertEqual(
+            list(plan.models), [ModelVersionRecord(name="mock-model", version="1", last_updated_timestamp=1)]
+        )
+        self.assertEqual(plan.registered_models, ["mock-model"])
+        plan.close()
+
+    def test_streams_blocks(self):
+        PrunePlan.write(
+            path=self.path, pruneables=self.generate_pruneable(), cutoff=100, ttl=30, tracking_uri="uri", block_size=2
+        )
+
+        plan: PrunePlan = PrunePlan(path=self.path)
+        self.assertEqual(len([block for block in plan.footer["blocks"] if block["kind"] == "run"]), 3)
+        self.assertEqual(len(list(plan.runs)), 6)
+        # Sections are re-iterable
+        self.assertEqual(len(list(plan.runs)), 6)
+        plan.close()
+
+    def test_validate_rejects_mismatch(self):
+        PrunePlan.write(path=self.path, pruneables=self.generate_pruneable(), cutoff=100, ttl=30, tracking_uri="uri")
+        plan: PrunePlan = PrunePlan(path=self.path)
+
+        plan.validate(cutoff=150, ttl=30, tracking_uri="uri", max_age=100)
+        with self.assertRaises(ValueError):
+            plan.validate(cutoff=150, ttl=30, tracking_uri="other-uri")
+        with self.assertRaises(ValueError):
+            plan.validate(cutoff=150, ttl=7, tracking_uri="uri")
+        with self.assertRaises(ValueError):
+            plan.validate(cutoff=50, ttl=30, tracking_uri="uri")
+        with self.assertRaises(ValueError):
+            plan.validate(cutoff=1000, ttl=30, tracking_uri="uri", max_age=100)
+        plan.close()
+
+    def test_rejects_foreign_file(self):
+        Path(self.path).write_bytes(b"not a plan file at all")
+
+        with self.assertRaises(ValueError):
+            PrunePlan(path=self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import tempfile
+import unittest
+from pathlib import Path
+from time import perf_counter
+
+import numpy
+
+from src.anaconda.mlflow.tracking.prune.dto.records import ModelVersionRecord, RunRecord, RunTable
+from src.anaconda.mlflow.tracking.prune.service.policy import DAY, RetentionPolicy
+
+NOW: int = 1000 * DAY
+
+
+class TestRetentionPolicy(unittest.TestCase):
+    @staticmethod
+    def generate_run(index: int, experiment_id: str, status: str, age: int) -> RunRecord:
+        run_id: str = f"{index:032x}"
+        return RunRecord(
+            run_id=run_id,
+            experiment_id=experiment_id,
+            end_time=NOW - age * DAY,
+            status=status,
+            artifact_uri=f"file:///mlruns/{experiment_id}/{run_id}/artifacts",
+        )
+
+    def test_from_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path: Path = Path(directory) / "policy.yaml"
+            path.write_text("status_ttls:\n  KILLED: 7\nexperiment_ttls:\n  12: 365\nexempt_tags:\n  retain: true\n")
+
+            policy: RetentionPolicy = RetentionPolicy.from_file(path=str(path), ttl=30)
+
+            self.assertEqual(policy.statuses, ("FINISHED", "FAILED", "KILLED"))
+            self.assertEqual(policy.experiment_ttls, {"12": 365})
+            self.assertEqual(policy.exempt_tags, {"retain": "true"})
+            self.assertEqual(policy.run_cutoff(now=NOW), NOW - 7 * DAY)
+
+            path.write_text("ttls: 5\n")
+            with self.assertRaises(ValueError):
+                RetentionPolicy.from_file(path=str(path), ttl=30)
+
+    def test_evaluate_runs(self):
+        policy: RetentionPolicy = RetentionPolicy(ttl=30, status_ttls={"KILLED": 7}, experiment_ttls={"1": 365})
+        table: RunTable = RunTable(
+            [
+                self.generate_run(0, experiment_id="0", status="FINISHED", age=31),  # stale by default TTL
+                self.generate_run(1, experiment_id="0", status="FINISHED", age=29),  # not stale
+                self.generate_run(2, experiment_id="1", status="FAILED", age=100),  # experiment TTL of 365 days
+                self.generate_run(3, experiment_id="1", status="KILLED", age=8),  # KILLED TTL of 7 days
+                self.generate_run(4, experiment_id="0", status="RUNNING", age=100),  # not a candidate status
+            ]
+        )
+
+        mask: numpy.ndarray = policy.evaluate_runs(table=table, now=NOW)
+
+        self.assertEqual(mask.tolist(), [True, False, False, True, False])
+        self.assertEqual(
+            [run.run_id for run in RetentionPolicy.select_runs(table=table, mask=mask)], [f"{0:032x}", f"{3:032x}"]
+        )
+
+    def test_evaluate_runs_empty(self):
+        policy: RetentionPolicy = RetentionPolicy(ttl=30)
+
+        self.assertEqual(policy.evaluate_runs(table=RunTable(), now=NOW).tolist(), [])
+
+    def test_select_runs_reindexes_overrides(self):
+        policy: RetentionPolicy = RetentionPolicy(ttl=30)
+        table: RunTable = RunTable(
+            [
+                self.generate_run(0, experiment_id="0", status="FINISHED", age=1),
+                RunRecord(run_id="legacy", experiment_id="0", end_time=0, status="FINISHED", artifact_uri="s3://x"),
+            ]
+        )
+
+        selected: RunTable = RetentionPolicy.select_runs(table=table, mask=policy.evaluate_runs(table=table, now=NOW))
+
+        self.assertEqual(
+            list(selected),
+            [RunRecord(run_id="legacy", experiment_id="0", end_time=0, status="FINISHED", artifact_uri="s3://x")],
+        )
+
+    def test_pruneable_runs(self):
+        policy: RetentionPolicy = RetentionPolicy(ttl=30, experiment_ttls={"1": 365})
+        runs: list[RunRecord] = [
+            self.generate_run(0, experiment_id="0", status="FINISHED", age=31),
+            self.generate_run(1, experiment_id="1", status="FINISHED", age=31),
+        ]
+
+        self.assertEqual(policy.pruneable_runs(runs=runs, now=NOW), runs[:1])
+        pruneable_table: RunTable = policy.pruneable_runs(runs=RunTable(runs), now=NOW)
+        self.assertIsInstance(pruneable_table, RunTable)
+        self.assertEqual(list(pruneable_table), runs[:1])
+
+    def test_evaluate_model_versions(self):
+        policy: RetentionPolicy = RetentionPolicy(ttl=30, model_ttls={"kept": 365})
+        versions: list[ModelVersionRecord] = [
+            ModelVersionRecord(name="model", version="1", last_updated_timestamp=NOW - 31 * DAY),
+            ModelVersionRecord(
+                name="model", version="2", last_updated_timestamp=NOW - 31 * DAY, current_stage="Production"
+            ),
+            ModelVersionRecord(name="kept", version="1", last_updated_timestamp=NOW - 31 * DAY),
+            ModelVersionRecord(name="model", version="3", last_updated_timestamp=NOW - DAY),
+        ]
+
+        self.assertEqual(
+            policy.evaluate_model_versions(versions=versions, now=NOW).tolist(), [True, False, False, False]
+        )
+
+    def test_is_exempt(self):
+        policy: RetentionPolicy = RetentionPolicy(ttl=30, exempt_tags={"retain": "true"})
+
+        self.assertEqual(policy.is_exempt({"retain": "true"}), True)
+        self.assertEqual(policy.is_exempt({"retain": "false"}), False)
+        self.assertEqual(policy.is_exempt(None), False)
+
+    def test_evaluate_runs_scale(self):
+        policy: RetentionPolicy = RetentionPolicy(ttl=30, status_ttls={"KILLED": 7}, experiment_ttls={"1": 365})
+        table: RunTable = RunTable([self.generate_run(0, experiment_id="0", status="FINISHED", age=31)])
+        table.ids = bytearray(16 * 1_000_000)
+        table.end_times = table.end_times * 1_000_000
+        table.experiments = table.experiments * 1_000_000
+        table.statuses = table.statuses * 1_000_000
+
+        start: float = perf_counter()
+        mask: numpy.ndarray = policy.evaluate_runs(table=table, now=NOW)
+        elapsed: float = perf_counter() - start
+
+        self.assertEqual(int(mask.sum()), 1_000_000)
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
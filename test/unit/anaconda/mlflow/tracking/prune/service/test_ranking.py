@@ -0,0 +1,63 @@
+import unittest
+from typing import Optional
+from unittest.mock import MagicMock
+
+from mlflow.entities import Metric, Run, RunData, RunInfo
+from mlflow.store.entities import PagedList
+
+from src.anaconda.mlflow.tracking.prune.service.ranking import BestRunRetention
+
+
+class TestBestRunRetention(unittest.TestCase):
+    @staticmethod
+    def generate_run(run_id: str, accuracy: Optional[float]) -> Run:
+        return Run(
+            run_info=RunInfo(
+                run_uuid=run_id,
+                experiment_id="0",
+                user_id="",
+                status="FINISHED",
+                start_time=0,
+                end_time=1,
+                lifecycle_stage="active",
+                run_id=run_id,
+            ),
+            run_data=RunData(metrics=[] if accuracy is None else [Metric("accuracy", accuracy, 0, 0)]),
+        )
+
+    def test_rank_streams_every_page(self):
+        client: MagicMock = MagicMock()
+        client.search_runs.side_effect = [
+            PagedList[Run](items=[self.generate_run("a", 0.5), self.generate_run("b", 0.9)], token="next"),
+            PagedList[Run](items=[self.generate_run("c", None), self.generate_run("d", 0.7)], token=None),
+        ]
+        retention: BestRunRetention = BestRunRetention(metric="accuracy", keep=2, server_order=False)
+
+        self.assertEqual(retention.rank(client=client, experiment_id="0", page_size=2), {"b", "d"})
+        self.assertEqual(client.search_runs.call_count, 2)
+        self.assertEqual(client.search_runs.call_args_list[0].kwargs["order_by"], None)
+
+    def test_rank_minimize(self):
+        client: MagicMock = MagicMock()
+        client.search_runs.return_value = PagedList[Run](
+            items=[self.generate_run("a", 0.5), self.generate_run("b", 0.9), self.generate_run("c", 0.1)], token=None
+        )
+        retention: BestRunRetention = BestRunRetention(metric="accuracy", keep=1, maximize=False, server_order=False)
+
+        self.assertEqual(retention.rank(client=client, experiment_id="0", page_size=10), {"c"})
+
+    def test_rank_server_order_reads_one_page(self):
+        client: MagicMock = MagicMock()
+        client.search_runs.return_value = PagedList[Run](
+            items=[self.generate_run("b", 0.9), self.generate_run("a", 0.5)], token="next"
+        )
+        retention: BestRunRetention = BestRunRetention(metric="accuracy", keep=2)
+
+        self.assertEqual(retention.best_run_ids(client=client, experiment_ids=["0", "0"], page_size=1000), {"a", "b"})
+        client.search_runs.assert_called_once()
+        self.assertEqual(client.search_runs.call_args.kwargs["order_by"], ["metrics.`accuracy` DESC"])
+        self.assertEqual(client.search_runs.call_args.kwargs["max_results"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
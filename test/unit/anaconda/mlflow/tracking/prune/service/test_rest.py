@@ -0,0 +1,114 @@
+import os
+import unittest
+from test.utils.fake import FakeMlflowClient
+from test.utils.server import FakeTrackingServer
+from unittest.mock import MagicMock, patch
+
+from mlflow.exceptions import MlflowException
+
+from anaconda.mlflow.tracking.sdk import build_mlflow_client
+from src.anaconda.mlflow.tracking.prune.dto.prune_result import PruneResult
+from src.anaconda.mlflow.tracking.prune.service.audit import DecisionLog
+from src.anaconda.mlflow.tracking.prune.service.client import STALE_RUN_STATUSES, PruneClient
+from src.anaconda.mlflow.tracking.prune.service.rest import AsyncRestEngine
+from src.anaconda.mlflow.tracking.prune.service.throttle import RequestController
+
+
+class TestAsyncRestEngine(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ["MLFLOW_TRACKING_ENTITY_TTL"] = "30"
+        self.fake: FakeMlflowClient = FakeMlflowClient.generate(
+            experiments=4, runs_per_experiment=60, models=5, versions_per_model=4, ttl=30
+        )
+        self.pruner: PruneClient = PruneClient(
+            client=build_mlflow_client(), page_size=25, decision_log=DecisionLog(level="WARNING")
+        )
+
+    def expected(self) -> tuple[set[str], set[str]]:
+        cutoff: float = self.pruner.oldest_allowed_timestamp
+        versions: list = [version for versions in self.fake.models.values() for version in versions]
+        linked_run_ids: set[str] = {version.run_id for version in versions if version.run_id}
+        run_ids: set[str] = {
+            run_id
+            for run_id, (_, end_time, status, lifecycle_stage) in self.fake.runs.items()
+            if status in STALE_RUN_STATUSES
+            and end_time < cutoff
+            and lifecycle_stage == "active"
+            and run_id not in linked_run_ids
+        }
+        version_ids: set[str] = {
+            f"{version.name}/{version.version}"
+            for version in versions
+            if version.current_stage == "None" and version.last_updated_timestamp < cutoff
+        }
+        return run_ids, version_ids
+
+    def test_prune(self):
+        run_ids, version_ids = self.expected()
+
+        with FakeTrackingServer(fake=self.fake, token="mock-token") as server:
+            engine: AsyncRestEngine = AsyncRestEngine(tracking_uri=server.uri, token="mock-token", concurrency=4)
+            result: PruneResult = engine.prune(pruner=self.pruner, dry_run=False)
+            engine.close()
+
+        self.assertEqual(result.succeeded.get("run", 0), len(run_ids))
+        self.assertEqual(result.succeeded.get("model_version", 0), len(version_ids))
+        self.assertEqual(result.failures, [])
+        self.assertEqual(
+            {run_id for run_id, (_, _, _, lifecycle_stage) in self.fake.runs.items() if lifecycle_stage == "deleted"},
+            run_ids,
+        )
+        remaining: set[str] = {
+            f"{version.name}/{version.version}" for versions in self.fake.models.values() for version in versions
+        }
+        self.assertTrue(remaining.isdisjoint(version_ids))
+
+    def test_pages_model_versions_before_deleting(self):
+        self.pruner.page_size = 5
+        run_ids, version_ids = self.expected()
+
+        with FakeTrackingServer(fake=self.fake) as server:
+            engine: AsyncRestEngine = AsyncRestEngine(tracking_uri=server.uri, concurrency=4)
+            result: PruneResult = engine.prune(pruner=self.pruner, dry_run=False)
+            engine.close()
+
+        # Deleting versions while paging would shift the search offsets (and skip versions)
+        last_search: int = max(
+            index for index, endpoint in enumerate(server.requests) if endpoint == "model-versions/search"
+        )
+        self.assertLess(last_search, server.requests.index("model-versions/delete"))
+        self.assertEqual(result.succeeded.get("model_version", 0), len(version_ids))
+        self.assertEqual(result.succeeded.get("run", 0), len(run_ids))
+
+    def test_dry_run(self):
+        with FakeTrackingServer(fake=self.fake) as server:
+            engine: AsyncRestEngine = AsyncRestEngine(tracking_uri=server.uri, concurrency=4)
+            result: PruneResult = engine.prune(pruner=self.pruner, dry_run=True)
+            engine.close()
+
+        self.assertEqual(result.succeeded, {})
+        self.assertNotIn("runs/delete", server.requests)
+        self.assertNotIn("model-versions/delete", server.requests)
+        self.assertEqual(self.pruner.decision_log.counts.get("dry_run", 0), sum(map(len, self.expected())))
+
+    @patch("src.anaconda.mlflow.tracking.prune.service.throttle.RequestController.backoff", return_value=0.0)
+    def test_retries_throttled_requests(self, mock_backoff: MagicMock):
+        self.pruner.controller = RequestController(max_limit=4)
+        run_ids, _ = self.expected()
+
+        with FakeTrackingServer(fake=self.fake) as server:
+            server.failures = [429, 503]
+            engine: AsyncRestEngine = AsyncRestEngine(tracking_uri=server.uri, concurrency=4)
+            result: PruneResult = engine.prune(pruner=self.pruner, dry_run=False)
+            engine.close()
+
+        self.assertEqual(mock_backoff.call_count, 2)
+        self.assertEqual(self.pruner.controller.retries, 2)
+        self.assertEqual(result.succeeded.get("run", 0), len(run_ids))
+
+    def test_unauthenticated(self):
+        with FakeTrackingServer(fake=self.fake, token="mock-token") as server:
+            engine: AsyncRestEngine = AsyncRestEngine(tracking_uri=server.uri, token="wrong-token")
+            with self.assertRaises(MlflowException):
+                engine.prune(pruner=self.pruner, dry_run=True)
+            engine.close()
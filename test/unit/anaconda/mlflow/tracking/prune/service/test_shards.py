@@ -0,0 +1,52 @@
+import unittest
+from threading import Event
+from typing import Optional
+
+from src.anaconda.mlflow.tracking.prune.dto.records import RunRecord
+from src.anaconda.mlflow.tracking.prune.service.audit import DecisionLog
+from src.anaconda.mlflow.tracking.prune.service.shards import ShardedScanner
+
+
+class TestShardedScanner(unittest.TestCase):
+    @staticmethod
+    def generate_run(experiment_id: str, status: str) -> RunRecord:
+        return RunRecord(
+            run_id=f"{experiment_id}-{status}", experiment_id=experiment_id, end_time=0, status=status, artifact_uri=""
+        )
+
+    def test_scan_merges_in_status_then_shard_order(self):
+        first_shard_released: Event = Event()
+
+        def search(experiment_ids: list[str], status: str, upcoming: Optional[dict[str, int]]) -> list[RunRecord]:
+            # The first shard completes last
+            if experiment_ids == ["1", "2"] and status == "FINISHED":
+                first_shard_released.wait(timeout=5)
+            elif experiment_ids == ["3"] and status == "FAILED":
+                first_shard_released.set()
+            for experiment_id in experiment_ids:
+                upcoming[experiment_id] = min(upcoming.get(experiment_id, 100), int(experiment_id) * 10)
+            return [self.generate_run(experiment_id=experiment_id, status=status) for experiment_id in experiment_ids]
+
+        decision_log: DecisionLog = DecisionLog()
+        upcoming: dict[str, int] = {"1": 5}
+        runs: list[RunRecord] = ShardedScanner(shard_size=2, concurrency=4).scan(
+            experiment_ids=["1", "2", "3"],
+            statuses=("FINISHED", "FAILED"),
+            search=search,
+            runs=[],
+            decision_log=decision_log,
+            upcoming=upcoming,
+        )
+
+        self.assertEqual(
+            [run.info.run_id for run in runs],
+            ["1-FINISHED", "2-FINISHED", "3-FINISHED", "1-FAILED", "2-FAILED", "3-FAILED"],
+        )
+        self.assertEqual(upcoming, {"1": 5, "2": 20, "3": 30})
+        self.assertEqual(decision_log.summary(), {"shard_scanned": 4})
+        decision_log.close()
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestShardedScanner())
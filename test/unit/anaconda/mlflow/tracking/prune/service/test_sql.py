@@ -0,0 +1,140 @@
+import tempfile
+import unittest
+from pathlib import Path
+from time import time
+from typing import Optional
+from unittest.mock import patch
+
+from mlflow import MlflowClient
+from mlflow.exceptions import MlflowException
+from sqlalchemy import text
+
+from src.anaconda.mlflow.tracking.prune.dto.pruneable import Pruneable
+from src.anaconda.mlflow.tracking.prune.dto.purge_result import PurgeResult
+from src.anaconda.mlflow.tracking.prune.service.client import PruneClient
+from src.anaconda.mlflow.tracking.prune.service.sql import SqlPruneEngine
+
+
+class TestSql(unittest.TestCase):
+    engine: Optional[SqlPruneEngine]
+    mlflow_client: Optional[MlflowClient]
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.database_uri: str = f"sqlite:///{Path(self.directory.name) / 'mlflow.db'}"
+
+        # Creating a client against the SQLite store initializes the MLFlow schema
+        self.mlflow_client = MlflowClient(tracking_uri=self.database_uri, registry_uri=self.database_uri)
+        experiment_id: str = self.mlflow_client.create_experiment(
+            name="mock-experiment", artifact_location=(Path(self.directory.name) / "artifacts").as_uri()
+        )
+
+        # A stale run, a stale run linked to a model version, a fresh run and a stale killed run
+        self.stale_run_id: str = self.create_run(experiment_id=experiment_id, status="FINISHED", end_time=1)
+        self.linked_run_id: str = self.create_run(experiment_id=experiment_id, status="FAILED", end_time=1)
+        self.create_run(experiment_id=experiment_id, status="FINISHED", end_time=None)
+        self.create_run(experiment_id=experiment_id, status="KILLED", end_time=1)
+
+        # A stale model version without a stage, and a stale model version with a stage
+        self.mlflow_client.create_registered_model(name="mock-model")
+        self.mlflow_client.create_model_version(name="mock-model", source="mock-source", run_id=self.linked_run_id)
+        self.mlflow_client.create_model_version(name="mock-model", source="mock-source")
+        self.mlflow_client.transition_model_version_stage(name="mock-model", version="2", stage="Production")
+
+        self.engine = SqlPruneEngine(database_uri=self.database_uri, batch_size=1)
+        with self.engine.engine.begin() as connection:
+            connection.execute(text("UPDATE model_versions SET last_updated_time = 1"))
+
+    def tearDown(self) -> None:
+        self.engine.engine.dispose()
+        self.directory.cleanup()
+
+    def create_run(self, experiment_id: str, status: str, end_time: Optional[int]) -> str:
+        run_id: str = self.mlflow_client.create_run(experiment_id=experiment_id, start_time=0).info.run_id
+        self.mlflow_client.set_terminated(run_id=run_id, status=status, end_time=end_time)
+        return run_id
+
+    def test_get_pruneables_matches_rest_engine(self):
+        rest_client: PruneClient = PruneClient(client=self.mlflow_client, compact_records=True)
+
+        sql_pruneable: Pruneable = self.engine.get_pruneables(cutoff=rest_client.oldest_allowed_timestamp)
+        rest_pruneable: Pruneable = rest_client.get_pruneables()
+
+        self.assertEqual(
+            sorted(run.info.run_id for run in sql_pruneable.runs),
+            sorted(run.info.run_id for run in rest_pruneable.runs),
+        )
+        self.assertEqual(
+            sorted((model.name, model.version) for model in sql_pruneable.models),
+            sorted((model.name, model.version) for model in rest_pruneable.models),
+        )
+        self.assertEqual([run.info.run_id for run in sql_pruneable.runs], [self.stale_run_id])
+        self.assertEqual([(model.name, model.version) for model in sql_pruneable.models], [("mock-model", "1")])
+
+    def test_soft_delete_runs(self):
+        count: int = self.engine.soft_delete_runs(run_ids=[self.stale_run_id])
+
+        self.assertEqual(count, 1)
+        self.assertEqual(self.mlflow_client.get_run(run_id=self.stale_run_id).info.lifecycle_stage, "deleted")
+        self.assertEqual(self.engine.soft_delete_runs(run_ids=[self.stale_run_id]), 0)
+
+    def test_delete_runs(self):
+        outcomes: list[tuple[str, Optional[Exception]]] = []
+
+        def account(run_id: str, error: Optional[Exception]) -> None:
+            outcomes.append((run_id, error))
+
+        self.engine.delete_runs(run_ids=[self.stale_run_id, self.linked_run_id], account=account)
+
+        self.assertEqual(outcomes, [(self.stale_run_id, None), (self.linked_run_id, None)])
+        self.assertEqual(self.mlflow_client.get_run(run_id=self.linked_run_id).info.lifecycle_stage, "deleted")
+
+        # A failed batch is accounted as a failure of each of its runs
+        outcomes.clear()
+        error: MlflowException = MlflowException("mock failure")
+        with patch.object(self.engine, "soft_delete_runs", side_effect=error):
+            self.engine.delete_runs(run_ids=[self.stale_run_id], account=account)
+        self.assertEqual(outcomes, [(self.stale_run_id, error)])
+
+    def test_prune_with_sql_engine(self):
+        client: PruneClient = PruneClient(client=self.mlflow_client, sql_engine=self.engine)
+
+        client.prune(pruneables=client.get_pruneables(), dry_run=False)
+
+        self.assertEqual(self.mlflow_client.get_run(run_id=self.stale_run_id).info.lifecycle_stage, "deleted")
+        self.assertEqual(self.mlflow_client.get_run(run_id=self.linked_run_id).info.lifecycle_stage, "active")
+
+        # The deleted model version no longer holds back its run
+        pruneable: Pruneable = self.engine.get_pruneables(cutoff=client.oldest_allowed_timestamp)
+        self.assertEqual([run.info.run_id for run in pruneable.runs], [self.linked_run_id])
+
+    def test_purge_deleted_runs(self):
+        self.mlflow_client.log_param(run_id=self.stale_run_id, key="mock-param", value="1")
+        self.mlflow_client.log_metric(run_id=self.stale_run_id, key="mock-metric", value=1.0)
+        self.engine.soft_delete_runs(run_ids=[self.stale_run_id])
+        older_than: float = time() * 1000 + 1000
+
+        # Within the grace period
+        self.assertEqual(self.engine.purge_deleted_runs(older_than=0, dry_run=False).runs, 0)
+
+        # Dry run
+        dry_run_result: PurgeResult = self.engine.purge_deleted_runs(older_than=older_than, dry_run=True)
+        self.assertEqual(dry_run_result.runs, 1)
+        self.assertEqual(dry_run_result.rows, 0)
+
+        # Purge
+        result: PurgeResult = self.engine.purge_deleted_runs(older_than=older_than, dry_run=False)
+        self.assertEqual(result.runs, 1)
+        self.assertEqual(result.batches, 1)
+        with self.engine.engine.connect() as connection:
+            for table in ["runs", "params", "metrics", "latest_metrics", "tags"]:
+                count: int = connection.execute(
+                    text(f"SELECT COUNT(*) FROM {table} WHERE run_uuid = :run_id"), {"run_id": self.stale_run_id}
+                ).scalar()
+                self.assertEqual(count, 0)
+            self.assertEqual(connection.execute(text("SELECT COUNT(*) FROM runs")).scalar(), 3)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestSql())
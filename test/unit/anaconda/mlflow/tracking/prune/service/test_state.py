@@ -0,0 +1,44 @@
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Optional
+
+from src.anaconda.mlflow.tracking.prune.service.state import ScanState
+
+
+class TestState(unittest.TestCase):
+    state: Optional[ScanState]
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path: str = str(Path(self.directory.name) / "state.db")
+        self.state = ScanState(path=self.path)
+
+    def tearDown(self) -> None:
+        self.state.close()
+        self.directory.cleanup()
+
+    def test_empty(self):
+        self.assertEqual(self.state.get_watermarks(experiment_ids=["1"]), {})
+        self.assertEqual(self.state.get_held_run_ids(), set())
+
+    def test_commit_is_persisted(self):
+        self.state.stage(cutoff=100, experiment_ids=["1", "2"], held_run_ids=["mock_run_id_1"])
+        self.state.commit(failed_run_ids=["mock_run_id_2"])
+        self.state.close()
+
+        self.state = ScanState(path=self.path)
+        self.assertEqual(self.state.get_watermarks(experiment_ids=["1", "3"]), {"1": 100})
+        self.assertEqual(self.state.get_held_run_ids(), {"mock_run_id_1", "mock_run_id_2"})
+
+    def test_uncommitted_stage_is_discarded(self):
+        self.state.stage(cutoff=100, experiment_ids=["1"], held_run_ids=[])
+        self.state.close()
+
+        self.state = ScanState(path=self.path)
+        self.assertEqual(self.state.get_watermarks(experiment_ids=["1"]), {})
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestState())
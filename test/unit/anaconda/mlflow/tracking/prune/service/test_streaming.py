@@ -0,0 +1,82 @@
+import unittest
+from test.utils.mocks import MockFactory
+from typing import Any, Optional
+from unittest.mock import MagicMock, patch
+
+from mlflow.entities import Experiment, Run, ViewType
+from mlflow.entities.model_registry import ModelVersion
+
+from anaconda.mlflow.tracking.sdk import build_mlflow_client
+from src.anaconda.mlflow.tracking.prune.dto.records import RunRecord
+from src.anaconda.mlflow.tracking.prune.service.client import PruneClient
+from src.anaconda.mlflow.tracking.prune.service.linkage import LinkageIndex
+from src.anaconda.mlflow.tracking.prune.service.streaming import StreamingEngine
+
+
+class TestStreamingEngine(unittest.TestCase):
+    client: Optional[PruneClient]
+    factory: MockFactory = MockFactory()
+
+    def setUp(self) -> None:
+        self.client = PruneClient(client=build_mlflow_client())
+        self.client.client = MagicMock()
+        self.engine: StreamingEngine = StreamingEngine()
+
+    def test_iter_pruneable_runs(self):
+        mock_runs: list[RunRecord] = [
+            RunRecord(run_id=run_id, experiment_id="1", end_time=0, status="FINISHED", artifact_uri="")
+            for run_id in ["0" * 32, "1" * 32, "2" * 32]
+        ]
+        self.client.linkage_index = LinkageIndex()
+        self.client.linkage_index.add([MagicMock(run_id="0" * 32)])
+
+        def mock_get_experiments(self: Any) -> list[Experiment]:
+            return [MagicMock(experiment_id="1")]
+
+        def mock_iter_stale_runs(self: Any, experiment_ids: list[str], run_view_type: int):
+            self_test.assertEqual(run_view_type, ViewType.ALL)
+            yield mock_runs[:1]
+            yield mock_runs[1:]
+
+        self_test: unittest.TestCase = self
+        with patch.multiple(
+            "src.anaconda.mlflow.tracking.prune.service.client.PruneClient",
+            get_experiments=mock_get_experiments,
+            iter_stale_runs=mock_iter_stale_runs,
+        ):
+            pages: list[list[Run]] = list(
+                self.engine.iter_pruneable_runs(pruner=self.client, run_view_type=ViewType.ALL)
+            )
+
+        # Pages left empty by the linkage are not yielded
+        self.assertEqual(pages, [mock_runs[1:]])
+
+    def test_prune(self):
+        mock_run: Run = self.factory.generate_mock_run()
+        mock_run._info = MagicMock()
+        mock_run.info.run_id = "1"
+        mock_model_version: ModelVersion = self.factory.generate_mock_model_version()
+
+        def mock_get_pruneable_models(self: Any) -> tuple[list[ModelVersion], list[ModelVersion]]:
+            return [mock_model_version], [mock_model_version]
+
+        def mock_iter_pruneable_runs(pruner: PruneClient, run_view_type: int):
+            yield [mock_run]
+
+        with patch(
+            "src.anaconda.mlflow.tracking.prune.service.client.PruneClient.get_pruneable_models",
+            mock_get_pruneable_models,
+        ):
+            with patch.object(StreamingEngine, "iter_pruneable_runs", staticmethod(mock_iter_pruneable_runs)):
+                self.engine.prune(pruner=self.client, dry_run=False)
+
+        mock_client: MagicMock = self.client.client
+        mock_client.delete_model_version.assert_called_once_with(
+            name=mock_model_version.name, version=mock_model_version.version
+        )
+        mock_client.delete_run.assert_called_once_with(run_id="1")
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestStreamingEngine())
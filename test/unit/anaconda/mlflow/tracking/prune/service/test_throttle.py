@@ -0,0 +1,105 @@
+import asyncio
+import os
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from mlflow.exceptions import MlflowException
+from mlflow.protos.databricks_pb2 import REQUEST_LIMIT_EXCEEDED, RESOURCE_DOES_NOT_EXIST, TEMPORARILY_UNAVAILABLE
+
+from src.anaconda.mlflow.tracking.prune.service.metrics import InstrumentedClient, PruneMetrics
+from src.anaconda.mlflow.tracking.prune.service.throttle import RequestController
+
+
+@patch("src.anaconda.mlflow.tracking.prune.service.throttle.sleep")
+class TestRequestController(unittest.TestCase):
+    def test_retries_throttled_calls(self, mock_sleep: MagicMock):
+        controller: RequestController = RequestController(max_limit=4, max_retries=3)
+        function: MagicMock = MagicMock(
+            side_effect=[
+                MlflowException("throttled", error_code=REQUEST_LIMIT_EXCEEDED),
+                MlflowException("unavailable", error_code=TEMPORARILY_UNAVAILABLE),
+                "MOCK",
+            ]
+        )
+
+        self.assertEqual(controller.call(function), "MOCK")
+        self.assertEqual(function.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(controller.retries, 2)
+        self.assertEqual(controller.in_flight, 0)
+
+    def test_does_not_retry_client_errors(self, mock_sleep: MagicMock):
+        controller: RequestController = RequestController(max_limit=4)
+        function: MagicMock = MagicMock(side_effect=MlflowException("missing", error_code=RESOURCE_DOES_NOT_EXIST))
+
+        with self.assertRaises(MlflowException):
+            controller.call(function)
+        self.assertEqual(function.call_count, 1)
+        mock_sleep.assert_not_called()
+        self.assertEqual(controller.in_flight, 0)
+
+        # Client errors are not healthy latency samples
+        self.assertEqual(controller.limit, 1.0)
+        self.assertEqual(controller.latency, None)
+
+    def test_client_retries_disabled(self, mock_sleep: MagicMock):
+        with patch.dict("os.environ", {"MLFLOW_HTTP_REQUEST_MAX_RETRIES": "5"}):
+            with RequestController.client_retries_disabled():
+                self.assertEqual(os.environ["MLFLOW_HTTP_REQUEST_MAX_RETRIES"], "0")
+
+            # The previous setting is restored
+            self.assertEqual(os.environ["MLFLOW_HTTP_REQUEST_MAX_RETRIES"], "5")
+
+        with patch.dict("os.environ", {}, clear=True):
+            with RequestController.client_retries_disabled():
+                self.assertEqual(os.environ["MLFLOW_HTTP_REQUEST_MAX_RETRIES"], "0")
+
+            self.assertNotIn("MLFLOW_HTTP_REQUEST_MAX_RETRIES", os.environ)
+
+    def test_retries_throttled_async_calls(self, mock_sleep: MagicMock):
+        controller: RequestController = RequestController(max_limit=4, base_delay=0.0)
+        function: AsyncMock = AsyncMock(
+            side_effect=[MlflowException("throttled", error_code=REQUEST_LIMIT_EXCEEDED), "MOCK"]
+        )
+
+        self.assertEqual(asyncio.run(controller.call_async(function)), "MOCK")
+        self.assertEqual(function.await_count, 2)
+        self.assertEqual(controller.retries, 1)
+        self.assertEqual(controller.in_flight, 0)
+
+    def test_gives_up_after_max_retries(self, mock_sleep: MagicMock):
+        controller: RequestController = RequestController(max_retries=2)
+        function: MagicMock = MagicMock(side_effect=MlflowException("throttled", error_code=REQUEST_LIMIT_EXCEEDED))
+
+        with self.assertRaises(MlflowException):
+            controller.call(function)
+        self.assertEqual(function.call_count, 3)
+
+    def test_aimd(self, mock_sleep: MagicMock):
+        controller: RequestController = RequestController(max_limit=8, latency_target=10.0)
+        for _ in range(100):
+            controller.call(lambda: None)
+        self.assertEqual(controller.limit, 8.0)
+
+        controller.acquire()
+        controller.release(elapsed=0.0, congested=True)
+        self.assertEqual(controller.limit, 4.0)
+        self.assertEqual(controller.decreases, 1)
+
+    def test_backoff_is_bounded(self, mock_sleep: MagicMock):
+        controller: RequestController = RequestController(base_delay=1.0, max_delay=5.0)
+
+        self.assertTrue(all(0 <= controller.backoff(attempt) <= 5.0 for attempt in range(10)))
+
+    def test_instrumented_client(self, mock_sleep: MagicMock):
+        metrics: PruneMetrics = PruneMetrics()
+        mock_client: MagicMock = MagicMock()
+        mock_client.delete_run.side_effect = [MlflowException("throttled", error_code=REQUEST_LIMIT_EXCEEDED), None]
+        client: InstrumentedClient = InstrumentedClient(
+            client=mock_client, metrics=metrics, controller=RequestController()
+        )
+
+        client.delete_run(run_id="1")
+
+        self.assertEqual(metrics.calls["delete_run"].count, 2)
+        self.assertEqual(metrics.calls["delete_run"].errors, 1)
@@ -0,0 +1,54 @@
+import os
+import unittest
+from test.benchmark.benchmark import Benchmark
+from test.utils.fake import FakeMlflowClient
+
+from mlflow.entities import ViewType
+from mlflow.store.entities import PagedList
+
+
+class TestBenchmark(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ["MLFLOW_TRACKING_ENTITY_TTL"] = "30"
+        self.fake: FakeMlflowClient = FakeMlflowClient.generate(
+            experiments=3, runs_per_experiment=50, models=4, versions_per_model=3, ttl=30
+        )
+
+    def test_fake_search_runs_pages(self):
+        first: PagedList = self.fake.search_runs(
+            experiment_ids=["0", "1"], filter_string="attributes.status = 'FINISHED'", max_results=10
+        )
+        second: PagedList = self.fake.search_runs(
+            experiment_ids=["0", "1"],
+            filter_string="attributes.status = 'FINISHED'",
+            max_results=10,
+            page_token=first.token,
+        )
+
+        self.assertEqual(len(first), 10)
+        self.assertTrue(all(run.info.status == "FINISHED" for run in list(first) + list(second)))
+        self.assertTrue({run.info.run_id for run in first}.isdisjoint({run.info.run_id for run in second}))
+
+    def test_fake_delete_run(self):
+        run_id: str = next(iter(self.fake.runs))
+        self.fake.delete_run(run_id=run_id)
+
+        active: PagedList = self.fake.search_runs(experiment_ids=["0"], max_results=1000)
+        every: PagedList = self.fake.search_runs(experiment_ids=["0"], run_view_type=ViewType.ALL, max_results=1000)
+
+        self.assertNotIn(run_id, {run.info.run_id for run in active})
+        self.assertIn(run_id, {run.info.run_id for run in every})
+
+    def test_run(self):
+        results: dict = Benchmark(fake=self.fake).run()
+
+        self.assertEqual(set(results["phases"]), {"get_pruneables", "filter_runs", "filter_runs_linked", "prune"})
+        self.assertEqual(results["entities"]["runs"], 150)
+        self.assertGreater(results["phases"]["prune"]["peak_memory_bytes"], 0)
+        self.assertEqual(
+            results["phases"]["prune"]["calls"].get("delete_run", 0), results["entities"]["pruneable_runs"]
+        )
+        self.assertEqual(
+            sum(lifecycle_stage == "deleted" for _, _, _, lifecycle_stage in self.fake.runs.values()),
+            results["entities"]["pruneable_runs"],
+        )
@@ -1,10 +1,20 @@
+import os
+import tempfile
 import unittest
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from anaconda.mlflow.tracking.sdk import build_mlflow_client
 from src.anaconda.mlflow.tracking.prune.command import PruneCommand
+from src.anaconda.mlflow.tracking.prune.dto.prune_result import PruneResult
+from src.anaconda.mlflow.tracking.prune.dto.pruneable import Pruneable
+from src.anaconda.mlflow.tracking.prune.dto.records import RunRecord
 from src.anaconda.mlflow.tracking.prune.service.client import PruneClient
+from src.anaconda.mlflow.tracking.prune.service.collapse import ModelCollapser
+from src.anaconda.mlflow.tracking.prune.service.pipeline import PipelinedEngine
+from src.anaconda.mlflow.tracking.prune.service.plan import PrunePlan
+from src.anaconda.mlflow.tracking.prune.service.streaming import StreamingEngine
+from src.anaconda.mlflow.tracking.prune.service.throttle import RequestController
 
 
 class TestCommand(unittest.TestCase):
@@ -23,6 +33,174 @@ class TestCommand(unittest.TestCase):
         mock_prune_client.get_pruneables.assert_called_once()
         mock_prune_client.prune.assert_called_once_with(pruneables="MOCK", dry_run=False)
 
+    @patch.dict("os.environ", {"MLFLOW_HTTP_REQUEST_MAX_RETRIES": "5"})
+    def test_client_retries_disabled_for_prune(self):
+        # setup
+        pruning_client: PruneClient = PruneClient(client=build_mlflow_client())
+        mock_prune_client: PruneClient = MagicMock()
+        mock_prune_client.controller = RequestController()
+        retries: list[str] = []
+
+        def prune(**_) -> PruneResult:
+            retries.append(os.environ["MLFLOW_HTTP_REQUEST_MAX_RETRIES"])
+            return PruneResult()
+
+        mock_prune_client.prune.side_effect = prune
+        command: PruneCommand = PruneCommand(pruner=pruning_client)
+        command.pruner = mock_prune_client
+
+        # Execute
+        command.execute(dry_run=False)
+
+        # Validate
+        self.assertEqual(retries, ["0"])
+        self.assertEqual(os.environ["MLFLOW_HTTP_REQUEST_MAX_RETRIES"], "5")
+
+    def test_streaming(self):
+        # setup
+        pruning_client: PruneClient = PruneClient(client=build_mlflow_client())
+        mock_prune_client: PruneClient = MagicMock()
+        mock_engine: MagicMock = MagicMock(spec=StreamingEngine)
+        command: PruneCommand = PruneCommand(pruner=pruning_client, streaming_engine=mock_engine)
+        command.pruner = mock_prune_client
+
+        # Execute
+        command.execute(dry_run=True)
+
+        # Validate
+        mock_prune_client.get_pruneables.assert_not_called()
+        mock_engine.prune.assert_called_once_with(pruner=mock_prune_client, dry_run=True)
+
+    def test_pipelined(self):
+        # setup
+        pruning_client: PruneClient = PruneClient(client=build_mlflow_client())
+        mock_prune_client: PruneClient = MagicMock()
+        mock_engine: MagicMock = MagicMock(spec=PipelinedEngine)
+        command: PruneCommand = PruneCommand(pruner=pruning_client, pipelined_engine=mock_engine)
+        command.pruner = mock_prune_client
+
+        # Execute
+        command.execute(dry_run=True)
+
+        # Validate
+        mock_prune_client.get_pruneables.assert_not_called()
+        mock_engine.prune.assert_called_once_with(pruner=mock_prune_client, dry_run=True)
+
+    def test_collapse_models(self):
+        # setup
+        pruning_client: PruneClient = PruneClient(client=build_mlflow_client())
+        mock_prune_client: PruneClient = MagicMock()
+        mock_prune_client.get_pruneables.return_value = Pruneable()
+        mock_collapser: MagicMock = MagicMock(spec=ModelCollapser)
+        mock_collapser.get_collapsible_models.return_value = ["mock-model"]
+        mock_collapser.prune.return_value = PruneResult()
+        command: PruneCommand = PruneCommand(pruner=pruning_client, model_collapser=mock_collapser)
+        command.pruner = mock_prune_client
+
+        # Execute
+        command.execute(dry_run=False)
+
+        # Validate
+        pruneables: Pruneable = mock_collapser.prune.call_args.kwargs["pruneables"]
+        self.assertEqual(pruneables.registered_models, ["mock-model"])
+        mock_prune_client.prune.assert_not_called()
+
+    def test_resume_from_journal(self):
+        # setup
+        pruning_client: PruneClient = PruneClient(client=build_mlflow_client())
+        mock_prune_client: PruneClient = MagicMock()
+        mock_journal: MagicMock = MagicMock()
+        mock_journal.is_resumable.return_value = True
+        mock_journal.load_plan.return_value = "MOCK"
+        command: PruneCommand = PruneCommand(pruner=pruning_client)
+        command.pruner = mock_prune_client
+        command.journal = mock_journal
+
+        # Execute
+        command.execute(dry_run=False)
+
+        # Validate
+        mock_prune_client.get_pruneables.assert_not_called()
+        mock_journal.record_plan.assert_not_called()
+        mock_prune_client.prune.assert_called_once_with(pruneables="MOCK", dry_run=False)
+        self.assertEqual(mock_prune_client.journal, mock_journal)
+
+    def test_record_journal(self):
+        # setup
+        pruning_client: PruneClient = PruneClient(client=build_mlflow_client())
+        mock_prune_client: PruneClient = MagicMock()
+        mock_prune_client.get_pruneables.return_value = "MOCK"
+        mock_journal: MagicMock = MagicMock()
+        mock_journal.is_resumable.return_value = False
+        command: PruneCommand = PruneCommand(pruner=pruning_client)
+        command.pruner = mock_prune_client
+        command.journal = mock_journal
+
+        # Execute
+        command.execute(dry_run=False)
+
+        # Validate
+        mock_prune_client.get_pruneables.assert_called_once()
+        mock_journal.record_plan.assert_called_once()
+        mock_prune_client.prune.assert_called_once_with(pruneables="MOCK", dry_run=False)
+
+    @patch("src.anaconda.mlflow.tracking.prune.command.demand_env_var", return_value="30")
+    def test_record_journal_from_plan_file(self, _: MagicMock):
+        # setup
+        pruning_client: PruneClient = PruneClient(client=build_mlflow_client())
+        mock_prune_client: PruneClient = MagicMock()
+        mock_prune_client.oldest_allowed_timestamp = 10.0
+        mock_journal: MagicMock = MagicMock()
+        with tempfile.TemporaryDirectory() as directory:
+            plan_path: str = os.path.join(directory, "plan.bin")
+            PrunePlan.write(
+                path=plan_path, pruneables=Pruneable(runs=[], models=[]), cutoff=5.0, ttl=30, tracking_uri="30"
+            )
+            command: PruneCommand = PruneCommand(pruner=pruning_client, plan_input=plan_path)
+            command.pruner = mock_prune_client
+            command.journal = mock_journal
+
+            # Execute
+            command.execute(dry_run=False)
+
+        # Validate
+        mock_prune_client.get_pruneables.assert_not_called()
+        mock_journal.record_plan.assert_called_once()
+        self.assertIsInstance(mock_journal.record_plan.call_args.kwargs["pruneables"], PrunePlan)
+        self.assertEqual(mock_journal.record_plan.call_args.kwargs["cutoff"], 5.0)
+        self.assertEqual(mock_journal.record_plan.call_args.kwargs["ttl"], 30)
+        self.assertEqual(mock_prune_client.journal, mock_journal)
+
+    def test_artifact_collection_only_deleted_runs(self):
+        # setup
+        pruning_client: PruneClient = PruneClient(client=build_mlflow_client())
+        mock_prune_client: PruneClient = MagicMock()
+        mock_pruned_run: RunRecord = RunRecord(
+            run_id="1", experiment_id="0", end_time=1, status="FINISHED", artifact_uri=""
+        )
+        mock_failed_run: RunRecord = RunRecord(
+            run_id="2", experiment_id="0", end_time=1, status="FINISHED", artifact_uri=""
+        )
+        mock_prune_client.get_pruneables.return_value = Pruneable(runs=[mock_pruned_run, mock_failed_run], models=[])
+        mock_prune_client.prune.return_value = PruneResult(
+            failures=[{"kind": "run", "id": "2", "error": "mock failure"}], deleted_run_ids=["1"]
+        )
+        collected: list = []
+        mock_collector: MagicMock = MagicMock()
+        mock_collector.collect.side_effect = lambda runs, dry_run: collected.extend(runs)
+        command: PruneCommand = PruneCommand(pruner=pruning_client)
+        command.pruner = mock_prune_client
+        command.artifact_collector = mock_collector
+
+        # Execute
+        command.execute(dry_run=False)
+
+        # Validate
+        mock_collector.collect.assert_called_once()
+        self.assertEqual(mock_collector.collect.call_args.kwargs["dry_run"], False)
+        self.assertEqual(collected, [mock_pruned_run])
+        self.assertTrue(mock_prune_client.track_deleted_runs)
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner()
@@ -0,0 +1,91 @@
+import unittest
+from argparse import Namespace
+from threading import Event, Thread
+from unittest.mock import MagicMock
+
+from src.anaconda.mlflow.tracking.prune.daemon import PruneDaemon
+from src.anaconda.mlflow.tracking.prune.dto.prune_result import PruneResult
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self) -> None:
+        self.release: Event = Event()
+        self.built: list[dict] = []
+        self.commands: list[MagicMock] = []
+
+        def mock_execute(dry_run: bool) -> PruneResult:
+            print("[START] Resource Pruning")
+            self.release.wait(timeout=5)
+            print("[COMPLETE] Resource Pruning")
+            return PruneResult()
+
+        def mock_build_command(cli_args: Namespace, mlflow_client: object) -> MagicMock:
+            self.built.append({"cli_args": cli_args, "mlflow_client": mlflow_client})
+            command: MagicMock = MagicMock()
+            command.execute.side_effect = mock_execute
+            command.pruner.metrics.to_prometheus.return_value = "mlflow_prune_peak_rss_bytes 1\n"
+            self.commands.append(command)
+            return command
+
+        self.client: object = object()
+        self.daemon: PruneDaemon = PruneDaemon(
+            cli_args=Namespace(dry_run=True), interval=None, build_command=mock_build_command, client=self.client
+        )
+
+    def test_trigger(self):
+        run: dict = self.daemon.trigger(dry_run=True, trigger="api")
+
+        # Only a single run is in progress at a time (so runs never share the journal or state files)
+        self.assertIsNone(self.daemon.trigger(dry_run=True, trigger="api"))
+        self.assertIsNone(self.daemon.trigger(dry_run=False, trigger="schedule"))
+        self.assertEqual(self.daemon.status()["current"], run["id"])
+
+        # Output of other threads (e.g. the HTTP handlers) is not part of the run's progress
+        other: Thread = Thread(target=print, args=("[HTTP] GET /status",))
+        other.start()
+        other.join()
+
+        self.release.set()
+        self.assertEqual(
+            list(self.daemon.follow(run=self.daemon.find_run(run_id="latest"))),
+            ["[START] Resource Pruning", "[COMPLETE] Resource Pruning"],
+        )
+
+        status: dict = self.daemon.status()
+        self.assertIsNone(status["current"])
+        self.assertEqual(status["runs"][0]["status"], "completed")
+        self.assertEqual(status["runs"][0]["trigger"], "api")
+        self.assertEqual(self.daemon.metrics, "mlflow_prune_peak_rss_bytes 1\n")
+
+        # The MLFlow client is shared by every run, the files and connections of each run are closed
+        self.assertIs(self.built[0]["mlflow_client"], self.client)
+        self.commands[0].close.assert_called_once()
+        self.assertEqual(self.daemon.trigger(dry_run=True, trigger="api")["id"], 2)
+
+    def test_failed_run(self):
+        def mock_build_command(cli_args: Namespace, mlflow_client: object) -> MagicMock:
+            raise ValueError("mock failure")
+
+        self.daemon.build_command = mock_build_command
+        run: dict = self.daemon.trigger(dry_run=True, trigger="schedule")
+        list(self.daemon.follow(run=run))
+
+        self.assertEqual(run["status"], "failed")
+        self.assertEqual(run["error"], "ValueError: mock failure")
+        self.assertIsNone(self.daemon.find_run(run_id="2"))
+
+
+    def test_is_authorized(self):
+        # Runs can not be triggered through the API without a token
+        self.assertFalse(self.daemon.is_authorized(authorization="Bearer secret"))
+
+        self.daemon.token = "secret"
+        self.assertTrue(self.daemon.is_authorized(authorization="Bearer secret"))
+        self.assertTrue(self.daemon.is_authorized(authorization="bearer secret"))
+        self.assertFalse(self.daemon.is_authorized(authorization="Bearer other"))
+        self.assertFalse(self.daemon.is_authorized(authorization="Basic secret"))
+        self.assertFalse(self.daemon.is_authorized(authorization=None))
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestDaemon())
@@ -0,0 +1,129 @@
+import os
+import tempfile
+import unittest
+from argparse import Namespace
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.anaconda.mlflow.tracking.prune.dto.prune_result import PruneResult
+from src.anaconda.mlflow.tracking.prune.fanout import aggregate, load_servers, prune_server, server_path
+
+
+class TestFanout(unittest.TestCase):
+    @staticmethod
+    def generate_cli_args() -> Namespace:
+        return Namespace(
+            dry_run=True,
+            journal="/tmp/journal.db",
+            state=None,
+            digests=None,
+            linkage_index=None,
+            audit_log=None,
+            metrics_textfile=None,
+            metrics_summary=None,
+            plan_output=None,
+        )
+
+    def test_load_servers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path: Path = Path(directory) / "servers.yaml"
+            path.write_text(
+                "servers:\n  - name: a\n    tracking_uri: http://a\n    ttl: 7\n  - name: b\n    tracking_uri: http://b\n"
+            )
+
+            self.assertEqual(
+                load_servers(path=str(path)),
+                [{"name": "a", "tracking_uri": "http://a", "ttl": 7}, {"name": "b", "tracking_uri": "http://b"}],
+            )
+
+            # Duplicate names, missing URIs and unknown keys are rejected
+            for document in [
+                "servers:\n  - name: a\n    tracking_uri: http://a\n  - name: a\n    tracking_uri: http://b\n",
+                "servers:\n  - name: a\n",
+                "servers:\n  - name: a\n    tracking_uri: http://a\n    ttls: 7\n",
+                "servers: []\n",
+            ]:
+                path.write_text(document)
+                with self.assertRaises(ValueError):
+                    load_servers(path=str(path))
+
+    def test_server_path(self):
+        self.assertEqual(server_path(path="/var/prune/journal.db", name="a"), "/var/prune/a-journal.db")
+        self.assertEqual(server_path(path=None, name="a"), None)
+
+    @patch.dict(os.environ, {"MLFLOW_REGISTRY_URI": "http://default"})
+    def test_prune_server(self):
+        mock_build_command: MagicMock = MagicMock()
+        mock_build_command.return_value.execute.return_value = PruneResult(succeeded={"run": 2})
+
+        report: dict = prune_server(
+            server={"name": "a", "tracking_uri": "http://a", "ttl": 7},
+            cli_args=self.generate_cli_args(),
+            build_command=mock_build_command,
+        )
+
+        self.assertEqual(
+            report,
+            {"name": "a", "tracking_uri": "http://a", "status": "completed", "succeeded": {"run": 2}, "failed": {}},
+        )
+        self.assertEqual(os.environ["MLFLOW_TRACKING_URI"], "http://a")
+        self.assertEqual(os.environ["MLFLOW_TRACKING_ENTITY_TTL"], "7")
+        self.assertNotIn("MLFLOW_REGISTRY_URI", os.environ)
+        self.assertEqual(mock_build_command.call_args.kwargs["cli_args"].journal, "/tmp/a-journal.db")
+
+    @patch.dict(os.environ, {})
+    def test_prune_server_does_not_inherit_previous_server(self):
+        mock_build_command: MagicMock = MagicMock()
+        mock_build_command.return_value.execute.return_value = PruneResult()
+        defaults: dict = {"MLFLOW_TRACKING_ENTITY_TTL": "30"}
+
+        # Both servers are pruned in the same (reused) worker process
+        prune_server(
+            server={"name": "a", "tracking_uri": "http://a", "token": "token-a", "ttl": 7},
+            cli_args=self.generate_cli_args(),
+            build_command=mock_build_command,
+            defaults=defaults,
+        )
+        self.assertEqual(os.environ["MLFLOW_TRACKING_TOKEN"], "token-a")
+        prune_server(
+            server={"name": "b", "tracking_uri": "http://b"},
+            cli_args=self.generate_cli_args(),
+            build_command=mock_build_command,
+            defaults=defaults,
+        )
+
+        self.assertEqual(os.environ["MLFLOW_TRACKING_URI"], "http://b")
+        self.assertNotIn("MLFLOW_TRACKING_TOKEN", os.environ)
+        self.assertEqual(os.environ["MLFLOW_TRACKING_ENTITY_TTL"], "30")
+
+    @patch.dict(os.environ, {})
+    def test_prune_server_failure(self):
+        mock_build_command: MagicMock = MagicMock()
+        mock_build_command.return_value.execute.side_effect = ConnectionError("unreachable")
+
+        report: dict = prune_server(
+            server={"name": "a", "tracking_uri": "http://a"},
+            cli_args=self.generate_cli_args(),
+            build_command=mock_build_command,
+        )
+
+        self.assertEqual(report["status"], "failed")
+        self.assertEqual(report["error"], "ConnectionError: unreachable")
+
+    def test_aggregate(self):
+        combined: dict = aggregate(
+            reports=[
+                {"name": "a", "status": "completed", "succeeded": {"run": 2}, "failed": {"run": 1}},
+                {"name": "b", "status": "completed", "succeeded": {"run": 3, "model_version": 1}, "failed": {}},
+                {"name": "c", "status": "failed", "error": "ConnectionError: unreachable"},
+            ]
+        )
+
+        self.assertEqual(
+            combined["totals"],
+            {"servers": 3, "failed_servers": 1, "succeeded": {"run": 5, "model_version": 1}, "failed": {"run": 1}},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
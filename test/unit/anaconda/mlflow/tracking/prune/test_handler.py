@@ -0,0 +1,40 @@
+import unittest
+from argparse import ArgumentParser, Namespace
+
+from src.anaconda.mlflow.tracking.prune.handler import build_parser, validate_args
+
+
+class TestHandler(unittest.TestCase):
+    def setUp(self):
+        self.parser: ArgumentParser = build_parser()
+
+    def validate(self, *args: str) -> None:
+        cli_args: Namespace = self.parser.parse_args(list(args))
+        validate_args(parser=self.parser, cli_args=cli_args)
+
+    def test_validate_args(self):
+        self.validate("--journal", "journal.db", "--max-deletes", "10", "--priority", "oldest")
+        self.validate("--streaming")
+        self.validate("--linkage-index", "linkage.npz", "--plan-output", "plan.bin")
+
+    def test_validate_args_incompatible(self):
+        for args in [
+            ["--plan-output", "plan.bin", "--streaming"],
+            ["--plan-output", "plan.bin", "--pipelined"],
+            ["--journal", "journal.db", "--async-engine"],
+            ["--state", "state.db", "--streaming"],
+            ["--sql-engine", "--async-engine"],
+            ["--priority", "oldest", "--plan", "plan.bin"],
+        ]:
+            with self.subTest(args=args), self.assertRaises(SystemExit):
+                self.validate(*args)
+
+    def test_validate_args_required(self):
+        for args in [["--max-deletes", "10"], ["--linkage-index", "linkage.npz", "--state", "state.db"]]:
+            with self.subTest(args=args), self.assertRaises(SystemExit):
+                self.validate(*args)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(TestHandler())
@@ -0,0 +1,229 @@
+import random
+import re
+import time
+from typing import Optional
+
+from mlflow.entities import Experiment, Run, RunInfo, ViewType
+from mlflow.entities.model_registry import ModelVersion, RegisteredModel
+from mlflow.exceptions import MlflowException
+from mlflow.store.entities import PagedList
+
+RUN_STATUSES: tuple[str, ...] = ("FINISHED", "FAILED", "KILLED", "RUNNING")
+MODEL_STAGES: tuple[str, ...] = ("Staging", "Production", "Archived")
+
+# Duration (in milliseconds) of the synthetic runs, from which their start times are derived
+RUN_DURATION: int = 60 * 60 * 1000
+
+# Matches the attribute predicates used by the pruning queries, e.g. `attributes.end_time < 1000`
+PREDICATE: re.Pattern = re.compile(r"attributes\.(\w+)\s*(<=|>=|<|>|=)\s*'?([^' ]*)'?")
+OPERATORS: dict = {
+    "<": lambda value, target: value is not None and value < target,
+    "<=": lambda value, target: value is not None and value <= target,
+    ">": lambda value, target: value is not None and value > target,
+    ">=": lambda value, target: value is not None and value >= target,
+    "=": lambda value, target: value == target,
+}
+
+
+class FakeMlflowClient:
+    """
+    In-memory stand-in for `MlflowClient` covering the calls made by the pruning process.
+    Runs are held as compact lists and only materialized as `Run` entities for the requested page, so
+    stores of millions of runs can be generated.  Every call sleeps for `latency` seconds.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency: float = latency
+        self.experiments: dict[str, Experiment] = {}
+        # run_id -> [experiment_id, end_time, status, lifecycle_stage]
+        self.runs: dict[str, list] = {}
+        self.runs_by_experiment: dict[str, list[str]] = {}
+        self.models: dict[str, list[ModelVersion]] = {}
+        self.search_cache: dict[tuple, list[str]] = {}
+
+    @staticmethod
+    def generate(
+        experiments: int,
+        runs_per_experiment: int,
+        models: int,
+        versions_per_model: int,
+        ttl: int,
+        latency: float = 0.0,
+        seed: int = 0,
+    ) -> "FakeMlflowClient":
+        """Generates a store with runs and model versions spread over twice the ttl (in days)."""
+
+        rng: random.Random = random.Random(seed)
+        client: FakeMlflowClient = FakeMlflowClient(latency=latency)
+        now: int = round(time.time() * 1000)
+        span: int = 2 * ttl * 24 * 60 * 60 * 1000
+
+        for experiment_index in range(experiments):
+            experiment_id: str = str(experiment_index)
+            client.experiments[experiment_id] = Experiment(
+                experiment_id=experiment_id,
+                name=f"experiment-{experiment_index}",
+                artifact_location=f"mlflow-artifacts:/{experiment_id}",
+                lifecycle_stage="active",
+                tags={},
+            )
+            run_ids: list[str] = []
+            for run_index in range(runs_per_experiment):
+                run_id: str = f"{experiment_index:08x}{run_index:024x}"
+                status: str = rng.choices(RUN_STATUSES, weights=(80, 10, 5, 5))[0]
+                end_time: Optional[int] = None if status == "RUNNING" else now - rng.randrange(span)
+                client.runs[run_id] = [experiment_id, end_time, status, "active"]
+                run_ids.append(run_id)
+            client.runs_by_experiment[experiment_id] = run_ids
+
+        run_ids: list[str] = list(client.runs)
+        for model_index in range(models):
+            name: str = f"model-{model_index}"
+            client.models[name] = [
+                ModelVersion(
+                    name=name,
+                    version=str(version_index + 1),
+                    creation_timestamp=None,
+                    last_updated_timestamp=now - rng.randrange(span),
+                    current_stage=rng.choice(MODEL_STAGES) if rng.random() < 0.1 else "None",
+                    run_id=rng.choice(run_ids) if run_ids else None,
+                )
+                for version_index in range(versions_per_model)
+            ]
+        return client
+
+    def call(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    @staticmethod
+    def page(items: list, max_results: Optional[int], page_token: Optional[str]) -> tuple[list, Optional[str]]:
+        offset: int = int(page_token) if page_token else 0
+        if max_results is None:
+            return items[offset:], None
+        end: int = offset + max_results
+        return items[offset:end], str(end) if end < len(items) else None
+
+    def build_run(self, run_id: str) -> Run:
+        experiment_id, end_time, status, lifecycle_stage = self.runs[run_id]
+        start_time: int = (end_time if end_time is not None else round(time.time() * 1000)) - RUN_DURATION
+        return Run(
+            run_info=RunInfo(
+                run_uuid=run_id,
+                experiment_id=experiment_id,
+                user_id="",
+                status=status,
+                start_time=start_time,
+                end_time=end_time,
+                lifecycle_stage=lifecycle_stage,
+                artifact_uri=f"mlflow-artifacts:/{experiment_id}/{run_id}/artifacts",
+                run_id=run_id,
+            ),
+            run_data=None,
+        )
+
+    # Experiments
+
+    def search_experiments(
+        self,
+        view_type: int = ViewType.ACTIVE_ONLY,
+        max_results: Optional[int] = None,
+        filter_string: Optional[str] = None,
+        order_by: Optional[list] = None,
+        page_token: Optional[str] = None,
+    ) -> PagedList:
+        self.call()
+        items, token = FakeMlflowClient.page(list(self.experiments.values()), max_results, page_token)
+        return PagedList(items, token)
+
+    def list_experiments(self, *args, **kwargs) -> PagedList:
+        return self.search_experiments(*args, **kwargs)
+
+    # Runs
+
+    def search_runs(
+        self,
+        experiment_ids: list[str],
+        filter_string: str = "",
+        run_view_type: int = ViewType.ACTIVE_ONLY,
+        max_results: int = 1000,
+        order_by: Optional[list[str]] = None,
+        page_token: Optional[str] = None,
+    ) -> PagedList:
+        self.call()
+        key: tuple = (tuple(experiment_ids), filter_string, run_view_type)
+        matches: Optional[list[str]] = self.search_cache.get(key)
+        if page_token is None or matches is None:
+            predicates: list[tuple] = []
+            for attribute, operator, target in PREDICATE.findall(filter_string):
+                index: int = 1 if attribute == "end_time" else 2
+                predicates.append((index, OPERATORS[operator], int(target) if index == 1 else target))
+            matches = self.search_cache[key] = [
+                run_id
+                for experiment_id in experiment_ids
+                for run_id in self.runs_by_experiment.get(experiment_id, [])
+                if (run_view_type != ViewType.ACTIVE_ONLY or self.runs[run_id][3] == "active")
+                and all(operator(self.runs[run_id][index], target) for index, operator, target in predicates)
+            ]
+        run_ids, token = FakeMlflowClient.page(matches, max_results, page_token)
+        return PagedList([self.build_run(run_id) for run_id in run_ids], token)
+
+    def get_run(self, run_id: str) -> Run:
+        self.call()
+        if run_id not in self.runs:
+            raise MlflowException(f"Run '{run_id}' not found")
+        return self.build_run(run_id)
+
+    def delete_run(self, run_id: str) -> None:
+        self.call()
+        if run_id not in self.runs:
+            raise MlflowException(f"Run '{run_id}' not found")
+        self.runs[run_id][3] = "deleted"
+        # Deletions shift `ACTIVE_ONLY` results, as they would on the server
+        self.search_cache = {
+            key: run_ids for key, run_ids in list(self.search_cache.items()) if key[2] != ViewType.ACTIVE_ONLY
+        }
+
+    # Model Registry
+
+    def search_registered_models(
+        self,
+        filter_string: Optional[str] = None,
+        max_results: Optional[int] = None,
+        order_by: Optional[list] = None,
+        page_token: Optional[str] = None,
+    ) -> PagedList:
+        self.call()
+        items, token = FakeMlflowClient.page(
+            [RegisteredModel(name=name) for name in self.models], max_results, page_token
+        )
+        return PagedList(items, token)
+
+    def list_registered_models(self, *args, **kwargs) -> PagedList:
+        return self.search_registered_models(*args, **kwargs)
+
+    def search_model_versions(
+        self,
+        filter_string: str = "",
+        max_results: Optional[int] = None,
+        order_by: Optional[list] = None,
+        page_token: Optional[str] = None,
+    ) -> PagedList:
+        self.call()
+        match: Optional[re.Match] = re.search(r"name\s*=\s*'([^']*)'", filter_string or "")
+        if match:
+            versions: list[ModelVersion] = list(self.models.get(match.group(1), []))
+        else:
+            versions: list[ModelVersion] = [version for model in self.models.values() for version in model]
+        items, token = FakeMlflowClient.page(versions, max_results, page_token)
+        return PagedList(items, token)
+
+    def delete_model_version(self, name: str, version: str) -> None:
+        self.call()
+        versions: list[ModelVersion] = self.models.get(name, [])
+        remaining: list[ModelVersion] = [
+            model_version for model_version in versions if model_version.version != version
+        ]
+        if len(remaining) == len(versions):
+            raise MlflowException(f"Model version '{name}/{version}' not found")
+        self.models[name] = remaining
@@ -0,0 +1,145 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from test.utils.fake import FakeMlflowClient
+from threading import Thread
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+from mlflow.entities import ViewType
+from mlflow.exceptions import MlflowException
+
+# The REST (proto enum) names of the run view types
+VIEW_TYPES: dict[str, int] = {
+    "ACTIVE_ONLY": ViewType.ACTIVE_ONLY,
+    "DELETED_ONLY": ViewType.DELETED_ONLY,
+    "ALL": ViewType.ALL,
+}
+
+
+class FakeTrackingServer:
+    """
+    Local stand-in for the MLFlow Tracking Server REST API, backed by a `FakeMlflowClient`.
+    `failures` queues HTTP status codes returned (in order) in place of the next responses.
+    """
+
+    def __init__(self, fake: FakeMlflowClient, token: Optional[str] = None):
+        self.fake: FakeMlflowClient = fake
+        self.token: Optional[str] = token
+        self.failures: list[int] = []
+        self.requests: list[str] = []
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer(("127.0.0.1", 0), self.build_handler())
+        self.thread: Thread = Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def uri(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self) -> "FakeTrackingServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def dispatch(self, endpoint: str, body: dict) -> dict:
+        fake: FakeMlflowClient = self.fake
+        if endpoint == "experiments/search":
+            page = fake.search_experiments(max_results=body.get("max_results"), page_token=body.get("page_token"))
+            return {
+                "experiments": [{"experiment_id": experiment.experiment_id} for experiment in page],
+                "next_page_token": page.token,
+            }
+        if endpoint == "runs/search":
+            page = fake.search_runs(
+                experiment_ids=body["experiment_ids"],
+                filter_string=body.get("filter", ""),
+                run_view_type=VIEW_TYPES[body.get("run_view_type", "ACTIVE_ONLY")],
+                max_results=body.get("max_results", 1000),
+                page_token=body.get("page_token"),
+            )
+            return {
+                "runs": [
+                    {
+                        "info": {
+                            "run_id": run.info.run_id,
+                            "experiment_id": run.info.experiment_id,
+                            "status": run.info.status,
+                            "end_time": run.info.end_time,
+                            "lifecycle_stage": run.info.lifecycle_stage,
+                            "artifact_uri": run.info.artifact_uri,
+                        }
+                    }
+                    for run in page
+                ],
+                "next_page_token": page.token,
+            }
+        if endpoint == "model-versions/search":
+            page = fake.search_model_versions(
+                filter_string=body.get("filter", ""),
+                max_results=int(body["max_results"]) if "max_results" in body else None,
+                page_token=body.get("page_token"),
+            )
+            return {
+                "model_versions": [
+                    {
+                        "name": version.name,
+                        "version": version.version,
+                        "last_updated_timestamp": version.last_updated_timestamp,
+                        "current_stage": version.current_stage,
+                        "run_id": version.run_id or "",
+                    }
+                    for version in page
+                ],
+                "next_page_token": page.token,
+            }
+        if endpoint == "runs/delete":
+            fake.delete_run(run_id=body["run_id"])
+            return {}
+        if endpoint == "model-versions/delete":
+            fake.delete_model_version(name=body["name"], version=body["version"])
+            return {}
+        raise MlflowException(f"Unknown endpoint {endpoint}")
+
+    def build_handler(self) -> type:
+        server: FakeTrackingServer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def respond(self, status: int, document: dict) -> None:
+                content: bytes = json.dumps(document).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def handle_request(self) -> None:
+                url = urlparse(self.path)
+                length: int = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    body: dict = json.loads(self.rfile.read(length))
+                else:
+                    body: dict = {key: values[0] for key, values in parse_qs(url.query).items()}
+                endpoint: str = url.path.removeprefix("/api/2.0/mlflow/")
+                server.requests.append(endpoint)
+
+                if server.token and self.headers.get("Authorization") != f"Bearer {server.token}":
+                    self.respond(401, {"error_code": "UNAUTHENTICATED", "message": "Unauthenticated"})
+                elif server.failures:
+                    self.respond(server.failures.pop(0), {})
+                else:
+                    try:
+                        self.respond(200, server.dispatch(endpoint=endpoint, body=body))
+                    except MlflowException as error:
+                        self.respond(404, {"error_code": "RESOURCE_DOES_NOT_EXIST", "message": error.message})
+
+            do_GET = handle_request
+            do_POST = handle_request
+            do_DELETE = handle_request
+
+        return Handler